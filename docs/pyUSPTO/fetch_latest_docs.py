@@ -7,14 +7,18 @@ Outputs go into docs/pyUSPTO/local/latest/.
 
 from __future__ import annotations
 
+import re
 import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
 from urllib.request import Request, urlopen
 
-from bs4 import BeautifulSoup
-from html2text import HTML2Text
+from bs4 import (
+    BeautifulSoup,
+    SoupStrainer,  # pyright: ignore[reportPrivateImportUsage]
+)
+from markdownify import markdownify as md
 
 BASE_URLS = {
     "pdf": "https://pyuspto.readthedocs.io/_/downloads/en/latest/pdf/",
@@ -26,12 +30,18 @@ DEST = Path(__file__).parent / "local" / "latest"
 PDF_PATH = DEST / "pyuspto-latest.pdf"
 HTMLZIP_PATH = DEST / "pyuspto-latest-html.zip"
 SINGLEHTML_ZIP_PATH = DEST / "pyuspto-latest-singlehtml.zip"
-SINGLEHTML_EXTRACT = DEST / "singlehtml"
 HTML_EXTRACT = DEST / "html"
 SINGLE_HTML_OUT = DEST / "pyuspto-latest.html"
 MARKDOWN_OUT = DEST / "pyuspto-latest.md"
 TEXT_OUT = DEST / "pyuspto-latest.txt"
 
+COPY_BUFFER_SIZE = 1 << 20
+
+# A whitespace run containing at least one line break (any character
+# str.splitlines() splits on). Collapsing each run to "\n" strips every line
+# and drops blank ones in a single pass.
+_LINE_BREAK_RUN_RE = re.compile(r"\s*[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]\s*")
+
 
 def reset_dir(path: Path) -> None:
     """Replace an output directory to avoid stale content."""
@@ -44,14 +54,25 @@ def download(url: str, target: Path) -> Path:
     target.parent.mkdir(parents=True, exist_ok=True)
     request = Request(url, headers={"User-Agent": "python"})
     with urlopen(request, timeout=90) as response, target.open("wb") as fh:
-        shutil.copyfileobj(response, fh)
+        shutil.copyfileobj(response, fh, length=COPY_BUFFER_SIZE)
     return target
 
 
 def download_artifacts() -> None:
-    download(BASE_URLS["pdf"], PDF_PATH)
-    download(BASE_URLS["htmlzip"], HTMLZIP_PATH)
-    download(BASE_URLS["singlehtml"], SINGLEHTML_ZIP_PATH)
+    """Download the independent Read the Docs artifacts concurrently."""
+    targets = {
+        "pdf": PDF_PATH,
+        "htmlzip": HTMLZIP_PATH,
+        "singlehtml": SINGLEHTML_ZIP_PATH,
+    }
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        futures = [
+            pool.submit(download, BASE_URLS[kind], target)
+            for kind, target in targets.items()
+        ]
+        # Surface the first download failure, if any.
+        for future in futures:
+            future.result()
 
 
 def extract_zip(zip_path: Path, destination: Path) -> None:
@@ -60,55 +81,85 @@ def extract_zip(zip_path: Path, destination: Path) -> None:
         archive.extractall(destination)
 
 
-def pick_single_html(zip_path: Path, extract_dir: Path, output_path: Path) -> Path:
-    extract_zip(zip_path, extract_dir)
+def pick_single_html(zip_path: Path, output_path: Path) -> Path:
+    """Copy the main HTML page out of the singlehtml archive.
+
+    Only one file is needed, so the entry is streamed straight from the zip
+    instead of extracting the whole archive and reading it back.
+    """
     with zipfile.ZipFile(zip_path) as archive:
         html_candidates: list[str] = [
             name for name in archive.namelist() if name.lower().endswith(".html")
         ]
-    if not html_candidates:
-        raise RuntimeError("No HTML files found in singlehtml archive")
-    preferred = sorted(
-        html_candidates,
-        key=lambda name: (0 if "index" in name.lower() else 1, len(name)),
-    )[0]
-    source = extract_dir / preferred
-    if not source.exists():
-        # Handle zipped paths that include a leading folder by rebuilding the
-        # path manually.
-        source = extract_dir / Path(preferred)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_bytes(source.read_bytes())
+        if not html_candidates:
+            raise RuntimeError("No HTML files found in singlehtml archive")
+        preferred = sorted(
+            html_candidates,
+            key=lambda name: (0 if "index" in name.lower() else 1, len(name)),
+        )[0]
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with archive.open(preferred) as src, output_path.open("wb") as dst:
+            shutil.copyfileobj(src, dst, length=COPY_BUFFER_SIZE)
     return output_path
 
 
-def html_to_markdown(html_path: Path, output_path: Path) -> None:
-    html = html_path.read_text(encoding="utf-8")
-    converter = HTML2Text()
-    converter.ignore_links = False
-    converter.body_width = 0
-    markdown = converter.handle(html)
+def parse_html(html_path: Path) -> BeautifulSoup:
+    """Parse an HTML file once so several converters can share the tree."""
+    # Raw bytes go straight to lxml (no str copy of the document). An mmap
+    # would not help here: BeautifulSoup calls .read() on file-like markup,
+    # which copies the whole mapping into a bytes object anyway.
+    return BeautifulSoup(
+        html_path.read_bytes(),
+        "lxml",
+        from_encoding="utf-8",
+    )
+
+
+def html_to_markdown_from_soup(
+    soup: BeautifulSoup,
+    output_path: Path,
+) -> None:
+    """Convert the document body to Markdown.
+
+    Strips script/style/noscript tags from ``soup`` in place, so run any
+    converter that needs the untouched tree first.
+    """
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    markdown = md(str(soup.body or soup), heading_style="ATX")
     output_path.write_text(markdown, encoding="utf-8")
 
 
-def html_to_text(html_path: Path, output_path: Path) -> None:
-    html = html_path.read_text(encoding="utf-8")
-    soup = BeautifulSoup(html, "html.parser")
-    raw_lines: Iterable[str] = soup.get_text("\n").splitlines()
-    lines = [line.strip() for line in raw_lines if line.strip()]
-    text = "\n".join(lines)
+def html_to_text_from_soup(soup: BeautifulSoup, output_path: Path) -> None:
+    text = _LINE_BREAK_RUN_RE.sub("\n", soup.get_text("\n")).strip()
     output_path.write_text(text, encoding="utf-8")
 
 
+def html_to_markdown(html_path: Path, output_path: Path) -> None:
+    # Only <body> is converted, so skip building a tree for <head>.
+    soup = BeautifulSoup(
+        html_path.read_bytes(),
+        "lxml",
+        parse_only=SoupStrainer("body"),
+        from_encoding="utf-8",
+    )
+    html_to_markdown_from_soup(soup, output_path)
+
+
+def html_to_text(html_path: Path, output_path: Path) -> None:
+    html_to_text_from_soup(parse_html(html_path), output_path)
+
+
 def main() -> None:
     DEST.mkdir(parents=True, exist_ok=True)
     download_artifacts()
     extract_zip(HTMLZIP_PATH, HTML_EXTRACT)
-    single_html = pick_single_html(
-        SINGLEHTML_ZIP_PATH, SINGLEHTML_EXTRACT, SINGLE_HTML_OUT
-    )
-    html_to_markdown(single_html, MARKDOWN_OUT)
-    html_to_text(single_html, TEXT_OUT)
+    single_html = pick_single_html(SINGLEHTML_ZIP_PATH, SINGLE_HTML_OUT)
+    # Share one parse of the (large) single-page HTML between both outputs.
+    # Text is extracted first because the Markdown pass mutates the tree.
+    soup = parse_html(single_html)
+    html_to_text_from_soup(soup, TEXT_OUT)
+    html_to_markdown_from_soup(soup, MARKDOWN_OUT)
     outputs = {
         "pdf": PDF_PATH,
         "html zip": HTMLZIP_PATH,
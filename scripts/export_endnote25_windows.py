@@ -26,23 +26,36 @@ import argparse
 import hashlib
 import importlib
 import json
+import multiprocessing
 import re
 import shutil
 import sys
+import threading
 import time
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Iterable
 from urllib.parse import ParseResult, urljoin, urlparse, urlunparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import (
+    BeautifulSoup,
+    SoupStrainer,  # pyright: ignore[reportPrivateImportUsage]
+)
 from markdownify import markdownify as md
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm  # type: ignore[import-untyped]
 
 
-def _load_inspect_export() -> Callable[..., Any]:
-    """Dynamically import `inspect_export` from the src-layout package.
+def _import_src_module(name: str) -> Any:
+    """Import `name` from the src-layout package.
 
     This script is typically run as `python scripts/...py` (without installing
     the package), so `src/` is not automatically on `sys.path`.
@@ -53,15 +66,40 @@ def _load_inspect_export() -> Callable[..., Any]:
     if str(src_dir) not in sys.path:
         sys.path.insert(0, str(src_dir))
 
-    mod = importlib.import_module("extract_ocr.export_inspect")
+    return importlib.import_module(name)
+
+
+def _load_inspect_export() -> Callable[..., Any]:
+    """Dynamically import `inspect_export` from the src-layout package."""
+
+    mod = _import_src_module("extract_ocr.export_inspect")
     return getattr(mod, "inspect_export")
 
 
+@lru_cache(maxsize=1)
+def _load_pick_main_content() -> Callable[[BeautifulSoup], Any]:
+    """Dynamically import `pick_main_content` from the src-layout package."""
+
+    mod = _import_src_module("extract_ocr.convert.html_to_md")
+    return getattr(mod, "pick_main_content")
+
+
 DEFAULT_SEED_URL = (
     "https://docs.endnote.com/docs/endnote/2025/v1/windows/en/"
     "content/00endnote_libraries/00endnote_libraries_and_references.htm"
 )
 
+DEFAULT_WORKERS = 8
+# 0 = one parse process per CPU; 1 = parse on the fetch threads instead.
+DEFAULT_PARSE_WORKERS = 0
+
+CONSOLIDATED_BUFFER_SIZE = 1 << 20
+
+# Only <title> and <body> feed title extraction and main-content selection;
+# skipping <head> (styles, scripts, meta, link tags) at parse time keeps the
+# tree small.
+_PAGE_STRAINER = SoupStrainer(["title", "body"])
+
 
 @dataclass(frozen=True)
 class Page:
@@ -70,6 +108,29 @@ class Page:
     markdown: str
 
 
+class RequestPacer:
+    """Space request starts at least `interval_s` apart across threads.
+
+    Politeness is expressed as a shared request rate rather than a serial
+    sleep, so parallel workers still respect the configured delay.
+    """
+
+    def __init__(self, interval_s: float) -> None:
+        self._interval_s = max(0.0, interval_s)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if self._interval_s <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self._interval_s
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
 def reset_dir(path: Path) -> None:
     """Replace an output directory to avoid stale content."""
     if path.exists():
@@ -82,6 +143,10 @@ def _normalize_url(raw_url: str) -> str:
 
     - Strips fragments.
     - Drops trivial tracking query params like `agt=index`.
+
+    The result is interned: the same URLs are used as keys in several
+    per-page maps and looked up again for every rewritten link, so sharing
+    one object saves memory and lets dict lookups hit the identity check.
     """
 
     parsed: ParseResult = urlparse(raw_url)
@@ -89,10 +154,13 @@ def _normalize_url(raw_url: str) -> str:
     if query.strip().lower() == "agt=index":
         query = ""
     parsed = parsed._replace(fragment="", query=query)
-    return urlunparse(parsed)
+    return sys.intern(urlunparse(parsed))
 
 
+@lru_cache(maxsize=8192)
 def _url_hash(url: str) -> str:
+    # The hash names page files and cache entries, so it must stay stable
+    # across runs; memoize it since each URL is hashed several times.
     return hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
 
 
@@ -102,6 +170,15 @@ def _cache_paths(cache_dir: Path, url: str) -> tuple[Path, Path]:
     return cache_dir / f"{base}.html", cache_dir / f"{base}.json"
 
 
+# Bump when parse_page_to_markdown() output changes so stale parsed pages
+# are not reused.
+_PARSED_CACHE_VERSION = 1
+
+
+def _parsed_cache_path(cache_dir: Path, url: str) -> Path:
+    return cache_dir / f"{_url_hash(url)}.page.json"
+
+
 def _retry_after_seconds(response: requests.Response) -> float | None:
     retry_after = response.headers.get("Retry-After")
     if not retry_after:
@@ -112,21 +189,23 @@ def _retry_after_seconds(response: requests.Response) -> float | None:
         return None
 
 
-def _decode_response_html(response: requests.Response) -> str:
-    """Decode HTML bytes to text.
+def _response_html_bytes(response: requests.Response) -> bytes:
+    """Return the HTML body as UTF-8 bytes.
 
     EndNote help pages are typically UTF-8, but some responses may be labeled
     or
     inferred incorrectly by the client, causing mojibake
-    (e.g. "Â©", "â€”").
+    (e.g. "Â©", "â€”"). Valid UTF-8 bodies are returned as-is; anything
+    else is decoded with the response encoding and re-encoded as UTF-8.
     """
 
     content = response.content
     try:
-        return content.decode("utf-8")
+        content.decode("utf-8")
     except UnicodeDecodeError:
         encoding = response.encoding or response.apparent_encoding or "utf-8"
-        return content.decode(encoding, errors="replace")
+        return content.decode(encoding, errors="replace").encode("utf-8")
+    return content
 
 
 def fetch_page(
@@ -138,12 +217,19 @@ def fetch_page(
     backoff_base_s: float = 1.0,
     cache_dir: Path | None = None,
     refresh_cache: bool = False,
-) -> str:
+    pacer: RequestPacer | None = None,
+) -> bytes:
     """Fetch a page with basic retry/backoff and optional on-disk caching.
 
+    Returns the HTML as UTF-8 bytes; the parser consumes bytes directly, so
+    cache hits skip a decode/re-encode round trip.
+
     Caching behavior:
     - If cached and not refresh_cache: returns cached.
     - If refresh_cache: attempts conditional GET using ETag/Last-Modified.
+
+    When `pacer` is provided, it is consulted before every network request
+    (cache hits do not wait).
     """
 
     normalized = _normalize_url(url)
@@ -164,10 +250,7 @@ def fetch_page(
                 cached_meta = None
 
         if cached_html_path.exists() and not refresh_cache:
-            return cached_html_path.read_text(
-                encoding="utf-8",
-                errors="replace",
-            )
+            return cached_html_path.read_bytes()
 
     headers = {}
     if refresh_cache and cached_meta:
@@ -181,6 +264,8 @@ def fetch_page(
     last_error: Exception | None = None
     for attempt in range(max_retries + 1):
         try:
+            if pacer is not None:
+                pacer.wait()
             response = session.get(
                 normalized,
                 timeout=timeout_s,
@@ -191,10 +276,7 @@ def fetch_page(
                 and cached_html_path
                 and cached_html_path.exists()
             ):
-                return cached_html_path.read_text(
-                    encoding="utf-8",
-                    errors="replace",
-                )
+                return cached_html_path.read_bytes()
 
             # Retry transient failures.
             if response.status_code in {429, 500, 502, 503, 504}:
@@ -209,14 +291,10 @@ def fetch_page(
                     continue
 
             response.raise_for_status()
-            html = _decode_response_html(response)
+            html = _response_html_bytes(response)
 
             if cache_dir is not None and cached_html_path and cached_meta_path:
-                cached_html_path.write_text(
-                    html,
-                    encoding="utf-8",
-                    newline="\n",
-                )
+                cached_html_path.write_bytes(html)
                 meta = {
                     "url": normalized,
                     "fetched_at": time.time(),
@@ -236,6 +314,9 @@ def fetch_page(
     raise RuntimeError(f"Failed to fetch {normalized}: {last_error}")
 
 
+_PAGE_HREF_RE = re.compile(r"\.(?:htm|html)(?:\?|$)", re.IGNORECASE)
+
+
 def extract_hrefs_from_leftpanel_html(leftpanel_html: str) -> list[str]:
     soup = BeautifulSoup(leftpanel_html, "html.parser")
     hrefs: list[str] = []
@@ -249,7 +330,7 @@ def extract_hrefs_from_leftpanel_html(leftpanel_html: str) -> list[str]:
         if not href:
             continue
         # Only TOC/Index links that point to a page.
-        if not re.search(r"\.(?:htm|html)(?:\?|$)", href, flags=re.IGNORECASE):
+        if not _PAGE_HREF_RE.search(href):
             continue
         hrefs.append(href)
     return hrefs
@@ -281,29 +362,8 @@ def _clean_soup_inplace(soup: BeautifulSoup) -> None:
 def _pick_main_content(soup: BeautifulSoup):
     """Best-effort main content selection for RoboHelp-like pages."""
 
-    # Common candidates.
-    for selector in [
-        "main",
-        "article",
-        "#topic-content",
-        "#topic",
-        "#rh-topic",
-        "div[role='main']",
-        "div[role='document']",
-    ]:
-        node = soup.select_one(selector)
-        if node and node.get_text(strip=True):
-            return node
-
-    # Heuristic: largest div by text length.
-    best = None
-    best_len = 0
-    for div in soup.find_all("div"):
-        text_len = len(div.get_text(" ", strip=True))
-        if text_len > best_len:
-            best = div
-            best_len = text_len
-    return best or soup.body or soup
+    # Shared with the package's HTML to Markdown conversion.
+    return _load_pick_main_content()(soup)
 
 
 def _extract_title(soup: BeautifulSoup) -> str:
@@ -315,8 +375,16 @@ def _extract_title(soup: BeautifulSoup) -> str:
     return "Untitled"
 
 
-def parse_page_to_markdown(html: str, url: str) -> Page:
-    soup = BeautifulSoup(html, "html.parser")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def parse_page_to_markdown(html: bytes | str, url: str) -> Page:
+    soup = BeautifulSoup(
+        html,
+        "lxml",
+        parse_only=_PAGE_STRAINER,
+        from_encoding="utf-8" if isinstance(html, bytes) else None,
+    )
     _clean_soup_inplace(soup)
 
     title = _extract_title(soup)
@@ -328,61 +396,193 @@ def parse_page_to_markdown(html: str, url: str) -> Page:
 
     # Light normalization.
     markdown = markdown.replace("\r\n", "\n")
-    markdown = re.sub(r"\n{3,}", "\n\n", markdown).strip() + "\n"
+    markdown = _BLANK_LINES_RE.sub("\n\n", markdown).strip() + "\n"
 
     # Add a source marker at top.
     header = f"# {title}\n\nSource: {url}\n\n"
     return Page(url=url, title=title, markdown=header + markdown)
 
 
+def _load_parsed_page(
+    html: bytes, url: str, *, cache_dir: Path
+) -> tuple[Page | None, str]:
+    """Look up a previous parse of `html`; return (page or None, hash)."""
+
+    content_hash = hashlib.sha256(
+        f"{_PARSED_CACHE_VERSION}\n".encode("ascii") + html
+    ).hexdigest()
+    parsed_path = _parsed_cache_path(cache_dir, _normalize_url(url))
+
+    try:
+        cached = json.loads(parsed_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached = None
+    if (
+        isinstance(cached, dict)
+        and cached.get("content_hash") == content_hash
+        and isinstance(cached.get("title"), str)
+        and isinstance(cached.get("markdown"), str)
+    ):
+        page = Page(
+            url=url,
+            title=cached["title"],
+            markdown=cached["markdown"],
+        )
+        return page, content_hash
+    return None, content_hash
+
+
+def _store_parsed_page(
+    page: Page, content_hash: str, *, cache_dir: Path
+) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _parsed_cache_path(cache_dir, _normalize_url(page.url)).write_text(
+        json.dumps(
+            {
+                "url": _normalize_url(page.url),
+                "content_hash": content_hash,
+                "title": page.title,
+                "markdown": page.markdown,
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+
+
+def parse_page_cached(html: bytes, url: str, *, cache_dir: Path) -> Page:
+    """Like parse_page_to_markdown(), but reuse a previous parse on disk.
+
+    The parsed page is stored next to the cached HTML and keyed by a hash of
+    the HTML itself, so an unchanged page skips BeautifulSoup + markdownify
+    on re-runs while a changed body (e.g. after a 200 on --refresh-cache)
+    is parsed again.
+    """
+
+    page, content_hash = _load_parsed_page(html, url, cache_dir=cache_dir)
+    if page is None:
+        page = parse_page_to_markdown(html, url)
+        _store_parsed_page(page, content_hash, cache_dir=cache_dir)
+    return page
+
+
+_SLUG_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_SLUG_DASHES_RE = re.compile(r"-+")
+
+
 def _safe_slug(text: str, max_len: int = 80) -> str:
     text = text.strip().lower()
-    text = re.sub(r"[^a-z0-9]+", "-", text)
-    text = re.sub(r"-+", "-", text).strip("-")
+    text = _SLUG_NON_ALNUM_RE.sub("-", text)
+    text = _SLUG_DASHES_RE.sub("-", text).strip("-")
     if not text:
         text = "page"
     return text[:max_len].rstrip("-")
 
 
 _MD_LINK_RE = re.compile(r"(!?\[[^\]]*\])\(([^)]+)\)")
+_ABSOLUTE_LINK_PREFIXES = ("http://", "https://", "//")
+
+
+@lru_cache(maxsize=1024)
+def _link_base(page_url: str) -> str:
+    """Return page_url up to its last path "/", without query or fragment.
+
+    Resolving any target that does not start with "#" or "?" against this
+    gives the same URL as resolving it against page_url itself.
+    """
+
+    parts = urlparse(page_url)
+    path = parts.path[: parts.path.rfind("/") + 1]
+    return urlunparse((parts.scheme, parts.netloc, path, "", "", ""))
+
+
+@lru_cache(maxsize=4096)
+def _resolve_link_target(base_url: str, target: str) -> tuple[str, str]:
+    """Return (normalized absolute URL, fragment) for a Markdown link target.
+
+    EndNote pages repeat the same relative hrefs (TOC siblings, glossary,
+    shared footers). Callers pass _link_base() of the page for ordinary
+    targets, so the memo is shared by every page in the same directory.
+    """
+
+    fragment = urlparse(target).fragment
+    return _normalize_url(urljoin(base_url, target)), fragment
+
+
+def _url_hosts(urls: Iterable[str]) -> frozenset[str]:
+    return frozenset(urlparse(url).netloc for url in urls)
 
 
 def _rewrite_markdown_links(
-    markdown: str, page_url: str, url_to_relpath: dict[str, str]
+    markdown: str,
+    page_url: str,
+    url_to_relpath: dict[str, str],
+    *,
+    known_hosts: frozenset[str] | None = None,
 ) -> str:
     """Rewrite links pointing to other EndNote pages to local exported files.
 
-    External links are preserved.
+    External links are preserved. `known_hosts` is the set of hosts in
+    `url_to_relpath`; pass it in when rewriting many pages so it is built
+    once. Absolute links to any other host are skipped without resolving.
     """
 
-    def repl(match: re.Match) -> str:
-        label = match.group(1)
+    if not url_to_relpath:
+        return markdown
+    if known_hosts is None:
+        known_hosts = _url_hosts(url_to_relpath)
+
+    parts: list[str] = []
+    last_end = 0
+    for match in _MD_LINK_RE.finditer(markdown):
         raw_target = match.group(2).strip()
         # Strip common Markdown angle-bracket wrapping.
         target = raw_target
         if target.startswith("<") and target.endswith(">"):
             target = target[1:-1].strip()
 
-        # Preserve mailto and fragments.
+        # Preserve mailto links.
         if target.startswith("mailto:"):
-            return match.group(0)
-
-        parsed = urlparse(target)
-        fragment = parsed.fragment
+            continue
+        if target.startswith(_ABSOLUTE_LINK_PREFIXES):
+            if urlparse(target).netloc not in known_hosts:
+                continue
 
-        # Resolve relative URLs.
-        resolved = urljoin(page_url, target)
-        resolved_norm = _normalize_url(resolved)
+        # Page-relative targets ("#frag", "?query") need the full page URL.
+        base_url = page_url if target[:1] in "#?" else _link_base(page_url)
+        resolved_norm, fragment = _resolve_link_target(base_url, target)
         local = url_to_relpath.get(resolved_norm)
         if not local:
-            return match.group(0)
+            continue
 
         new_target = local
         if fragment:
             new_target = f"{new_target}#{fragment}"
-        return f"{label}({new_target})"
+        parts.append(markdown[last_end : match.start()])
+        parts.append(f"{match.group(1)}({new_target})")
+        last_end = match.end()
+
+    if not parts:
+        return markdown
+    parts.append(markdown[last_end:])
+    return "".join(parts)
+
+
+def _dump_manifest(manifest: dict[str, Any]) -> bytes:
+    """Serialize the manifest as indented UTF-8 JSON.
+
+    Uses orjson when it is installed (much faster on large exports) and
+    falls back to the standard library otherwise. Both paths emit the same
+    layout: two-space indent and non-ASCII characters written as UTF-8.
+    """
 
-    return _MD_LINK_RE.sub(repl, markdown)
+    try:
+        import orjson  # type: ignore[import-not-found]
+    except ImportError:
+        return json.dumps(manifest, indent=2, ensure_ascii=False).encode(
+            "utf-8"
+        )
+    return orjson.dumps(manifest, option=orjson.OPT_INDENT_2)
 
 
 def export(
@@ -396,6 +596,8 @@ def export(
     timeout_s: int = 45,
     max_retries: int = 4,
     rewrite_links: bool = True,
+    workers: int = DEFAULT_WORKERS,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
 ) -> dict:
     if clean:
         reset_dir(out_dir)
@@ -408,103 +610,234 @@ def export(
     if cache_dir is None:
         cache_dir = out_dir / ".cache"
 
+    workers = max(1, workers)
+    parse_workers = max(0, parse_workers)
     session = requests.Session()
+    # Size the connection pool to the worker count so concurrent requests
+    # to the same host reuse keep-alive connections instead of discarding
+    # them. pool_block makes the pool a hard cap (a bounded semaphore over
+    # sockets): a request waits for a free connection rather than opening a
+    # throwaway one. Retries are handled by fetch_page().
+    adapter = HTTPAdapter(
+        pool_connections=workers,
+        pool_maxsize=workers,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     session.headers.update(
         {
             "User-Agent": "extract-ocr-endnote-export/1.0 (local)",
             "Accept": "text/html,application/xhtml+xml",
         }
     )
+    pacer = RequestPacer(delay_s)
 
     index: list[dict] = []
     consolidated_path = out_dir / "endnote25-windows.md"
 
+    pages: list[Page] = []
+    page_files: dict[str, Path] = {}
+    url_to_relpath: dict[str, str] = {}
+    count_exported = 0
+
+    def fetch_and_parse(url: str) -> Page:
+        html = fetch_page(
+            session,
+            url,
+            timeout_s=timeout_s,
+            max_retries=max_retries,
+            cache_dir=cache_dir,
+            refresh_cache=refresh_cache,
+            pacer=pacer,
+        )
+        return parse_page_cached(html, url, cache_dir=cache_dir)
+
+    def fetch_and_lookup(url: str) -> tuple[bytes, Page | None, str]:
+        html = fetch_page(
+            session,
+            url,
+            timeout_s=timeout_s,
+            max_retries=max_retries,
+            cache_dir=cache_dir,
+            refresh_cache=refresh_cache,
+            pacer=pacer,
+        )
+        page, content_hash = _load_parsed_page(
+            html, url, cache_dir=cache_dir
+        )
+        return html, page, content_hash
+
+    # Fetch concurrently, but keep results in the original URL order so
+    # the TOC and consolidated file stay stable across runs.
+    outcomes: list[Page | Exception | None] = [None] * len(urls)
+    page_errors = (
+        OSError,
+        ValueError,
+        RuntimeError,
+        requests.RequestException,
+    )
+
+    if parse_workers == 1:
+        # Parse inline on the fetch threads (no worker processes).
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(fetch_and_parse, url): pos
+                for pos, url in enumerate(urls)
+            }
+            for future in tqdm(
+                as_completed(futures),
+                total=len(futures),
+                desc="Fetching pages",
+                unit="page",
+            ):
+                pos = futures[future]
+                try:
+                    outcomes[pos] = future.result()
+                except page_errors as e:
+                    outcomes[pos] = e
+    else:
+        # BeautifulSoup + markdownify are CPU-bound and hold the GIL, so
+        # pages that miss the parsed cache are converted in worker
+        # processes while the threads keep fetching. The process pool is
+        # only started once the first cache miss shows up, so a fully
+        # cached re-run never pays the process start-up cost. The fetch
+        # threads are running by then, so workers are spawned rather than
+        # forked from a multi-threaded process (spawn is already the
+        # default on Windows).
+        parse_pool: ProcessPoolExecutor | None = None
+        parse_futures: dict[Future[Page], tuple[int, str]] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(fetch_and_lookup, url): pos
+                    for pos, url in enumerate(urls)
+                }
+                for future in tqdm(
+                    as_completed(futures),
+                    total=len(futures),
+                    desc="Fetching pages",
+                    unit="page",
+                ):
+                    pos = futures[future]
+                    try:
+                        html, page, content_hash = future.result()
+                    except page_errors as e:
+                        outcomes[pos] = e
+                        continue
+                    if page is not None:
+                        outcomes[pos] = page
+                        continue
+                    if parse_pool is None:
+                        parse_pool = ProcessPoolExecutor(
+                            max_workers=parse_workers or None,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    parse_future = parse_pool.submit(
+                        parse_page_to_markdown, html, urls[pos]
+                    )
+                    parse_futures[parse_future] = (pos, content_hash)
+
+            for parse_future in tqdm(
+                as_completed(parse_futures),
+                total=len(parse_futures),
+                desc="Parsing pages",
+                unit="page",
+                disable=not parse_futures,
+            ):
+                pos, content_hash = parse_futures[parse_future]
+                try:
+                    page = parse_future.result()
+                    _store_parsed_page(page, content_hash, cache_dir=cache_dir)
+                except page_errors as e:
+                    outcomes[pos] = e
+                    continue
+                outcomes[pos] = page
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown(cancel_futures=True)
+
+    for url, outcome in zip(urls, outcomes):
+        if not isinstance(outcome, Page):
+            index.append(
+                {
+                    "title": None,
+                    "url": _normalize_url(url),
+                    "file": None,
+                    "error": str(outcome),
+                }
+            )
+            continue
+
+        page = outcome
+        slug = _safe_slug(page.title)
+        filename = f"{slug}--{_url_hash(url)}.md"
+        # pages_dir is always out_dir / "pages", so the relative path is
+        # known without a pathlib relative_to() round trip.
+        rel = f"pages/{filename}"
+        page_url = _normalize_url(page.url)
+
+        pages.append(page)
+        page_files[page_url] = pages_dir / filename
+        url_to_relpath[page_url] = rel
+        count_exported += 1
+
+        index.append(
+            {
+                "title": page.title,
+                "url": page_url,
+                "file": rel,
+            }
+        )
+
+    # Drop the fetch results; `pages` now holds the only references.
+    del outcomes
+
+    # Write pages after we have a full URL->file map
+    # (enables link rewriting). The consolidated file is streamed in the
+    # same pass, and each page is released once it has been written, so
+    # no second full copy of the export is built in memory. The
+    # consolidated body uses the original (unrewritten) Markdown, so it
+    # cannot simply be copied back from the page files.
     with consolidated_path.open(
         "w",
         encoding="utf-8",
         newline="\n",
+        buffering=CONSOLIDATED_BUFFER_SIZE,
     ) as consolidated:
-        consolidated.write("# EndNote 2025 (EndNote 25) — Windows\n")
-        consolidated.write("\n")
         consolidated.write(
+            "# EndNote 2025 (EndNote 25) — Windows\n"
+            "\n"
             "This file was generated locally by "
             "scripts/export_endnote25_windows.py.\n"
+            "\n"
+            "## Table of Contents\n\n"
         )
-        consolidated.write("\n")
-        consolidated.write("## Table of Contents\n\n")
-
-        pages: list[Page] = []
-        page_files: dict[str, Path] = {}
-
-        for url in tqdm(urls, desc="Fetching pages", unit="page"):
-            try:
-                html = fetch_page(
-                    session,
-                    url,
-                    timeout_s=timeout_s,
-                    max_retries=max_retries,
-                    cache_dir=cache_dir,
-                    refresh_cache=refresh_cache,
-                )
-                page = parse_page_to_markdown(html, url)
-
-                slug = _safe_slug(page.title)
-                filename = f"{slug}--{_url_hash(url)}.md"
-                page_path = pages_dir / filename
-
-                pages.append(page)
-                page_files[_normalize_url(page.url)] = page_path
-
-                rel = page_path.relative_to(out_dir).as_posix()
-                index.append(
-                    {
-                        "title": page.title,
-                        "url": _normalize_url(page.url),
-                        "file": rel,
-                    }
-                )
-            except (
-                OSError,
-                ValueError,
-                RuntimeError,
-                requests.RequestException,
-            ) as e:
-                index.append(
-                    {
-                        "title": None,
-                        "url": _normalize_url(url),
-                        "file": None,
-                        "error": str(e),
-                    }
-                )
-            finally:
-                if delay_s > 0:
-                    time.sleep(delay_s)
 
-        url_to_relpath = {
-            url: path.relative_to(out_dir).as_posix()
-            for url, path in page_files.items()
-        }
+        # TOC
+        consolidated.writelines(
+            f"- [{item['title']}]({item['file']})\n"
+            for item in index
+            if item.get("file") and item.get("title")
+        )
+        consolidated.write("\n")
 
-        # Write pages after we have a full URL->file map
-        # (enables link rewriting).
-        for page in pages:
+        # Body
+        known_hosts = _url_hosts(url_to_relpath)
+        pages.reverse()
+        while pages:
+            page = pages.pop()
             page_path = page_files[_normalize_url(page.url)]
             body = page.markdown
             if rewrite_links:
                 body = _rewrite_markdown_links(
-                    body, page_url=page.url, url_to_relpath=url_to_relpath
+                    body,
+                    page_url=page.url,
+                    url_to_relpath=url_to_relpath,
+                    known_hosts=known_hosts,
                 )
             page_path.write_text(body, encoding="utf-8", newline="\n")
 
-        # TOC
-        for item in index:
-            if item.get("file") and item.get("title"):
-                consolidated.write(f"- [{item['title']}]({item['file']})\n")
-        consolidated.write("\n")
-
-        # Body
-        for page in pages:
             consolidated.write("\n---\n\n")
             consolidated.write(page.markdown)
 
@@ -512,11 +845,11 @@ def export(
     manifest = {
         "seed_url": DEFAULT_SEED_URL,
         "count_requested": len(urls),
-        "count_exported": sum(1 for i in index if i.get("file")),
-        "count_failed": sum(1 for i in index if i.get("error")),
+        "count_exported": count_exported,
+        "count_failed": len(index) - count_exported,
         "items": index,
     }
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    manifest_path.write_bytes(_dump_manifest(manifest))
 
     return manifest
 
@@ -555,7 +888,22 @@ def main() -> int:
         "--delay",
         type=float,
         default=0.2,
-        help="Delay between requests (seconds)",
+        help="Minimum spacing between request starts, across workers (s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent page fetches (1 = serial)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=DEFAULT_PARSE_WORKERS,
+        help=(
+            "Processes converting HTML to Markdown "
+            "(0 = one per CPU, 1 = no worker processes)"
+        ),
     )
     parser.add_argument(
         "--timeout", type=int, default=45, help="Request timeout seconds"
@@ -624,6 +972,8 @@ def main() -> int:
         timeout_s=args.timeout,
         max_retries=args.retries,
         rewrite_links=not args.no_rewrite_links,
+        workers=args.workers,
+        parse_workers=args.parse_workers,
     )
 
     if bool(args.validate):
@@ -31,34 +31,85 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import io
 import json
 import os
 import re
+import shutil
+import threading
 import time
 from collections import Counter, deque
-from dataclasses import dataclass
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Iterable, Iterator
 from urllib.parse import ParseResult, urljoin, urlparse, urlunparse
 
 import requests  # type: ignore[import-untyped]
 from bs4 import BeautifulSoup
+from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
 from markdownify import markdownify as md
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+try:
+    # Optional speedup for the per-URL manifest/meta JSON (the "fast" extra).
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    orjson = None
 
 TRANSIENT_HTTP_STATUSES = {429, 500, 502, 503, 504}
 
+USER_AGENT = "extract-ocr/ingest_data_uspto_gov (+https://github.com/)"
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_HOST_PARALLEL = 2
+# Per-host overrides of DEFAULT_PER_HOST_PARALLEL; the primary site stays
+# strictly serial while linked hosts may be fetched concurrently.
+DEFAULT_HOST_PARALLEL = {"data.uspto.gov": 1}
+
+# Keep-alive pool of the shared adapter. requests' default of 10 per host
+# would discard connections once more workers than that hit one host.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 128
+
+# Freshly fetched bodies up to this size are also handed to the parser in
+# memory, so HTML pages and sitemaps are not read back from the cache.
+IN_MEMORY_BODY_LIMIT = 8 << 20
+
+# Cache entries are spread over 256 subdirectories keyed by hash prefix.
+CACHE_SHARD_COUNT = 256
+
+# Response bodies are streamed to the cache in chunks of this size.
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Append-only logs are held open for the duration of a crawl.
+LOG_BUFFER_SIZE = 1 << 16
+
+ROBOTS_PATH_CACHE_SIZE = 50_000
+
+# How far past the head of the queue the dispatcher looks for a URL whose
+# host can be fetched right away.
+DISPATCH_LOOKAHEAD = 32
+
 
 def _utc_iso() -> str:
     # No dependency; good enough for manifests.
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
+@lru_cache(maxsize=100_000)
 def _normalize_url(raw_url: str) -> str:
     """Normalize URLs for de-duplication.
 
     - Lowercases scheme + hostname.
     - Strips fragments.
     - Drops trivial tracking query params we know about.
+
+    Memoized: pages repeat the same nav/footer links, and every discovered
+    URL is normalized again on enqueue and fetch.
     """
 
     parsed: ParseResult = urlparse(raw_url)
@@ -79,7 +130,11 @@ def _normalize_url(raw_url: str) -> str:
     return urlunparse(parsed)
 
 
+@lru_cache(maxsize=100_000)
 def _url_hash(url: str) -> str:
+    # Names cache entries and exported files, so it must stay stable across
+    # runs (resumed crawls look files up by it); memoized, so computed once
+    # per URL.
     return hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
 
 
@@ -93,11 +148,29 @@ def _retry_after_seconds(headers: dict[str, str]) -> float | None:
         return None
 
 
+# Any run of characters outside [A-Za-z0-9._] (whitespace, dashes, other
+# punctuation) becomes a single dash; equivalent to the former three-pass
+# whitespace / unsafe-character / dash-collapse substitutions.
+_UNSAFE_FILENAME_RUN_RE = re.compile(r"[^A-Za-z0-9._]+")
+# URL-bearing attribute per element followed by Crawler._extract_links().
+_LINK_ATTR_BY_TAG = {
+    "a": "href",
+    "link": "href",
+    "img": "src",
+    "script": "src",
+    "iframe": "src",
+    "source": "src",
+    "video": "src",
+    "audio": "src",
+    "embed": "src",
+    "object": "data",
+    "form": "action",
+}
+_META_REFRESH_URL_RE = re.compile(r"\burl\s*=\s*([^;]+)", re.IGNORECASE)
+
+
 def _safe_filename_piece(text: str, *, max_len: int = 80) -> str:
-    text = text.strip()
-    text = re.sub(r"\s+", "-", text)
-    text = re.sub(r"[^A-Za-z0-9._-]+", "-", text)
-    text = re.sub(r"-+", "-", text).strip("-")
+    text = _UNSAFE_FILENAME_RUN_RE.sub("-", text.strip()).strip("-")
     if not text:
         return "untitled"
     return text[:max_len]
@@ -137,6 +210,77 @@ def _guess_extension(url: str, content_type: str | None) -> str:
     return ".bin"
 
 
+def _json_line(obj: object) -> str:
+    """Serialize `obj` as one line of JSON for an append-only log."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _dump_json_indented(obj: object) -> bytes:
+    """Serialize `obj` as two-space indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _load_json(raw: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _stream_body_to(resp: requests.Response, path: Path) -> bytes | None:
+    """Write a streamed response body to `path` in fixed-size chunks.
+
+    The body goes to a sibling ".part" file first, so a download that fails
+    midway never leaves a truncated body behind a valid cache entry.
+
+    Returns the body when it fits in IN_MEMORY_BODY_LIMIT, so the caller can
+    parse it without reading the file back; larger bodies return None.
+    """
+    part = path.with_suffix(".part")
+    chunks: list[bytes] | None = []
+    size = 0
+    with part.open("wb") as fh:
+        for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            fh.write(chunk)
+            if chunks is not None:
+                size += len(chunk)
+                if size <= IN_MEMORY_BODY_LIMIT:
+                    chunks.append(chunk)
+                else:
+                    chunks = None
+    part.replace(path)
+    return b"".join(chunks) if chunks is not None else None
+
+
+def _decode_body_text(body: bytes) -> str:
+    # Same result as Path.read_text(encoding="utf-8", errors="replace"),
+    # including its universal-newline translation.
+    text = body.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _open_log(path: Path) -> IO[str]:
+    return path.open(
+        "a",
+        encoding="utf-8",
+        newline="\n",
+        buffering=LOG_BUFFER_SIZE,
+    )
+
+
+def _append_line(fh: IO[str] | None, path: Path, line: str) -> None:
+    """Append one line to an open log, or open `path` just for this line."""
+    if fh is not None:
+        fh.write(line + "\n")
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8", newline="\n") as out:
+        out.write(line + "\n")
+
+
 @dataclass(frozen=True)
 class CachedResponse:
     url: str
@@ -145,6 +289,37 @@ class CachedResponse:
     headers: dict[str, str]
     fetched_at: float
     body_path: Path
+    # Set only on a fresh fetch small enough to keep (see _stream_body_to).
+    body_bytes: bytes | None = field(default=None, repr=False, compare=False)
+
+
+class HostRateLimiter:
+    """Per-host pacing: request starts to one host are delay_s apart.
+
+    next_ready maps a host to the earliest time its next request may start;
+    hosts never requested are ready immediately. Safe to share between
+    fetch workers.
+    """
+
+    def __init__(self, delay_s: float) -> None:
+        self.delay_s = delay_s
+        self.next_ready: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait_time(self, host: str) -> float:
+        """Seconds until `host` may start another request (0 when ready)."""
+        ready = self.next_ready.get(host)
+        if ready is None:
+            return 0.0
+        return max(0.0, ready - time.time())
+
+    def reserve(self, host: str) -> float:
+        """Claim the host's next start slot; return how long to wait for it."""
+        with self._lock:
+            now = time.time()
+            start = max(now, self.next_ready.get(host, now))
+            self.next_ready[host] = start + self.delay_s
+        return start - now
 
 
 class RobotsRules:
@@ -186,21 +361,25 @@ class RobotsRules:
                 if value:
                     self._allow.append(value)
 
-        # Longest prefix wins.
-        self._allow.sort(key=len, reverse=True)
-        self._disallow.sort(key=len, reverse=True)
+        # str.startswith() accepts a tuple and checks every prefix in C.
+        # Any matching Allow wins, so rule order is irrelevant and repeated
+        # rules (common across merged User-agent groups) are dropped.
+        self._allow_prefixes = tuple(dict.fromkeys(self._allow))
+        self._disallow_prefixes = tuple(dict.fromkeys(self._disallow))
+
+        # Crawls ask about the same paths over and over; memoize per path.
+        self._path_allowed = lru_cache(maxsize=ROBOTS_PATH_CACHE_SIZE)(
+            self._match_path
+        )
 
     def can_fetch(self, url: str) -> bool:
-        path = urlparse(url).path or "/"
+        return self._path_allowed(urlparse(url).path or "/")
 
-        # Allow overrides disallow if it matches with longer/equal prefix.
-        for allow_prefix in self._allow:
-            if path.startswith(allow_prefix):
-                return True
-        for disallow_prefix in self._disallow:
-            if path.startswith(disallow_prefix):
-                return False
-        return True
+    def _match_path(self, path: str) -> bool:
+        # Any matching Allow overrides Disallow.
+        if path.startswith(self._allow_prefixes):
+            return True
+        return not path.startswith(self._disallow_prefixes)
 
 
 class Crawler:
@@ -223,9 +402,33 @@ class Crawler:
         max_depth: int,
         refresh_cache: bool,
         respect_robots: bool,
+        workers: int = DEFAULT_WORKERS,
+        per_host_parallel: int = DEFAULT_PER_HOST_PARALLEL,
+        host_parallel: dict[str, int] | None = None,
+        revalidate: bool = True,
     ) -> None:
         self.out_dir = out_dir
         self.session = session
+        # One pooled adapter for the whole crawl so keep-alive connections
+        # are reused across pages, robots.txt and sitemaps. Retries stay in
+        # _fetch(), which honours Retry-After.
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=max(POOL_MAXSIZE, workers),
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # make_headers() only advertises encodings urllib3 can decode
+        # (br/zstd when brotli/zstandard are installed).
+        self.session.headers.update(
+            {
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": make_headers(accept_encoding=True)[
+                    "accept-encoding"
+                ],
+            }
+        )
 
         self.allow_host_suffixes = [s.lower().lstrip(".") for s in allow_host_suffixes]
         self.follow_offsite = follow_offsite
@@ -243,9 +446,19 @@ class Crawler:
         self.max_depth = max_depth
         self.refresh_cache = refresh_cache
         self.respect_robots = respect_robots
+        self.revalidate = revalidate
+        self.workers = max(1, workers)
+        self.per_host_parallel = max(1, per_host_parallel)
+        self.host_parallel = {
+            h.lower(): max(1, n)
+            for h, n in (
+                DEFAULT_HOST_PARALLEL if host_parallel is None else host_parallel
+            ).items()
+        }
 
         self.cache_dir = self.out_dir / ".cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._shard_cache_dir()
 
         self.raw_dir = self.out_dir / "raw"
         self.pages_dir = self.out_dir / "pages"
@@ -256,19 +469,26 @@ class Crawler:
         self.state_dir.mkdir(parents=True, exist_ok=True)
         self.seen_path = self.state_dir / "seen_urls.txt"
         self.queue_path = self.state_dir / "queue_urls.txt"
+        self.queue_log_path = self.state_dir / "queue_urls.log"
         self.robots_dir = self.state_dir / "robots"
         self.robots_dir.mkdir(parents=True, exist_ok=True)
 
         self.manifest_jsonl = self.out_dir / "manifest.jsonl"
         self.manifest_summary = self.out_dir / "manifest.json"
+        self._seen_fh: IO[str] | None = None
+        self._manifest_fh: IO[str] | None = None
+        self._queue_log_fh: IO[str] | None = None
 
         self.seen: set[str] = set()
         if self.seen_path.exists():
             seen_lines = self.seen_path.read_text(encoding="utf-8").splitlines()
-            self.seen = {line.strip() for line in seen_lines if line.strip()}
+            self.seen = set(map(str.strip, seen_lines))
+            self.seen.discard("")
 
         self.robots_cache: dict[str, RobotsRules] = {}
-        self.host_last_request: dict[str, float] = {}
+        self.rate_limiter = HostRateLimiter(per_host_delay_s)
+        self._throttle_lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
 
         self.stats: Counter[str] = Counter()
 
@@ -299,32 +519,116 @@ class Crawler:
         if url in self.seen:
             return
         self.seen.add(url)
-        self.seen_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.seen_path.open("a", encoding="utf-8", newline="\n") as fh:
-            fh.write(url + "\n")
+        _append_line(self._seen_fh, self.seen_path, url)
         queue.append((url, depth, discovered_from))
+        _append_line(
+            self._queue_log_fh,
+            self.queue_log_path,
+            f"+\t{url}\t{depth}\t{discovered_from}",
+        )
+
+    def _log_dequeue(self, url: str) -> None:
+        """Record that `url` has left the queue (fetched, failed or skipped)."""
+        _append_line(self._queue_log_fh, self.queue_log_path, f"-\t{url}")
+
+    def _shard_cache_dir(self) -> None:
+        """Create the cache shard directories and migrate flat entries.
+
+        Entries live under .cache/<first two hash chars>/ so each directory
+        holds about 1/256 of the cache instead of all of it. Caches written
+        before sharding keep every pair at the top level; those are moved
+        into their shard once, on the first run that sees them.
+        """
+        for i in range(CACHE_SHARD_COUNT):
+            (self.cache_dir / f"{i:02x}").mkdir(exist_ok=True)
+        moved = 0
+        with os.scandir(self.cache_dir) as entries:
+            flat = [
+                e.name
+                for e in entries
+                if e.is_file() and e.name.endswith((".bin", ".json"))
+            ]
+        for name in flat:
+            os.replace(self.cache_dir / name, self.cache_dir / name[:2] / name)
+            moved += 1
+        if moved:
+            print(f"Migrated {moved} cache files into shard directories")
 
     def _cache_paths(self, url: str) -> tuple[Path, Path]:
         base = _url_hash(url)
-        return self.cache_dir / f"{base}.bin", self.cache_dir / f"{base}.json"
+        shard = self.cache_dir / base[:2]
+        return shard / f"{base}.bin", shard / f"{base}.json"
 
     def _load_cached_meta(self, meta_path: Path) -> dict | None:
         if not meta_path.exists():
             return None
         try:
-            return json.loads(meta_path.read_text(encoding="utf-8"))
+            meta = _load_json(meta_path.read_bytes())
         except (OSError, UnicodeError, json.JSONDecodeError):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError.
             return None
+        return meta if isinstance(meta, dict) else None
 
-    def _throttle(self, host: str) -> None:
+    @contextmanager
+    def _host_request(self, host: str) -> Iterator[None]:
+        """Hold one of the host's request slots, then wait for its pacing.
+
+        At most per_host_parallel requests (or the host's host_parallel
+        override) run against a host at once; workers fetching other hosts
+        are not held up.
+        """
         host = host.lower()
-        now = time.time()
-        last = self.host_last_request.get(host)
-        if last is not None:
-            elapsed = now - last
-            if elapsed < self.per_host_delay_s:
-                time.sleep(self.per_host_delay_s - elapsed)
-        self.host_last_request[host] = time.time()
+        with self._throttle_lock:
+            sem = self._host_slots.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self._host_limit(host))
+                self._host_slots[host] = sem
+        with sem:
+            self._throttle(host)
+            yield
+
+    def _throttle(self, host: str) -> None:
+        """Space out request starts per host; safe to call from workers.
+
+        Each caller reserves the next free slot for the host and sleeps
+        outside the limiter's lock, so concurrent fetches to one host still
+        start at least per_host_delay_s apart.
+        """
+        delay = self.rate_limiter.reserve(host.lower())
+        if delay > 0:
+            time.sleep(delay)
+
+    def _host_limit(self, host: str) -> int:
+        return self.host_parallel.get(host, self.per_host_parallel)
+
+    def _pop_ready(
+        self,
+        queue: deque[tuple[str, int, str]],
+        host_busy: Counter[str],
+    ) -> tuple[str, int, str]:
+        """Pop the first queued URL whose host can start a request now.
+
+        A host is ready when it is out of its per_host_delay_s cooldown and
+        has a free request slot, so a slow or strictly serial host does not
+        tie up every worker while URLs for other hosts wait. At most
+        DISPATCH_LOOKAHEAD entries are examined; those passed over keep
+        their order at the front of the queue. If none is ready the head is
+        taken and its worker waits in _host_request() as before.
+        """
+        skipped: list[tuple[str, int, str]] = []
+        picked = None
+        for _ in range(min(len(queue), DISPATCH_LOOKAHEAD)):
+            item = queue.popleft()
+            host = (urlparse(item[0]).hostname or "").lower()
+            if (
+                host_busy[host] < self._host_limit(host)
+                and self.rate_limiter.wait_time(host) <= 0
+            ):
+                picked = item
+                break
+            skipped.append(item)
+        queue.extendleft(reversed(skipped))
+        return picked if picked is not None else queue.popleft()
 
     def _fetch_robots(self, host: str) -> RobotsRules:
         host = host.lower()
@@ -341,8 +645,8 @@ class Crawler:
 
         robots_url = f"https://{host}/robots.txt"
         try:
-            self._throttle(host)
-            resp = self.session.get(robots_url, timeout=self.timeout_s)
+            with self._host_request(host):
+                resp = self.session.get(robots_url, timeout=self.timeout_s)
             text = resp.text if resp.ok else ""
         except requests.RequestException:
             text = ""
@@ -356,12 +660,13 @@ class Crawler:
         body_path, meta_path = self._cache_paths(normalized)
         cached_meta = self._load_cached_meta(meta_path)
 
-        headers: dict[str, str] = {
-            "User-Agent": ("extract-ocr/ingest_data_uspto_gov (+https://github.com/)")
-        }
+        headers: dict[str, str] = {}
 
-        # Conditional GET on refresh.
-        if self.refresh_cache and cached_meta:
+        # Conditional GET whenever a cached body exists to answer a 304
+        # with (i.e. on --refresh-cache, or meta/body out of sync). Without
+        # a body, a 304 would have nothing to serve, so ask for the full
+        # response instead.
+        if self.revalidate and cached_meta and body_path.exists():
             etag = cached_meta.get("etag")
             last_modified = cached_meta.get("last_modified")
             if etag:
@@ -390,38 +695,48 @@ class Crawler:
         last_error: Exception | None = None
         for attempt in range(self.max_retries + 1):
             try:
-                self._throttle(host)
-                resp = self.session.get(
-                    normalized,
-                    timeout=self.timeout_s,
-                    headers=headers,
-                    allow_redirects=True,
-                )
-
-                if resp.status_code == 304 and body_path.exists():
-                    meta = cached_meta or {}
-                    return CachedResponse(
-                        url=normalized,
-                        final_url=str(meta.get("final_url") or str(resp.url)),
-                        status_code=304,
-                        headers=dict(meta.get("headers") or {}),
-                        fetched_at=float(meta.get("fetched_at") or 0.0),
-                        body_path=body_path,
+                wait_s: float | None = None
+                body_bytes: bytes | None = None
+                # The body is streamed while the host slot is held, so
+                # per_host_parallel still bounds concurrent downloads.
+                with self._host_request(host):
+                    resp = self.session.get(
+                        normalized,
+                        timeout=self.timeout_s,
+                        headers=headers,
+                        allow_redirects=True,
+                        stream=True,
                     )
+                    with resp:
+                        if resp.status_code == 304 and body_path.exists():
+                            meta = cached_meta or {}
+                            return CachedResponse(
+                                url=normalized,
+                                final_url=str(meta.get("final_url") or str(resp.url)),
+                                status_code=304,
+                                headers=dict(meta.get("headers") or {}),
+                                fetched_at=float(meta.get("fetched_at") or 0.0),
+                                body_path=body_path,
+                            )
 
-                if resp.status_code in TRANSIENT_HTTP_STATUSES:
-                    retry_after_s = _retry_after_seconds(dict(resp.headers))
-                    if attempt < self.max_retries:
-                        wait_s = (
-                            retry_after_s
-                            if retry_after_s is not None
-                            else self.backoff_base_s * (2**attempt)
-                        )
-                        time.sleep(wait_s)
-                        continue
+                        if (
+                            resp.status_code in TRANSIENT_HTTP_STATUSES
+                            and attempt < self.max_retries
+                        ):
+                            retry_after_s = _retry_after_seconds(dict(resp.headers))
+                            wait_s = (
+                                retry_after_s
+                                if retry_after_s is not None
+                                else self.backoff_base_s * (2**attempt)
+                            )
+                        else:
+                            # Cache non-2xx responses too (raised below).
+                            body_bytes = _stream_body_to(resp, body_path)
+
+                if wait_s is not None:
+                    time.sleep(wait_s)
+                    continue
 
-                # Cache non-2xx responses; raise for persistent failures.
-                body_path.write_bytes(resp.content)
                 meta = {
                     "url": normalized,
                     "final_url": str(resp.url),
@@ -434,10 +749,7 @@ class Crawler:
                         "content-length": resp.headers.get("Content-Length", ""),
                     },
                 }
-                meta_path.write_text(
-                    json.dumps(meta, indent=2),
-                    encoding="utf-8",
-                )
+                meta_path.write_bytes(_dump_json_indented(meta))
 
                 resp.raise_for_status()
                 return CachedResponse(
@@ -447,6 +759,7 @@ class Crawler:
                     headers=dict(meta["headers"]),
                     fetched_at=float(meta["fetched_at"]),
                     body_path=body_path,
+                    body_bytes=body_bytes,
                 )
             except (requests.RequestException, OSError, ValueError) as e:
                 last_error = e
@@ -470,8 +783,27 @@ class Crawler:
         return urlparse(url).path.lower().endswith(".xml")
 
     def _append_manifest_item(self, item: dict) -> None:
-        with self.manifest_jsonl.open("a", encoding="utf-8", newline="\n") as fh:
-            fh.write(json.dumps(item, ensure_ascii=False) + "\n")
+        line = _json_line(item)
+        _append_line(self._manifest_fh, self.manifest_jsonl, line)
+
+    def _open_logs(self) -> None:
+        self.seen_path.parent.mkdir(parents=True, exist_ok=True)
+        self._seen_fh = _open_log(self.seen_path)
+        self._manifest_fh = _open_log(self.manifest_jsonl)
+        self._queue_log_fh = _open_log(self.queue_log_path)
+
+    def _flush_logs(self) -> None:
+        for fh in (self._seen_fh, self._manifest_fh, self._queue_log_fh):
+            if fh is not None:
+                fh.flush()
+
+    def _close_logs(self) -> None:
+        for fh in (self._seen_fh, self._manifest_fh, self._queue_log_fh):
+            if fh is not None:
+                fh.close()
+        self._seen_fh = None
+        self._manifest_fh = None
+        self._queue_log_fh = None
 
     def _export_raw(self, cached: CachedResponse) -> Path:
         content_type = cached.headers.get("content-type")
@@ -494,13 +826,17 @@ class Crawler:
         out.mkdir(parents=True, exist_ok=True)
         target = out / f"{_url_hash(cached.url)}{ext}"
         if not target.exists():
-            target.write_bytes(cached.body_path.read_bytes())
+            # copyfile streams (sendfile/copy_file_range where available)
+            # instead of holding the whole body in memory. A hardlink would
+            # be cheaper, but the cache body is rewritten in place on
+            # --refresh-cache and would then silently change the export.
+            shutil.copyfile(cached.body_path, target)
         return target
 
-    def _html_to_markdown(self, html: str, base_url: str) -> tuple[str, str]:
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Remove irrelevant bits.
+    def _html_to_markdown(
+        self, soup: BeautifulSoup, base_url: str
+    ) -> tuple[str, str]:
+        # Remove irrelevant bits (mutates `soup`; extract links first).
         for tag_name in ["script", "style", "noscript"]:
             for t in soup.find_all(tag_name):
                 t.decompose()
@@ -533,25 +869,12 @@ class Crawler:
         markdown = markdown.strip() + "\n\n" + f"Source: {base_url}\n"
         return title, markdown
 
-    def _extract_links(self, html: str, base_url: str) -> Iterable[str]:
-        soup = BeautifulSoup(html, "html.parser")
+    def _extract_links(self, soup: BeautifulSoup, base_url: str) -> Iterable[str]:
         # Discover URLs from common URL-bearing elements.
         # Keep this conservative: we only follow explicit URL-like attributes.
-        selector = (
-            "a[href], link[href], img[src], script[src], iframe[src], "
-            "source[src], video[src], audio[src], embed[src], object[data], "
-            "form[action]"
-        )
-        for tag in soup.select(selector):
-            if tag.name in {"a", "link"}:
-                attr = "href"
-            elif tag.name == "object":
-                attr = "data"
-            elif tag.name == "form":
-                attr = "action"
-            else:
-                attr = "src"
-
+        # find_all() by tag name avoids the (pure-Python) CSS selector engine.
+        for tag in soup.find_all(list(_LINK_ATTR_BY_TAG)):
+            attr = _LINK_ATTR_BY_TAG[tag.name]
             raw_value = tag.get(attr)
             if raw_value is None:
                 continue
@@ -566,7 +889,7 @@ class Crawler:
             yield _normalize_url(abs_url)
 
         # Meta refresh redirects (e.g. content="0; url=/path").
-        for meta in soup.select("meta[http-equiv][content]"):
+        for meta in soup.find_all("meta", attrs={"http-equiv": True, "content": True}):
             http_equiv_raw = meta.get("http-equiv")
             if isinstance(http_equiv_raw, list):
                 http_equiv_raw = http_equiv_raw[0] if http_equiv_raw else ""
@@ -575,7 +898,7 @@ class Crawler:
                 continue
             content = str(meta.get("content") or "")
             # Look for "url=..."; tolerate casing and whitespace.
-            m = re.search(r"\burl\s*=\s*([^;]+)", content, flags=re.IGNORECASE)
+            m = _META_REFRESH_URL_RE.search(content)
             if not m:
                 continue
             raw = m.group(1).strip().strip('"').strip("'")
@@ -600,24 +923,48 @@ class Crawler:
                     sitemaps.append(_normalize_url(url))
         return sitemaps
 
-    def _parse_sitemap_urls(self, xml_bytes: bytes) -> list[str]:
-        # Minimal parsing via BeautifulSoup.
-        soup = BeautifulSoup(xml_bytes, "xml")
+    def _parse_sitemap_urls(self, source: bytes | Path) -> list[str]:
+        # Stream <loc> elements (any namespace) instead of building a full
+        # tree; large sitemaps hold tens of thousands of URLs. recover=True
+        # keeps the old BeautifulSoup leniency towards malformed XML. A Path
+        # is read incrementally by lxml rather than loaded up front.
+        xml_source = str(source) if isinstance(source, Path) else io.BytesIO(source)
         urls: list[str] = []
-        for loc in soup.find_all("loc"):
-            if loc and loc.get_text(strip=True):
-                urls.append(_normalize_url(loc.get_text(strip=True)))
+        try:
+            for _, loc in etree.iterparse(xml_source, tag="{*}loc", recover=True):
+                text = "".join(loc.itertext()).strip()
+                if text:
+                    urls.append(_normalize_url(text))
+                loc.clear()
+        except etree.XMLSyntaxError:
+            # Raised even in recover mode for an empty document; keep what
+            # was collected, as BeautifulSoup would have.
+            pass
         return urls
 
-    def _persist_queue(self, queue: deque[tuple[str, int, str]]) -> None:
+    def _persist_queue(self, queue: Iterable[tuple[str, int, str]]) -> None:
+        """Snapshot the queue and reset the queue log (compaction).
+
+        Between snapshots the queue is persisted incrementally: _enqueue()
+        appends "+" lines and _log_dequeue() "-" lines to queue_urls.log.
+        """
+        # Keep the seen/manifest logs at least as current as the queue.
+        self._flush_logs()
         tmp = self.queue_path.with_suffix(".tmp")
         with tmp.open("w", encoding="utf-8", newline="\n") as fh:
             for url, depth, discovered_from in queue:
                 fh.write(f"{url}\t{depth}\t{discovered_from}\n")
         tmp.replace(self.queue_path)
-
-    def load_or_seed_queue(self, seeds: list[str]) -> deque[tuple[str, int, str]]:
-        queue: deque[tuple[str, int, str]] = deque()
+        # A crash before this point only leaves log entries that replay
+        # harmlessly on top of the new snapshot.
+        if self._queue_log_fh is not None:
+            self._queue_log_fh.truncate(0)
+        else:
+            self.queue_log_path.write_text("", encoding="utf-8")
+
+    def _load_queue(self) -> deque[tuple[str, int, str]]:
+        """Rebuild the queue from the last snapshot plus the queue log."""
+        pending: dict[str, tuple[str, int, str]] = {}
         if self.queue_path.exists():
             for line in self.queue_path.read_text(encoding="utf-8").splitlines():
                 if not line.strip():
@@ -626,9 +973,48 @@ class Crawler:
                 url = parts[0].strip()
                 depth = int(parts[1]) if len(parts) > 1 else 0
                 discovered_from = parts[2].strip() if len(parts) > 2 else "resume"
-                queue.append((url, depth, discovered_from))
+                pending[url] = (url, depth, discovered_from)
+
+        if self.queue_log_path.exists():
+            log_text = self.queue_log_path.read_text(
+                encoding="utf-8", errors="replace"
+            )
+            lines = log_text.split("\n")
+            # The log is buffered, so a crash can leave a partly flushed
+            # last record; anything after the final newline is dropped.
+            lines.pop()
+            for line in lines:
+                op, _, rest = line.partition("\t")
+                parts = rest.split("\t")
+                url = parts[0].strip()
+                if not url:
+                    continue
+                if op == "-":
+                    pending.pop(url, None)
+                elif op == "+" and url not in pending:
+                    # Every "+" record is written with depth and source; a
+                    # line without them (or with a non-numeric depth) was
+                    # torn, possibly with a later record run into it.
+                    if len(parts) < 3 or not parts[1].isdigit():
+                        continue
+                    pending[url] = (url, int(parts[1]), parts[2])
+
+        return deque(pending.values())
+
+    def load_or_seed_queue(self, seeds: list[str]) -> deque[tuple[str, int, str]]:
+        # The queue log is opened (created) before seeding, so only a
+        # non-empty log counts as state to resume from.
+        has_log = (
+            self.queue_log_path.exists() and self.queue_log_path.stat().st_size > 0
+        )
+        if self.queue_path.exists() or has_log:
+            queue = self._load_queue()
+            # Compact at once: a torn last log line would otherwise have
+            # the next appended record run into it.
+            self._persist_queue(queue)
             return queue
 
+        queue: deque[tuple[str, int, str]] = deque()
         for seed in seeds:
             self._enqueue(queue, seed, 0, "seed")
 
@@ -662,7 +1048,7 @@ class Crawler:
         target_dir.mkdir(parents=True, exist_ok=True)
         target = target_dir / path.name
         if not target.exists():
-            target.write_bytes(path.read_bytes())
+            shutil.copyfile(path, target)
 
         self._append_manifest_item(
             {
@@ -673,7 +1059,122 @@ class Crawler:
             }
         )
 
+    def _process_fetch_result(
+        self,
+        queue: deque[tuple[str, int, str]],
+        future: Future[CachedResponse],
+        url: str,
+        depth: int,
+        discovered_from: str,
+    ) -> bool:
+        """Record one finished fetch and enqueue what it links to.
+
+        Returns True if the URL was fetched (counts towards max_pages).
+        """
+        fetched = False
+        try:
+            cached = future.result()
+            fetched = True
+            self.stats["fetched"] += 1
+
+            raw_path = self._export_raw(cached)
+
+            item: dict = {
+                "kind": "fetched",
+                "url": cached.url,
+                "final_url": cached.final_url,
+                "status_code": cached.status_code,
+                "content_type": cached.headers.get("content-type", ""),
+                "discovered_from": discovered_from,
+                "depth": depth,
+                "stored_at": _utc_iso(),
+                "paths": {"raw": str(raw_path.relative_to(self.out_dir))},
+            }
+
+            # Sitemap discovery.
+            if self._is_xml_sitemap(cached.final_url, cached.headers):
+                try:
+                    urls = self._parse_sitemap_urls(
+                        cached.body_bytes
+                        if cached.body_bytes is not None
+                        else cached.body_path
+                    )
+                    self.stats["sitemap_urls"] += len(urls)
+                    base_url = cached.final_url
+                    for u in urls:
+                        self._enqueue(queue, u, depth + 1, base_url)
+                except (OSError, ValueError):
+                    self.stats["sitemap_parse_errors"] += 1
+
+            # HTML discovery + optional markdown export.
+            if self._is_html(cached.final_url, cached.headers):
+                try:
+                    html_text = (
+                        _decode_body_text(cached.body_bytes)
+                        if cached.body_bytes is not None
+                        else cached.body_path.read_text(
+                            encoding="utf-8", errors="replace"
+                        )
+                    )
+                    # Parse once for both consumers. Links are collected
+                    # before the Markdown pass strips script/style tags, so
+                    # script[src] URLs are still discovered.
+                    soup = BeautifulSoup(html_text, "lxml")
+                    base_url = cached.final_url
+                    links = list(self._extract_links(soup, base_url))
+                    title, markdown = self._html_to_markdown(soup, base_url)
+                    safe_title = _safe_filename_piece(title)
+                    url_key = _url_hash(cached.url)
+                    md_name = f"{safe_title}--{url_key}.md"
+                    md_path = self.pages_dir / md_name
+                    if not md_path.exists():
+                        md_path.write_text(
+                            markdown,
+                            encoding="utf-8",
+                            newline="\n",
+                        )
+                    item["title"] = title
+                    item["paths"]["markdown"] = str(
+                        md_path.relative_to(self.out_dir)
+                    )
+
+                    for link in links:
+                        self._enqueue(queue, link, depth + 1, base_url)
+                    self.stats["html_pages"] += 1
+                except (OSError, UnicodeError, ValueError):
+                    self.stats["html_parse_errors"] += 1
+
+            self._append_manifest_item(item)
+            return True
+
+        except (
+            requests.RequestException,
+            RuntimeError,
+            OSError,
+            UnicodeError,
+            ValueError,
+        ) as e:
+            self.stats["errors"] += 1
+            self._append_manifest_item(
+                {
+                    "kind": "error",
+                    "url": url,
+                    "discovered_from": discovered_from,
+                    "depth": depth,
+                    "stored_at": _utc_iso(),
+                    "error": str(e),
+                }
+            )
+            return fetched
+
     def crawl(self, *, seeds: list[str]) -> None:
+        self._open_logs()
+        try:
+            self._crawl(seeds)
+        finally:
+            self._close_logs()
+
+    def _crawl(self, seeds: list[str]) -> None:
         queue = self.load_or_seed_queue(seeds)
 
         # Include user-provided mapping PDF if present.
@@ -687,118 +1188,76 @@ class Crawler:
         )
 
         processed = 0
+        last_persisted = 0
+        # Flush the append-only logs every 25 pages; snapshot/compact the
+        # queue log less often since that rewrites the whole queue.
         persist_every = 25
-
-        while queue:
-            if self.max_pages > 0 and processed >= self.max_pages:
-                break
-
-            url, depth, discovered_from = queue.popleft()
-            if self.max_depth > 0 and depth > self.max_depth:
-                self.stats["skipped_max_depth"] += 1
-                continue
-
-            host = (urlparse(url).hostname or "").lower()
-            if self.respect_robots and host:
-                rules = self._fetch_robots(host)
-                if not rules.can_fetch(url):
-                    self.stats["robots_blocked"] += 1
-                    self._append_manifest_item(
-                        {
-                            "kind": "blocked",
-                            "url": url,
-                            "discovered_from": discovered_from,
-                            "depth": depth,
-                            "reason": "robots.txt",
-                            "stored_at": _utc_iso(),
-                        }
+        snapshot_every = 1000
+
+        # Fetches run on a small thread pool so network latency overlaps;
+        # per-host pacing is still enforced by _throttle(), and _pop_ready()
+        # prefers URLs for hosts that are not cooling down. Queue, manifest,
+        # stats and link discovery stay on this thread.
+        in_flight: dict[Future[CachedResponse], tuple[str, int, str]] = {}
+        host_busy: Counter[str] = Counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while queue or in_flight:
+                while queue and len(in_flight) < self.workers:
+                    if (
+                        self.max_pages > 0
+                        and processed + len(in_flight) >= self.max_pages
+                    ):
+                        break
+
+                    url, depth, discovered_from = self._pop_ready(
+                        queue, host_busy
                     )
-                    continue
-
-            try:
-                cached = self._fetch(url)
-                processed += 1
-                self.stats["fetched"] += 1
-
-                raw_path = self._export_raw(cached)
-
-                item: dict = {
-                    "kind": "fetched",
-                    "url": cached.url,
-                    "final_url": cached.final_url,
-                    "status_code": cached.status_code,
-                    "content_type": cached.headers.get("content-type", ""),
-                    "discovered_from": discovered_from,
-                    "depth": depth,
-                    "stored_at": _utc_iso(),
-                    "paths": {"raw": str(raw_path.relative_to(self.out_dir))},
-                }
+                    if self.max_depth > 0 and depth > self.max_depth:
+                        self.stats["skipped_max_depth"] += 1
+                        self._log_dequeue(url)
+                        continue
 
-                # Sitemap discovery.
-                if self._is_xml_sitemap(cached.final_url, cached.headers):
-                    try:
-                        urls = self._parse_sitemap_urls(cached.body_path.read_bytes())
-                        self.stats["sitemap_urls"] += len(urls)
-                        base_url = cached.final_url
-                        for u in urls:
-                            self._enqueue(queue, u, depth + 1, base_url)
-                    except (OSError, ValueError):
-                        self.stats["sitemap_parse_errors"] += 1
-
-                # HTML discovery + optional markdown export.
-                if self._is_html(cached.final_url, cached.headers):
-                    try:
-                        html_text = cached.body_path.read_text(
-                            encoding="utf-8", errors="replace"
-                        )
-                        title, markdown = self._html_to_markdown(
-                            html_text, cached.final_url
-                        )
-                        safe_title = _safe_filename_piece(title)
-                        url_key = _url_hash(cached.url)
-                        md_name = f"{safe_title}--{url_key}.md"
-                        md_path = self.pages_dir / md_name
-                        if not md_path.exists():
-                            md_path.write_text(
-                                markdown,
-                                encoding="utf-8",
-                                newline="\n",
+                    host = (urlparse(url).hostname or "").lower()
+                    if self.respect_robots and host:
+                        rules = self._fetch_robots(host)
+                        if not rules.can_fetch(url):
+                            self.stats["robots_blocked"] += 1
+                            self._append_manifest_item(
+                                {
+                                    "kind": "blocked",
+                                    "url": url,
+                                    "discovered_from": discovered_from,
+                                    "depth": depth,
+                                    "reason": "robots.txt",
+                                    "stored_at": _utc_iso(),
+                                }
                             )
-                        item["title"] = title
-                        item["paths"]["markdown"] = str(
-                            md_path.relative_to(self.out_dir)
-                        )
+                            self._log_dequeue(url)
+                            continue
 
-                        base_url = cached.final_url
-                        for link in self._extract_links(html_text, base_url):
-                            self._enqueue(queue, link, depth + 1, base_url)
-                        self.stats["html_pages"] += 1
-                    except (OSError, UnicodeError, ValueError):
-                        self.stats["html_parse_errors"] += 1
-
-                self._append_manifest_item(item)
-
-            except (
-                requests.RequestException,
-                RuntimeError,
-                OSError,
-                UnicodeError,
-                ValueError,
-            ) as e:
-                self.stats["errors"] += 1
-                self._append_manifest_item(
-                    {
-                        "kind": "error",
-                        "url": url,
-                        "discovered_from": discovered_from,
-                        "depth": depth,
-                        "stored_at": _utc_iso(),
-                        "error": str(e),
-                    }
-                )
+                    future = pool.submit(self._fetch, url)
+                    in_flight[future] = (url, depth, discovered_from)
+                    host_busy[host] += 1
 
-            if processed % persist_every == 0:
-                self._persist_queue(queue)
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    url, depth, discovered_from = in_flight.pop(future)
+                    host_busy[(urlparse(url).hostname or "").lower()] -= 1
+                    if self._process_fetch_result(
+                        queue, future, url, depth, discovered_from
+                    ):
+                        processed += 1
+                    self._log_dequeue(url)
+
+                    if processed != last_persisted and processed % persist_every == 0:
+                        last_persisted = processed
+                        if processed % snapshot_every == 0:
+                            self._persist_queue([*in_flight.values(), *queue])
+                        else:
+                            self._flush_logs()
 
         # Final queue persistence.
         self._persist_queue(queue)
@@ -856,6 +1315,28 @@ def main() -> None:
         default=0.5,
         help="Delay between requests per host",
     )
+    parser.add_argument(
+        "--per-host-parallel",
+        type=int,
+        default=DEFAULT_PER_HOST_PARALLEL,
+        help="Max concurrent requests per host",
+    )
+    parser.add_argument(
+        "--host-parallel",
+        action="append",
+        default=[f"{h}={n}" for h, n in DEFAULT_HOST_PARALLEL.items()],
+        metavar="HOST=N",
+        help=(
+            "Per-host override of --per-host-parallel (repeatable). "
+            "Default: data.uspto.gov=1"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent fetches (1 = serial); per-host delay still applies",
+    )
     parser.add_argument(
         "--timeout",
         type=int,
@@ -885,6 +1366,14 @@ def main() -> None:
         action="store_true",
         help="Revalidate cached items via conditional GET",
     )
+    parser.add_argument(
+        "--no-revalidate",
+        action="store_true",
+        help=(
+            "With --refresh-cache, re-download bodies instead of sending "
+            "If-None-Match/If-Modified-Since"
+        ),
+    )
     parser.add_argument(
         "--no-robots",
         action="store_true",
@@ -912,6 +1401,13 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    host_parallel: dict[str, int] = {}
+    for spec in args.host_parallel:
+        host, _, count = spec.partition("=")
+        if not host.strip() or not count.strip().isdigit():
+            parser.error(f"--host-parallel expects HOST=N, got {spec!r}")
+        host_parallel[host.strip().lower()] = int(count)
+
     out_dir: Path = args.out
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -937,6 +1433,10 @@ def main() -> None:
         max_depth=int(args.max_depth),
         refresh_cache=bool(args.refresh_cache),
         respect_robots=not bool(args.no_robots),
+        workers=int(args.workers),
+        per_host_parallel=int(args.per_host_parallel),
+        host_parallel=host_parallel,
+        revalidate=not bool(args.no_revalidate),
     )
 
     # Normalize seeds.
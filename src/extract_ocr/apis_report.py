@@ -1,41 +1,78 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import os
 import re
 import textwrap
 import time
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
-from urllib.parse import urlparse, urlunparse
+from typing import Iterator
+from urllib.parse import urlparse, urlsplit, urlunsplit
+
+from .http_client import load_json
+from .manifest import dump_json_indented, iter_jsonl_tail
+from .urls import url_hash
 
 _USPTO_APIS_BASE = "https://data.uspto.gov"
 
 # Capture both absolute and relative endpoints. We only emit endpoints under
 # https://data.uspto.gov/apis/...
-_ABS_APIS_RE = re.compile(
-    r"https?://data\.uspto\.gov/apis/[A-Za-z0-9._~:/?#\[\]@!$&'()*+,;=%-]+",
+#
+# The patterns are ASCII-only, so they run over the raw page bytes and only
+# matched spans are decoded. _APIS_RE fuses both into one scan; the separate
+# patterns find the other kind nested inside a matched span (e.g. a relative
+# "/apis/..." in the query string of an absolute URL).
+_URL_CHARS = rb"[A-Za-z0-9._~:/?#\[\]@!$&'()*+,;=%-]+"
+_ABS_APIS = rb"https?://data\.uspto\.gov/apis/" + _URL_CHARS
+_REL_APIS = rb"(?<![A-Za-z0-9_])/apis/" + _URL_CHARS
+_APIS_RE = re.compile(
+    rb"(?P<abs>" + _ABS_APIS + rb")|(?P<rel>" + _REL_APIS + rb")",
     re.IGNORECASE,
 )
-_REL_APIS_RE = re.compile(
-    r"(?<![A-Za-z0-9_])(/apis/[A-Za-z0-9._~:/?#\[\]@!$&'()*+,;=%-]+)",
-    re.IGNORECASE,
+_ABS_APIS_RE = re.compile(_ABS_APIS, re.IGNORECASE)
+_REL_APIS_RE = re.compile(_REL_APIS, re.IGNORECASE)
+
+# Sidecar written by incremental runs: how far manifest.jsonl was scanned
+# and what had been collected up to there.
+APIS_REPORT_STATE_NAME = "apis_endpoints_report.state.json"
+_REPORT_STATE_VERSION = 1
+# Bytes of manifest before the saved offset that must still match.
+_REPORT_STATE_TAIL_BYTES = 4096
+
+# Below this many page files a process pool costs more than it saves.
+_PARALLEL_SCAN_MIN_PAGES = 256
+_PARALLEL_SCAN_CHUNKSIZE = 32
+
+# Characters not allowed in (Windows) filenames, mapped to "-". A
+# translate table does the replacement in one C-level pass.
+_FILENAME_TRANS = str.maketrans(
+    dict.fromkeys([*'<>:"/\\|?*', *map(chr, range(0x20))], "-")
 )
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
 
-_INVALID_FILENAME_CHARS = re.compile(r"[<>:\"/\\|?*\x00-\x1F]")
+# Canonical endpoints (the common case) are returned by _normalize_endpoint
+# as-is. Anything _normalize_endpoint would strip, trim or rewrite sends the
+# URL down the full urlsplit path instead.
+_CANONICAL_ENDPOINT_PREFIX = "https://data.uspto.gov/apis/"
+_NON_CANONICAL_ENDPOINT_RE = re.compile(r"[\s\"'<>\[\](){}#;]|[.,:?]\Z")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ApiEndpointFinding:
     endpoint: str
     source_url: str
 
 
 def _safe_filename_component(text: str) -> str:
-    cleaned = _INVALID_FILENAME_CHARS.sub("-", (text or "").strip())
+    cleaned = (text or "").strip().translate(_FILENAME_TRANS)
     cleaned = cleaned.strip(". ")
-    cleaned = re.sub(r"\s+", " ", cleaned)
+    # ASCII whitespace other than " " is already "-", so ASCII text only
+    # needs collapsing when it has a run of spaces.
+    if not cleaned.isascii() or "  " in cleaned:
+        cleaned = _WHITESPACE_RUN_RE.sub(" ", cleaned)
     if not cleaned:
         cleaned = "page"
     return cleaned[:150]
@@ -53,20 +90,31 @@ def _guess_title_from_url(url: str) -> str:
     return last
 
 
+@lru_cache(maxsize=65536)
 def _fallback_resp_md_relpath(endpoint_url: str) -> str:
     """Best-effort deterministic path for pages/<stem>.resp.md.
 
     Prefer manifest-provided paths when available; this is only used when
     the export hasn't yet recorded rendered endpoint variants.
+
+    The stem must match what the crawl writes (sha256 of the URL, first 12
+    hex chars), so the hash cannot be swapped for a faster one here alone.
     """
 
-    cache_key = hashlib.sha256(endpoint_url.encode("utf-8")).hexdigest()[:12]
+    cache_key = url_hash(endpoint_url)
     safe_title = _safe_filename_component(_guess_title_from_url(endpoint_url))
     stem = f"{safe_title}--{cache_key}".replace(" ", "-")
     return f"pages/{stem}.resp.md"
 
 
+# The same endpoint shows up on many pages; memoize the urlsplit round-trip.
+@lru_cache(maxsize=65536)
 def _normalize_endpoint(url: str) -> str | None:
+    if url.startswith(
+        _CANONICAL_ENDPOINT_PREFIX
+    ) and not _NON_CANONICAL_ENDPOINT_RE.search(url):
+        return url
+
     url = url.strip().strip("\"'<>[](){}.,;:")
 
     # Heuristic cleanup: when scanning Markdown/HTML, we can end up matching
@@ -85,7 +133,8 @@ def _normalize_endpoint(url: str) -> str | None:
             if nxt in {"(", "["}:
                 url = url[:close_bracket]
     try:
-        parsed = urlparse(url)
+        # urlsplit skips urlparse's ;params split; params stay in the path.
+        parsed = urlsplit(url)
     except ValueError:
         return None
 
@@ -97,57 +146,95 @@ def _normalize_endpoint(url: str) -> str | None:
     path = parsed.path or ""
     if not path.startswith("/apis/"):
         return None
+    # urlparse/urlunparse dropped an empty ";" params marker from the last
+    # segment; keep doing so, so endpoints dedupe exactly as before.
+    if path.endswith(";") and path.find(";", path.rfind("/")) == len(path) - 1:
+        path = path[:-1]
 
     parsed = parsed._replace(
         scheme="https" if scheme in {"http", "https"} else "https",
         netloc="data.uspto.gov",
+        path=path,
         fragment="",
     )
-    return urlunparse(parsed)
+    return urlunsplit(parsed)
+
+
+def _iter_endpoints(data: bytes) -> Iterator[str]:
+    """Yield each normalized endpoint found in ``data``, in match order."""
+
+    for m in _APIS_RE.finditer(data):
+        span = m.group(0)
+        if m.lastgroup == "abs":
+            candidates = [span.decode("ascii")]
+            nested = _REL_APIS_RE
+        else:
+            candidates = [_USPTO_APIS_BASE + span.decode("ascii")]
+            nested = _ABS_APIS_RE
+        # Spans start with "h" or "/apis/", so a nested match never begins
+        # at offset 0; scanning the span alone is equivalent to the text.
+        for inner in nested.finditer(span, 1):
+            inner_url = inner.group(0).decode("ascii")
+            if nested is _REL_APIS_RE:
+                inner_url = _USPTO_APIS_BASE + inner_url
+            candidates.append(inner_url)
+        for candidate in candidates:
+            normalized = _normalize_endpoint(candidate)
+            if normalized:
+                yield normalized
 
 
 def extract_api_endpoints(
-    text: str,
+    text: str | bytes,
     *,
     source_url: str,
 ) -> list[ApiEndpointFinding]:
-    found: list[ApiEndpointFinding] = []
+    data = text
+    if isinstance(data, str):
+        data = data.encode("utf-8", errors="replace")
+    return [
+        ApiEndpointFinding(endpoint=endpoint, source_url=source_url)
+        for endpoint in _iter_endpoints(data)
+    ]
+
 
-    for m in _ABS_APIS_RE.finditer(text):
-        normalized = _normalize_endpoint(m.group(0))
-        if normalized:
-            found.append(ApiEndpointFinding(endpoint=normalized, source_url=source_url))
+def _scan_page(job: tuple[str, str]) -> tuple[str, set[str]]:
+    """Return (source_url, endpoints) for one page file.
 
-    for m in _REL_APIS_RE.finditer(text):
-        normalized = _normalize_endpoint(_USPTO_APIS_BASE + m.group(1))
-        if normalized:
-            found.append(ApiEndpointFinding(endpoint=normalized, source_url=source_url))
+    Module-level so ProcessPoolExecutor workers can unpickle it.
+    """
 
-    return found
+    path, source_url = job
+    # Missing paths and directories fail the read; no stat needed.
+    try:
+        # Scanned as bytes; see _APIS_RE.
+        text = Path(path).read_bytes()
+    except OSError:
+        return source_url, set()
+    # No ApiEndpointFinding per match; only the endpoint strings are needed.
+    return source_url, set(_iter_endpoints(text))
 
 
-def _iter_ingested_pages(manifest_jsonl: Path) -> Iterable[dict]:
-    with manifest_jsonl.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                evt = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            yield evt
+_SOURCE_BULLET_PREFIX = "  - source: "
 
 
 def _wrap_source_bullets(
     *,
     source_url: str,
     max_width: int = 100,
-) -> list[str]:
-    prefix = "  - source: "
+) -> tuple[str, ...]:
+    prefix = _SOURCE_BULLET_PREFIX
     if len(prefix) + len(source_url) <= max_width:
-        return [f"{prefix}{source_url}"]
+        return (f"{prefix}{source_url}",)
+    return _wrap_long_source_bullets(source_url, max_width)
+
 
+# The same source pages are cited under many endpoints; wrap each once.
+@lru_cache(maxsize=16384)
+def _wrap_long_source_bullets(
+    source_url: str, max_width: int
+) -> tuple[str, ...]:
+    prefix = _SOURCE_BULLET_PREFIX
     wrapped = textwrap.wrap(
         source_url,
         width=max_width - len(prefix),
@@ -155,37 +242,145 @@ def _wrap_source_bullets(
         break_on_hyphens=False,
     )
     if not wrapped:
-        return [f"{prefix}{source_url}"]
+        return (f"{prefix}{source_url}",)
 
-    lines = [f"{prefix}{wrapped[0]}"]
     continuation = " " * len(prefix)
-    lines.extend([f"{continuation}{part}" for part in wrapped[1:]])
-    return lines
+    return (
+        f"{prefix}{wrapped[0]}",
+        *(f"{continuation}{part}" for part in wrapped[1:]),
+    )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ApiReportData:
     export_dir: Path
     scanned_pages: int
     endpoints_to_sources: dict[str, list[str]]
     endpoints_to_resp_md: dict[str, str]
+    # Relative paths of files under export_dir (see _list_export_files).
+    existing_files: frozenset[str] = field(default=frozenset(), repr=False)
 
     @property
     def endpoints(self) -> list[str]:
         return sorted(self.endpoints_to_sources.keys())
 
+    def has_path(self, relpath: str) -> bool:
+        return _export_path_exists(
+            self.export_dir, self.existing_files, relpath
+        )
+
+
+def _list_export_files(export_dir: Path) -> frozenset[str]:
+    """Collect every file under export_dir in one directory walk.
+
+    Lets the report check thousands of manifest paths without a stat() each.
+    Dot-directories (.cache, .state) are skipped; nothing the report looks
+    up lives there, and the cache can hold far more files than the export.
+    """
+
+    found: set[str] = set()
+    for root, dirs, files in os.walk(export_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        rel_root = os.path.relpath(root, export_dir)
+        for name in files:
+            found.add(os.path.normpath(os.path.join(rel_root, name)))
+    return frozenset(found)
+
+
+def _export_path_exists(
+    export_dir: Path, existing_files: frozenset[str], relpath: str
+) -> bool:
+    if os.path.normpath(relpath) in existing_files:
+        return True
+    # Not seen by the walk: absolute, outside the export, in a skipped
+    # directory, or differing only in case. Ask the filesystem.
+    return (export_dir / relpath).exists()
+
+
+def _manifest_tail_digest(manifest_jsonl: Path, offset: int) -> str:
+    start = max(0, offset - _REPORT_STATE_TAIL_BYTES)
+    with manifest_jsonl.open("rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _load_report_state(state_path: Path, manifest_jsonl: Path) -> dict | None:
+    """Return saved incremental state if it still matches the manifest.
+
+    The manifest is append-only; if it was truncated or rewritten (the
+    bytes before the saved offset changed), the state is discarded and
+    the caller rescans from the start.
+    """
+
+    state = load_json(state_path)
+    if not state or state.get("version") != _REPORT_STATE_VERSION:
+        return None
+    offset = state.get("offset")
+    if not isinstance(offset, int) or offset < 0:
+        return None
+    try:
+        if offset > manifest_jsonl.stat().st_size:
+            return None
+        digest = _manifest_tail_digest(manifest_jsonl, offset)
+    except OSError:
+        return None
+    if digest != state.get("tail_sha256"):
+        return None
+    return state
+
+
+def collect_apis_report_data(
+    *,
+    export_dir: Path,
+    workers: int = 1,
+    incremental: bool = False,
+) -> ApiReportData:
+    """Scan the export's pages for endpoints.
+
+    workers > 1 scans page files in that many processes (0 = one per CPU);
+    small exports are always scanned in-process.
+
+    With incremental=True, results are saved to APIS_REPORT_STATE_NAME and
+    later runs only scan manifest events appended since. This assumes
+    pages already scanned are not rewritten in place; delete the state
+    file (or run without incremental) to force a full scan.
+    """
 
-def collect_apis_report_data(*, export_dir: Path) -> ApiReportData:
     export_dir = export_dir.resolve()
     manifest_jsonl = export_dir / "manifest.jsonl"
     if not manifest_jsonl.exists():
         raise FileNotFoundError(f"Missing manifest.jsonl in: {export_dir}")
 
-    endpoints_to_sources: dict[str, set[str]] = {}
-    endpoints_to_resp_md: dict[str, str] = {}
+    # Sources are appended (duplicates included) and deduped once below.
+    endpoints_to_sources: dict[str, list[str]] = {}
+    # resp.md candidates per endpoint, ordered by last occurrence, plus the
+    # first one seen; resolved against the filesystem once at the end.
+    resp_md_candidates: dict[str, dict[str, None]] = {}
+    resp_md_first: dict[str, str] = {}
     scanned_pages = 0
-
-    for evt in _iter_ingested_pages(manifest_jsonl):
+    offset = 0
+
+    state_path = export_dir / APIS_REPORT_STATE_NAME
+    state = None
+    if incremental:
+        state = _load_report_state(state_path, manifest_jsonl)
+    if state is not None:
+        offset = int(state["offset"])
+        scanned_pages = int(state.get("scanned_pages") or 0)
+        endpoints_to_sources = {
+            str(k): list(v)
+            for k, v in (state.get("endpoints_to_sources") or {}).items()
+        }
+        resp_md_candidates = {
+            str(k): dict.fromkeys(v)
+            for k, v in (state.get("resp_md_candidates") or {}).items()
+        }
+        resp_md_first = dict(state.get("resp_md_first") or {})
+
+    existing_files = _list_export_files(export_dir)
+    jobs: list[tuple[str, str]] = []
+
+    for evt, offset in iter_jsonl_tail(manifest_jsonl, offset):
         if evt.get("kind") == "rendered_endpoint_variants":
             url = str(evt.get("url") or "")
             normalized = _normalize_endpoint(url)
@@ -194,14 +389,10 @@ def collect_apis_report_data(*, export_dir: Path) -> ApiReportData:
             paths = evt.get("paths") or {}
             resp_md = paths.get("resp_md")
             if isinstance(resp_md, str) and resp_md:
-                candidate = resp_md
-                candidate_path = export_dir / candidate
-                existing = endpoints_to_resp_md.get(normalized)
-
-                if candidate_path.exists():
-                    endpoints_to_resp_md[normalized] = candidate
-                elif not existing:
-                    endpoints_to_resp_md[normalized] = candidate
+                resp_md_first.setdefault(normalized, resp_md)
+                seen = resp_md_candidates.setdefault(normalized, {})
+                seen.pop(resp_md, None)
+                seen[resp_md] = None
 
         if evt.get("kind") not in {"ingested_local", "fetched"}:
             continue
@@ -211,37 +402,66 @@ def collect_apis_report_data(*, export_dir: Path) -> ApiReportData:
             continue
 
         paths = evt.get("paths") or {}
-        candidates: list[Path] = []
+        candidates: list[str] = []
         for key in ("page_md", "raw"):
             rel = paths.get(key)
             if isinstance(rel, str) and rel:
-                candidates.append(export_dir / rel)
+                candidates.append(str(export_dir / rel))
 
         if not candidates:
             continue
 
         scanned_pages += 1
-        for p in candidates:
-            if not p.exists() or not p.is_file():
-                continue
-            try:
-                text = p.read_text(encoding="utf-8", errors="replace")
-            except OSError:
-                continue
+        jobs.extend((p, source_url) for p in candidates)
+
+    if workers != 1 and len(jobs) >= _PARALLEL_SCAN_MIN_PAGES:
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            results = list(
+                pool.map(_scan_page, jobs, chunksize=_PARALLEL_SCAN_CHUNKSIZE)
+            )
+    else:
+        results = [_scan_page(job) for job in jobs]
 
-            for finding in extract_api_endpoints(text, source_url=source_url):
-                endpoints_to_sources.setdefault(finding.endpoint, set()).add(
-                    finding.source_url
-                )
+    for source_url, endpoints in results:
+        for endpoint in endpoints:
+            endpoints_to_sources.setdefault(endpoint, []).append(source_url)
 
     materialized: dict[str, list[str]] = {
-        endpoint: sorted(sources) for endpoint, sources in endpoints_to_sources.items()
+        endpoint: sorted(dict.fromkeys(sources))
+        for endpoint, sources in endpoints_to_sources.items()
     }
+
+    # The last candidate that exists wins; otherwise the first one listed.
+    endpoints_to_resp_md: dict[str, str] = {}
+    for endpoint, seen in resp_md_candidates.items():
+        endpoints_to_resp_md[endpoint] = next(
+            (
+                c
+                for c in reversed(seen)
+                if _export_path_exists(export_dir, existing_files, c)
+            ),
+            resp_md_first[endpoint],
+        )
+
+    if incremental:
+        state = {
+            "version": _REPORT_STATE_VERSION,
+            "offset": offset,
+            "tail_sha256": _manifest_tail_digest(manifest_jsonl, offset),
+            "scanned_pages": scanned_pages,
+            "endpoints_to_sources": materialized,
+            "resp_md_candidates": {
+                k: list(v) for k, v in resp_md_candidates.items()
+            },
+            "resp_md_first": resp_md_first,
+        }
+        state_path.write_bytes(dump_json_indented(state))
     return ApiReportData(
         export_dir=export_dir,
         scanned_pages=scanned_pages,
         endpoints_to_sources=materialized,
         endpoints_to_resp_md=endpoints_to_resp_md,
+        existing_files=existing_files,
     )
 
 
@@ -249,6 +469,8 @@ def write_apis_report(
     *,
     export_dir: Path,
     report_path: Path | None = None,
+    workers: int = 1,
+    incremental: bool = False,
 ) -> Path:
     """Scan an existing export directory and write a deduped /apis/ report.
 
@@ -260,37 +482,40 @@ def write_apis_report(
     Output: a Markdown report listing unique endpoints and source page URLs.
     """
 
-    report = collect_apis_report_data(export_dir=export_dir)
+    report = collect_apis_report_data(
+        export_dir=export_dir, workers=workers, incremental=incremental
+    )
     if report_path is None:
         report_path = report.export_dir / "apis_endpoints_report.md"
 
     endpoints = report.endpoints
     generated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
-    lines: list[str] = []
-    lines.append("# data.uspto.gov /apis/ endpoint inventory")
-    lines.append("")
-    lines.append(f"Generated: {generated_at}")
-    lines.append(f"Export dir: {report.export_dir}")
-    lines.append(f"Pages scanned (manifest events): {report.scanned_pages}")
-    lines.append(f"Unique endpoints: {len(endpoints)}")
-    lines.append("")
-
-    for endpoint in endpoints:
-        sources = report.endpoints_to_sources.get(endpoint) or []
-        resp_md = report.endpoints_to_resp_md.get(endpoint)
-        if not resp_md:
-            resp_md = _fallback_resp_md_relpath(endpoint)
-
-        resp_md_path = report.export_dir / resp_md
-        missing_marker = ""
-        if not resp_md_path.exists():
-            missing_marker = " (MISSING resp.md)"
-
-        lines.append(f"- [{endpoint}]({resp_md}){missing_marker}")
-        for src in sources:
-            lines.extend(_wrap_source_bullets(source_url=src))
+    header: list[str] = []
+    header.append("# data.uspto.gov /apis/ endpoint inventory")
+    header.append("")
+    header.append(f"Generated: {generated_at}")
+    header.append(f"Export dir: {report.export_dir}")
+    header.append(f"Pages scanned (manifest events): {report.scanned_pages}")
+    header.append(f"Unique endpoints: {len(endpoints)}")
+    header.append("")
 
+    # Stream entries to the file rather than joining one large string.
     report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    with report_path.open("w", encoding="utf-8") as fh:
+        fh.writelines(f"{line}\n" for line in header)
+        for endpoint in endpoints:
+            sources = report.endpoints_to_sources.get(endpoint) or []
+            resp_md = report.endpoints_to_resp_md.get(endpoint)
+            if not resp_md:
+                resp_md = _fallback_resp_md_relpath(endpoint)
+
+            missing_marker = ""
+            if not report.has_path(resp_md):
+                missing_marker = " (MISSING resp.md)"
+
+            fh.write(f"- [{endpoint}]({resp_md}){missing_marker}\n")
+            for src in sources:
+                bullets = _wrap_source_bullets(source_url=src)
+                fh.writelines(f"{line}\n" for line in bullets)
     return report_path
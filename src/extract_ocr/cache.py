@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
 from .http_client import FetchResult, load_json
+from .manifest import dump_json_indented
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CacheEntry:
     body_path: Path
     meta_path: Path
@@ -33,8 +34,39 @@ def read_cached(entry: CacheEntry) -> tuple[bytes | None, dict | None]:
     return body, meta
 
 
+def read_cached_meta(entry: CacheEntry) -> dict | None:
+    """Return only the cached meta; the body is left on disk."""
+    return load_json(entry.meta_path)
+
+
+def conditional_headers(meta: dict | None) -> dict[str, str]:
+    """If-None-Match/If-Modified-Since headers for revalidating an entry."""
+    headers: dict[str, str] = {}
+    if not meta:
+        return headers
+    etag = meta.get("etag")
+    last_modified = meta.get("last_modified")
+    if etag:
+        headers["If-None-Match"] = str(etag)
+    if last_modified:
+        headers["If-Modified-Since"] = str(last_modified)
+    return headers
+
+
+def _replace_bytes(path: Path, data: bytes) -> None:
+    # Write a sibling temp file and rename it over the target, so readers
+    # never see a partially written file.
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
 def write_cached(entry: CacheEntry, result: FetchResult) -> None:
-    entry.body_path.write_bytes(result.body)
+    # An entry only counts once its meta exists, so drop the old meta before
+    # replacing the body and write the new one last: an interrupted write
+    # leaves a miss, never a new body paired with the old validators.
+    entry.meta_path.unlink(missing_ok=True)
+    _replace_bytes(entry.body_path, result.body)
     meta = {
         "url": result.url,
         "final_url": result.final_url,
@@ -44,6 +76,4 @@ def write_cached(entry: CacheEntry, result: FetchResult) -> None:
         "etag": result.headers.get("ETag"),
         "last_modified": result.headers.get("Last-Modified"),
     }
-    entry.meta_path.write_text(
-        json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8"
-    )
+    _replace_bytes(entry.meta_path, dump_json_indented(meta))
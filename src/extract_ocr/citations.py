@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
 
+from .manifest import dump_json_indented
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class CitationItem:
     title: str
     url: str
@@ -15,29 +17,44 @@ class CitationItem:
     author: str | None = None
 
 
-def write_ris(items: list[CitationItem], out_path: Path) -> None:
-    lines: list[str] = []
-    for it in items:
-        # Use ELEC/GEN to cover web help pages.
-        lines.append("TY  - ELEC")
-        lines.append(f"TI  - {it.title}")
-        if it.author:
-            lines.append(f"A1  - {it.author}")
-        if it.publisher:
-            lines.append(f"PB  - {it.publisher}")
-        lines.append(f"UR  - {it.url}")
-        lines.append(f"Y2  - {it.accessed}")
-        if it.local_path:
-            lines.append(f"L1  - {it.local_path}")
-        lines.append("ER  - ")
-        lines.append("")
+def _write_records(out_path: Path, records: Iterable[str]) -> None:
+    """Write blank-line separated records (each ending in a newline).
+
+    Streams to the file instead of joining everything into one string. The
+    output ends in a single newline with trailing whitespace stripped, as
+    the earlier join-then-rstrip writers produced.
+    """
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(
-        "\n".join(lines).rstrip() + "\n", encoding="utf-8", newline="\n"
+    with out_path.open("w", encoding="utf-8", newline="\n") as fh:
+        prev: str | None = None
+        for record in records:
+            if prev is not None:
+                fh.write(prev + "\n")
+            prev = record
+        fh.write("\n" if prev is None else prev.rstrip() + "\n")
+
+
+def _optional_line(prefix: str, value: str | None, suffix: str = "") -> str:
+    return f"{prefix}{value}{suffix}\n" if value else ""
+
+
+def _ris_entry(it: CitationItem) -> str:
+    # Use ELEC/GEN to cover web help pages.
+    return (
+        f"TY  - ELEC\nTI  - {it.title}\n"
+        f"{_optional_line('A1  - ', it.author)}"
+        f"{_optional_line('PB  - ', it.publisher)}"
+        f"UR  - {it.url}\nY2  - {it.accessed}\n"
+        f"{_optional_line('L1  - ', it.local_path)}"
+        "ER  - \n"
     )
 
 
+def write_ris(items: list[CitationItem], out_path: Path) -> None:
+    _write_records(out_path, map(_ris_entry, items))
+
+
 def write_csl_json(items: list[CitationItem], out_path: Path) -> None:
     csl: list[dict[str, object]] = []
     for it in items:
@@ -56,31 +73,23 @@ def write_csl_json(items: list[CitationItem], out_path: Path) -> None:
         csl.append(entry)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(
-        json.dumps(csl, indent=2, ensure_ascii=False),
-        encoding="utf-8",
+    out_path.write_bytes(dump_json_indented(csl))
+
+
+def _bibtex_entry(idx: int, it: CitationItem) -> str:
+    return (
+        f"@online{{ref{idx:04d},\n  title = {{{it.title}}},\n"
+        f"{_optional_line('  author = {', it.author, '},')}"
+        f"{_optional_line('  organization = {', it.publisher, '},')}"
+        f"  url = {{{it.url}}},\n  urldate = {{{it.accessed}}},\n"
+        f"{_optional_line('  note = {Local copy: ', it.local_path, '},')}"
+        "}\n"
     )
 
 
 def write_bibtex(items: list[CitationItem], out_path: Path) -> None:
     # Minimal, robust BibTeX @online-like entries.
-    lines: list[str] = []
-    for idx, it in enumerate(items, start=1):
-        key = f"ref{idx:04d}"
-        lines.append(f"@online{{{key},")
-        lines.append(f"  title = {{{it.title}}},")
-        if it.author:
-            lines.append(f"  author = {{{it.author}}},")
-        if it.publisher:
-            lines.append(f"  organization = {{{it.publisher}}},")
-        lines.append(f"  url = {{{it.url}}},")
-        lines.append(f"  urldate = {{{it.accessed}}},")
-        if it.local_path:
-            lines.append(f"  note = {{Local copy: {it.local_path}}},")
-        lines.append("}")
-        lines.append("")
-
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(
-        "\n".join(lines).rstrip() + "\n", encoding="utf-8", newline="\n"
+    _write_records(
+        out_path,
+        (_bibtex_entry(idx, it) for idx, it in enumerate(items, start=1)),
     )
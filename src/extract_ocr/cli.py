@@ -1,29 +1,148 @@
 from __future__ import annotations
 
 import argparse
+import os
 import re
 import sys
-from pathlib import Path
-
-import requests
-
-from .apis_report import collect_apis_report_data, write_apis_report
-from .citations import write_bibtex, write_csl_json, write_ris
-from .crawl import (
-    CrawlConfig,
-    Crawler,
-    ensure_export_api_endpoint_variants,
-    ensure_export_html_variants,
-    ensure_export_non_html_variants,
-    extract_links_from_html,
-    is_waf_challenge,
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Iterator
+
+# Subcommand code (requests, bs4, lxml, ...) is imported inside the branch
+# that runs it, so --help and inspect-export start without loading it.
+if TYPE_CHECKING:
+    import requests
+
+# "Mark of the Web" comment browsers add near the top of saved pages.
+_SAVED_FROM_URL_RE = re.compile(
+    rb"saved\s+from\s+url=\(\d+\)(https?://[^\s>]+)", re.IGNORECASE
 )
-from .export_inspect import inspect_export
-from .exporters.endnote25_windows import EndNoteExportConfig, EndNoteExporter
-from .exporters.uspto_data_portal import USPTODataPortalConfig
-from .exporters.uspto_data_portal import run as run_uspto
-from .http_client import HttpClient
-from .urls import UrlScope
+# Only this much of a seed file is searched for the comment.
+_SAVED_FROM_URL_SCAN_BYTES = 8192
+
+
+# Seed HTML sets at least this large are prepared in a process pool.
+_PARALLEL_SEED_MIN_FILES = 16
+
+
+def _infer_saved_from_url(raw: bytes) -> str | None:
+    m = _SAVED_FROM_URL_RE.search(raw, 0, _SAVED_FROM_URL_SCAN_BYTES)
+    if m and m.end() == _SAVED_FROM_URL_SCAN_BYTES:
+        # The URL may run past the window; match it in full.
+        m = _SAVED_FROM_URL_RE.match(raw, m.start())
+    if not m:
+        return None
+    return m.group(1).decode("utf-8", errors="replace").strip()
+
+
+def _walk_html(root: str) -> Iterator[str]:
+    """Yield .html files under root in sorted ``Path`` order.
+
+    Browser "<name>_files" asset directories are pruned without being
+    descended into.
+    """
+
+    # Compare names as paths so the order follows the platform's own
+    # PurePath rules (case-insensitive on Windows), as sorted(rglob()) did.
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: PurePath(e.name))
+    for entry in entries:
+        name = entry.name.lower()
+        if entry.is_dir(follow_symlinks=False):
+            if not name.endswith("_files"):
+                yield from _walk_html(entry.path)
+        elif name.endswith(".html") and entry.is_file():
+            yield entry.path
+
+
+def _prepare_seed(
+    job: tuple[Path, str],
+) -> tuple[str | None, str, list[str]]:
+    """Return (skip_message, page_url, links) for one seed HTML file.
+
+    skip_message is set when the file cannot be read or is a WAF
+    interstitial; the other fields are then empty. The body itself is not
+    returned, so pool workers don't ship every page back to the parent.
+    Module-level so ProcessPoolExecutor workers can unpickle it.
+    """
+
+    from .crawl import is_waf_challenge, iter_links_from_html
+
+    seed_path, default_seed_url = job
+    try:
+        raw = seed_path.read_bytes()
+    except OSError as e:
+        return f"Failed to read seed HTML: {seed_path}: {e}", "", []
+
+    # Avoid using pure WAF interstitials as seeds.
+    if is_waf_challenge(
+        raw,
+        content_type="text/html",
+        allow_integration_heuristic=False,
+    ):
+        msg = f"Seed HTML looks like a WAF challenge; skipping: {seed_path}"
+        return msg, "", []
+
+    page_url = _infer_saved_from_url(raw) or default_seed_url
+
+    # Drop repeats within the page so less crosses the process boundary.
+    html_text = raw.decode("utf-8", errors="replace")
+    links = iter_links_from_html(html_text, page_url=page_url)
+    return None, page_url, list(dict.fromkeys(links))
+
+
+def _normalize_export(export_dir: Path) -> tuple[int, int, int]:
+    """Run the three ensure_export_* passes with the on-disk cache.
+
+    Returns the (html, non_html, endpoints) counts of pages rendered.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from contextlib import nullcontext
+
+    from .crawl import (
+        ensure_export_api_endpoint_variants,
+        ensure_export_html_variants,
+        ensure_export_non_html_variants,
+    )
+    from .normalize_cache import NormalizeCache
+
+    cache = NormalizeCache.load(export_dir)
+    # Page parsing and PDF/JSON/XML formatting run in worker processes
+    # when there is more than one CPU; the passes only submit work (and so
+    # start workers) when enough pages need rendering.
+    pool_cm = (
+        ProcessPoolExecutor() if (os.cpu_count() or 1) > 1 else nullcontext()
+    )
+    try:
+        with pool_cm as pool:
+            html_n = ensure_export_html_variants(
+                export_dir=export_dir, cache=cache, executor=pool
+            )
+            non_html_n = ensure_export_non_html_variants(
+                export_dir=export_dir, cache=cache, executor=pool
+            )
+        endpoints_n = ensure_export_api_endpoint_variants(
+            export_dir=export_dir, cache=cache
+        )
+    finally:
+        cache.save()
+    return html_n, non_html_n, endpoints_n
+
+
+@lru_cache(maxsize=1)
+def _shared_session() -> requests.Session:
+    """One pooled Session per process, created on first use."""
+    from .http_client import new_session
+
+    return new_session()
+
+
+def _non_negative_int(value: str) -> int:
+    """argparse type for counts where 0 means "pick a default"."""
+    n = int(value)
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {n}")
+    return n
 
 
 def _add_common_crawl_args(p: argparse.ArgumentParser) -> None:
@@ -31,6 +150,18 @@ def _add_common_crawl_args(p: argparse.ArgumentParser) -> None:
     p.add_argument("--max-pages", type=int, default=200)
     p.add_argument("--max-depth", type=int, default=3)
     p.add_argument("--per-host-delay", type=float, default=0.5)
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent fetches (default: 1, sequential)",
+    )
+    p.add_argument(
+        "--per-host-parallel",
+        type=int,
+        default=1,
+        help="Concurrent fetches to the same host (default: 1)",
+    )
     p.add_argument("--timeout", type=int, default=45)
     p.add_argument("--refresh-cache", action="store_true")
     p.add_argument("--no-robots", action="store_true")
@@ -43,7 +174,8 @@ def _add_common_crawl_args(p: argparse.ArgumentParser) -> None:
     )
 
 
-def main(argv: list[str] | None = None) -> int:
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="extract_ocr")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
@@ -90,6 +222,12 @@ def main(argv: list[str] | None = None) -> int:
         default=0.5,
         help="Delay between requests to the same host when --crawl is set",
     )
+    apis_p.add_argument(
+        "--crawl-workers",
+        type=int,
+        default=1,
+        help="Concurrent fetches when --crawl is set (default: 1)",
+    )
     apis_p.add_argument(
         "--crawl-timeout",
         type=int,
@@ -99,7 +237,10 @@ def main(argv: list[str] | None = None) -> int:
     apis_p.add_argument(
         "--crawl-refresh-cache",
         action="store_true",
-        help="Ignore cached HTTP responses when --crawl is set",
+        help=(
+            "Revalidate cached HTTP responses (conditional GET, reusing "
+            "the cached body on 304) when --crawl is set"
+        ),
     )
     apis_p.add_argument(
         "--crawl-no-robots",
@@ -117,6 +258,20 @@ def main(argv: list[str] | None = None) -> int:
         default=["uspto.gov"],
         help="Repeatable; e.g. --crawl-allow-host-suffix uspto.gov",
     )
+    apis_p.add_argument(
+        "--workers",
+        type=_non_negative_int,
+        default=0,
+        help="Processes for scanning pages (0 = one per CPU, 1 = in-process)",
+    )
+    apis_p.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Only scan manifest events added since the last --incremental "
+            "run (state kept in apis_endpoints_report.state.json)"
+        ),
+    )
 
     crawl_p = sub.add_parser("crawl", help="Generic crawl/export")
     crawl_p.add_argument("--seed", action="append", required=True)
@@ -231,12 +386,24 @@ def main(argv: list[str] | None = None) -> int:
         help="Max missing paths to include in output",
     )
 
-    args = parser.parse_args(argv)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
 
     if args.cmd == "apis-report":
+        from .apis_report import collect_apis_report_data, write_apis_report
+
         try:
             if bool(args.crawl):
-                report_data = collect_apis_report_data(export_dir=args.in_dir)
+                from .crawl import CrawlConfig, Crawler
+                from .http_client import HttpClient
+                from .urls import UrlScope
+
+                report_data = collect_apis_report_data(
+                    export_dir=args.in_dir, workers=int(args.workers)
+                )
                 endpoints = [
                     u
                     for u in report_data.endpoints
@@ -248,7 +415,7 @@ def main(argv: list[str] | None = None) -> int:
                         if args.crawl_max_pages is not None
                         else len(endpoints)
                     )
-                    session = requests.Session()
+                    session = _shared_session()
                     http = HttpClient(
                         session,
                         timeout_s=int(args.crawl_timeout),
@@ -265,17 +432,18 @@ def main(argv: list[str] | None = None) -> int:
                         per_host_delay_s=float(args.crawl_per_host_delay),
                         respect_robots=not bool(args.crawl_no_robots),
                         refresh_cache=bool(args.crawl_refresh_cache),
+                        workers=int(args.crawl_workers),
                     )
                     crawler = Crawler(http=http, config=crawl_cfg)
                     crawler.crawl(endpoints, resume=False)
 
-                ensure_export_html_variants(export_dir=args.in_dir)
-                ensure_export_non_html_variants(export_dir=args.in_dir)
-                ensure_export_api_endpoint_variants(export_dir=args.in_dir)
+                _normalize_export(args.in_dir)
 
             report = write_apis_report(
                 export_dir=args.in_dir,
                 report_path=args.report_path,
+                workers=int(args.workers),
+                incremental=bool(args.incremental),
             )
         except OSError as e:
             print(str(e), file=sys.stderr)
@@ -284,7 +452,12 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.cmd == "crawl":
-        session = requests.Session()
+        from .citations import write_bibtex, write_csl_json, write_ris
+        from .crawl import CrawlConfig, Crawler
+        from .http_client import HttpClient
+        from .urls import UrlScope
+
+        session = _shared_session()
         http = HttpClient(session, timeout_s=args.timeout)
 
         scope = UrlScope(
@@ -299,13 +472,13 @@ def main(argv: list[str] | None = None) -> int:
             per_host_delay_s=float(args.per_host_delay),
             respect_robots=not bool(args.no_robots),
             refresh_cache=bool(args.refresh_cache),
+            workers=int(args.workers),
+            per_host_parallel=int(args.per_host_parallel),
         )
         crawler = Crawler(http=http, config=crawl_cfg)
         crawler.crawl(args.seed)
 
-        ensure_export_html_variants(export_dir=args.out)
-        ensure_export_non_html_variants(export_dir=args.out)
-        ensure_export_api_endpoint_variants(export_dir=args.out)
+        _normalize_export(args.out)
 
         if args.emit_ris or args.emit_csl_json or args.emit_bibtex:
             citations_dir = args.out / "citations"
@@ -322,10 +495,10 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.cmd == "normalize-export":
+        from .export_inspect import inspect_export
+
         try:
-            html_n = ensure_export_html_variants(export_dir=args.in_dir)
-            non_html_n = ensure_export_non_html_variants(export_dir=args.in_dir)
-            endpoints_n = ensure_export_api_endpoint_variants(export_dir=args.in_dir)
+            html_n, non_html_n, endpoints_n = _normalize_export(args.in_dir)
         except OSError as e:
             print(str(e), file=sys.stderr)
             return 2
@@ -352,6 +525,8 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.cmd == "inspect-export":
+        from .export_inspect import inspect_export
+
         try:
             inspected = inspect_export(
                 export_dir=args.in_dir,
@@ -362,47 +537,57 @@ def main(argv: list[str] | None = None) -> int:
             return 2
 
         if bool(args.json):
-            import json as _json
-
-            print(_json.dumps(inspected.to_dict(), indent=2))
+            report = inspected.to_dict()
+            # orjson (when installed) hands back UTF-8 bytes; skip the text
+            # layer when the stream would only re-encode them as UTF-8
+            # anyway. Replaced or non-UTF-8 streams (e.g. a Windows console
+            # code page) get ASCII-escaped JSON, which any encoding can take.
+            buffer = getattr(sys.stdout, "buffer", None)
+            encoding = (getattr(sys.stdout, "encoding", None) or "").lower()
+            if buffer is not None and encoding in ("utf-8", "utf8"):
+                from .manifest import dump_json_indented
+
+                sys.stdout.flush()
+                buffer.write(dump_json_indented(report) + b"\n")
+            else:
+                import json
+
+                sys.stdout.write(json.dumps(report, indent=2) + "\n")
         else:
-            print(
+            # Built up and written once; the sample can be long.
+            lines = [
                 "inspect-export: "
                 f"lines={inspected.lines_total} "
                 f"invalid_json={inspected.lines_invalid_json} "
                 f"referenced_files={inspected.referenced_files} "
                 f"missing_files={inspected.missing_files}"
-            )
+            ]
             if inspected.missing_by_key:
                 parts = " ".join(
                     f"{k}={v}" for k, v in inspected.missing_by_key.items()
                 )
-                print(f"inspect-export: missing_by_key: {parts}")
+                lines.append(f"inspect-export: missing_by_key: {parts}")
             if inspected.missing_paths_sample:
-                print("inspect-export: missing_paths_sample:")
-                for p in inspected.missing_paths_sample:
-                    print(f"- {p}")
+                lines.append("inspect-export: missing_paths_sample:")
+                lines.extend(f"- {p}" for p in inspected.missing_paths_sample)
+            sys.stdout.write("\n".join(lines) + "\n")
 
         if bool(args.fail_on_missing) and inspected.missing_files:
             return 4
         return 0
 
     if args.cmd == "uspto-data":
+        from .crawl import CrawlConfig, Crawler
+        from .export_inspect import inspect_export
+        from .exporters.uspto_data_portal import USPTODataPortalConfig
+        from .exporters.uspto_data_portal import run as run_uspto
+        from .http_client import HttpClient
+        from .urls import UrlScope
+
         # Manual seed workflow: use a browser-saved HTML snapshot to bootstrap
         # seeds without fetching WAF-protected entry pages.
         if args.seed_html is not None or args.seed_html_dir is not None:
             default_seed_url = args.seed_url or "https://data.uspto.gov/"
-
-            def _infer_saved_from_url(html_text: str) -> str | None:
-                m = re.search(
-                    r"saved\s+from\s+url=\(\d+\)(https?://[^\s>]+)",
-                    html_text,
-                    flags=re.IGNORECASE,
-                )
-                if not m:
-                    return None
-                return m.group(1).strip()
-
             seed_paths: list[Path] = []
             if args.seed_html:
                 seed_paths.extend([Path(p) for p in list(args.seed_html)])
@@ -422,13 +607,9 @@ def main(argv: list[str] | None = None) -> int:
                     )
                     return 2
 
-                for seed_path in sorted(seed_html_dir.rglob("*.html")):
-                    is_assets_dir = any(
-                        part.lower().endswith("_files") for part in seed_path.parts
-                    )
-                    if is_assets_dir:
-                        continue
-                    seed_paths.append(seed_path)
+                seed_paths.extend(
+                    Path(p) for p in _walk_html(str(seed_html_dir))
+                )
 
             if not seed_paths:
                 print(
@@ -437,7 +618,7 @@ def main(argv: list[str] | None = None) -> int:
                 )
                 return 2
 
-            session = requests.Session()
+            session = _shared_session()
             http = HttpClient(session, timeout_s=args.timeout)
             scope = UrlScope(
                 tuple(args.allow_host_suffix),
@@ -451,49 +632,56 @@ def main(argv: list[str] | None = None) -> int:
                 per_host_delay_s=float(args.per_host_delay),
                 respect_robots=not bool(args.no_robots),
                 refresh_cache=bool(args.refresh_cache),
+                workers=int(args.workers),
+                per_host_parallel=int(args.per_host_parallel),
             )
             crawler = Crawler(http=http, config=crawl_cfg)
 
+            # Reading, WAF checks and link extraction run in worker
+            # processes for large seed sets; results come back in seed
+            # order and are ingested here as they arrive, one writer for
+            # the export. The body is read again here rather than sent back.
+            from concurrent.futures import ProcessPoolExecutor
+            from contextlib import nullcontext
+
+            jobs = [(p, default_seed_url) for p in seed_paths]
+            pool_cm = (
+                ProcessPoolExecutor()
+                if len(jobs) >= _PARALLEL_SEED_MIN_FILES
+                else nullcontext()
+            )
             seeds: list[str] = []
-            for seed_path in seed_paths:
-                try:
-                    raw = seed_path.read_bytes()
-                except OSError as e:
-                    print(
-                        f"Failed to read seed HTML: {seed_path}: {e}",
-                        file=sys.stderr,
-                    )
-                    continue
-
-                html_text = raw.decode("utf-8", errors="replace")
-                inferred_url = _infer_saved_from_url(html_text)
-                page_url = inferred_url or default_seed_url
-
-                # Avoid using pure WAF interstitials as seeds.
-                if is_waf_challenge(
-                    raw,
-                    content_type="text/html",
-                    allow_integration_heuristic=False,
+            seen_seeds: set[str] = set()
+            with pool_cm as pool:
+                prepared = (
+                    pool.map(_prepare_seed, jobs)
+                    if pool is not None
+                    else map(_prepare_seed, jobs)
+                )
+                for seed_path, (skip_msg, page_url, links) in zip(
+                    seed_paths, prepared, strict=True
                 ):
-                    msg = (
-                        "Seed HTML looks like a WAF challenge; skipping: "
-                        f"{seed_path}"
-                    )
-                    print(msg, file=sys.stderr)
-                    continue
+                    if skip_msg is None:
+                        try:
+                            raw = seed_path.read_bytes()
+                        except OSError as e:
+                            skip_msg = (
+                                f"Failed to read seed HTML: {seed_path}: {e}"
+                            )
+                    if skip_msg is not None:
+                        print(skip_msg, file=sys.stderr)
+                        continue
 
-                # Ingest the local HTML into the output (so we keep an offline
-                # copy even if subsequent HTTP fetches are blocked).
-                crawler.ingest_local_html(url=page_url, body=raw)
+                    # Ingest the local HTML into the output (so we keep an
+                    # offline copy even if subsequent HTTP fetches are
+                    # blocked).
+                    crawler.ingest_local_html(url=page_url, body=raw)
 
-                seeds.extend(
-                    extract_links_from_html(
-                        html_text,
-                        page_url=page_url,
-                    )
-                )
+                    for link in links:
+                        if link not in seen_seeds:
+                            seen_seeds.add(link)
+                            seeds.append(link)
 
-            seeds = list(dict.fromkeys(seeds))
             if not seeds:
                 print(
                     (
@@ -506,9 +694,7 @@ def main(argv: list[str] | None = None) -> int:
 
             crawler.crawl(seeds)
 
-            ensure_export_html_variants(export_dir=args.out)
-            ensure_export_non_html_variants(export_dir=args.out)
-            ensure_export_api_endpoint_variants(export_dir=args.out)
+            _normalize_export(args.out)
             return 0
 
         uspto_cfg = USPTODataPortalConfig(
@@ -518,12 +704,12 @@ def main(argv: list[str] | None = None) -> int:
             per_host_delay_s=float(args.per_host_delay),
             respect_robots=not bool(args.no_robots),
             refresh_cache=bool(args.refresh_cache),
+            workers=int(args.workers),
+            per_host_parallel=int(args.per_host_parallel),
         )
-        summary = run_uspto(uspto_cfg)
+        summary = run_uspto(uspto_cfg, session=_shared_session())
         try:
-            html_n = ensure_export_html_variants(export_dir=args.out)
-            non_html_n = ensure_export_non_html_variants(export_dir=args.out)
-            endpoints_n = ensure_export_api_endpoint_variants(export_dir=args.out)
+            html_n, non_html_n, endpoints_n = _normalize_export(args.out)
         except OSError as e:
             print(str(e), file=sys.stderr)
             return 2
@@ -561,6 +747,12 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.cmd == "endnote25":
+        from .export_inspect import inspect_export
+        from .exporters.endnote25_windows import (
+            EndNoteExportConfig,
+            EndNoteExporter,
+        )
+
         seed_url = args.seed_url
         if seed_url is None:
             # Default matches existing script’s constant.
@@ -578,7 +770,7 @@ def main(argv: list[str] | None = None) -> int:
             emit_csl_json=bool(args.emit_csl_json),
             emit_bibtex=bool(args.emit_bibtex),
         )
-        session = requests.Session()
+        session = _shared_session()
         exporter = EndNoteExporter(session=session, config=endnote_cfg)
         summary = exporter.export()
         pages = int((summary or {}).get("pages") or 0)
@@ -1,48 +1,173 @@
 from __future__ import annotations
 
 import re
+import threading
 from dataclasses import dataclass
-from enum import Enum
-from typing import Final
+from functools import lru_cache
+from typing import Final, Literal
 from urllib.parse import urlparse
 
-from .urls import is_asset_intent_url
+from .urls import is_asset_intent_path
 
+try:
+    import hyperscan  # type: ignore[import-not-found]
+except ImportError:  # optional "fast" extra
+    hyperscan = None
 
-class ContentKind(str, Enum):
-    HTML = "html"
-    JSON = "json"
-    XML = "xml"
-    PDF = "pdf"
-    TEXT = "text"
-    ZIP = "zip"
-    BYTES = "bytes"
 
+# Plain strings rather than an Enum: sniff_kind runs for every fetched
+# resource and its result is compared, used as a dict key and written to
+# paths and manifests as-is.
+ContentKind = Literal["html", "json", "xml", "pdf", "text", "zip", "bytes"]
 
-_AWS_WAF_INTEGRATION_MARKERS: Final[tuple[re.Pattern[str], ...]] = (
+
+_CT_JSON: Final = frozenset({"application/json", "text/json"})
+_CT_XML: Final = frozenset({"application/xml", "text/xml"})
+_CT_HTML: Final = frozenset({"text/html", "application/xhtml+xml"})
+_CT_TEXT: Final = frozenset({"text/plain"})
+
+# Only this much of a body is inspected for WAF markers.
+_WAF_SCAN_BYTES: Final = 200_000
+# bytes.count walks its whole input, so the cheap anchor lower bound is
+# only taken over this prefix; the regex below stops at the fifth match.
+_WAF_QUICK_SCAN_BYTES: Final = 8_000
+
+_AWS_WAF_INTEGRATION_MARKERS: Final[tuple[bytes, ...]] = (
     # Many legitimate data.uspto.gov pages include AWS WAF integration
     # (challenge script loader and cookie-domain setup). Treat these as
     # *signals* but not sufficient by themselves.
-    re.compile(r"edge\.sdk\.awswaf\.com", re.IGNORECASE),
-    re.compile(r"awsWafCookieDomainList", re.IGNORECASE),
-    re.compile(r"challenge\.js", re.IGNORECASE),
+    # Lowercase literals, matched against the ASCII-lowercased body.
+    b"edge.sdk.awswaf.com",
+    b"awswafcookiedomainlist",
+    b"challenge.js",
+)
+
+# One whitespace character as str-pattern \s matches it in the decoded
+# body: ASCII plus the UTF-8 encodings of Unicode spaces such as NBSP.
+_WS_CHAR: Final = (
+    rb"(?:[\s\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80"
+    rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)"
 )
+_WS: Final = _WS_CHAR + rb"+"
 
-_HARD_BLOCK_MARKERS: Final[tuple[re.Pattern[str], ...]] = (
-    # High-confidence interstitial text markers.
-    re.compile(r"Request\s+blocked", re.IGNORECASE),
-    re.compile(r"You\s+have\s+been\s+blocked", re.IGNORECASE),
-    re.compile(r"The\s+requested\s+URL\s+was\s+rejected", re.IGNORECASE),
+# High-confidence interstitial text markers, as one bytes pattern. Each
+# contains one of _HARD_BLOCK_KEYWORDS, which are checked first with a
+# plain substring search.
+_HARD_BLOCK_RE: Final = re.compile(
+    rb"Request" + _WS + rb"blocked"
+    rb"|You" + _WS + rb"have" + _WS + rb"been" + _WS + rb"blocked"
+    rb"|The" + _WS + rb"requested" + _WS + rb"URL" + _WS + rb"was" + _WS
+    + rb"rejected",
+    re.IGNORECASE,
 )
+_HARD_BLOCK_KEYWORDS: Final = (b"blocked", b"rejected")
+
+# One case-insensitive scan instead of lowering the head for each marker.
+_HTML_HEAD_RE: Final = re.compile(rb"<(?:html|!doctype|head)", re.IGNORECASE)
+
+_ANCHOR_RE: Final = re.compile(rb"<" + _WS_CHAR + rb"*a\b", re.IGNORECASE)
+# Common spellings of an <a> open tag; each occurrence is an _ANCHOR_RE
+# match, so counting them gives a lower bound without the regex engine.
+_ANCHOR_OPENINGS: Final = (b"<a ", b"<a\t", b"<a\n", b"<a\r", b"<a>")
+
+
+class _HyperscanWafScanner:
+    """is_waf_challenge's marker checks as Hyperscan DFA scans.
+
+    The block-message and integration patterns share one database, so the
+    head is scanned once for all of them (stopping at a block message).
+    Anchors are only counted, in a second scan that stops at the fifth,
+    when the integration heuristic needs them. Verdicts match the re path.
+    """
+
+    _HARD_BLOCK, _INTEGRATION = 0, 1
+
+    def __init__(self) -> None:
+        assert hyperscan is not None
+        self._hs = hs = hyperscan
+        caseless = hs.HS_FLAG_CASELESS
+        single = caseless | hs.HS_FLAG_SINGLEMATCH
+        self._markers = hs.Database()
+        self._markers.compile(
+            expressions=[
+                _HARD_BLOCK_RE.pattern,
+                *map(re.escape, _AWS_WAF_INTEGRATION_MARKERS),
+            ],
+            ids=[self._HARD_BLOCK]
+            + [self._INTEGRATION] * len(_AWS_WAF_INTEGRATION_MARKERS),
+            flags=[single] * (1 + len(_AWS_WAF_INTEGRATION_MARKERS)),
+        )
+        self._anchors = hs.Database()
+        self._anchors.compile(
+            expressions=[_ANCHOR_RE.pattern], ids=[0], flags=[caseless]
+        )
+        # Scratch space may not be shared by concurrent scans.
+        self._local = threading.local()
+
+    def _scratch(self) -> tuple:
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = (
+                self._hs.Scratch(self._markers),
+                self._hs.Scratch(self._anchors),
+            )
+            self._local.scratch = scratch
+        return scratch
+
+    def is_challenge(
+        self, head: bytes, *, allow_integration_heuristic: bool
+    ) -> bool:
+        markers_scratch, anchors_scratch = self._scratch()
+        found: set[int] = set()
+
+        def on_marker(id_: int, *_: object) -> bool:
+            found.add(id_)
+            return id_ == self._HARD_BLOCK
+
+        try:
+            self._markers.scan(
+                head, match_event_handler=on_marker, scratch=markers_scratch
+            )
+        except self._hs.ScanTerminated:
+            pass
+        if self._HARD_BLOCK in found:
+            return True
+        if not allow_integration_heuristic or self._INTEGRATION not in found:
+            return False
+
+        anchors = 0
+
+        def on_anchor(*_: object) -> bool:
+            nonlocal anchors
+            anchors += 1
+            return anchors >= 5
+
+        try:
+            self._anchors.scan(
+                head, match_event_handler=on_anchor, scratch=anchors_scratch
+            )
+        except self._hs.ScanTerminated:
+            pass
+        return anchors < 5
+
+
+@lru_cache(maxsize=1)
+def _hyperscan_waf_scanner() -> _HyperscanWafScanner | None:
+    if hyperscan is None:
+        return None
+    return _HyperscanWafScanner()
+
+
+def _parse_ct(content_type: str | None) -> str | None:
+    """Media type of a Content-Type header, lowercased without parameters."""
+    if not content_type:
+        return None
+    return content_type.split(";", 1)[0].strip().lower()
 
 
 def looks_like_html(data: bytes) -> bool:
     head = data[:2048].lstrip()
-    return head.startswith(b"<") and (
-        b"<html" in head.lower()
-        or b"<!doctype" in head.lower()
-        or b"<head" in head.lower()
-    )
+    return head.startswith(b"<") and _HTML_HEAD_RE.search(head) is not None
 
 
 def is_waf_challenge(
@@ -52,22 +177,26 @@ def is_waf_challenge(
     allow_integration_heuristic: bool = True,
 ) -> bool:
     # Only attempt expensive checks when it looks HTML-ish.
-    if content_type:
-        ct = content_type.split(";", 1)[0].strip().lower()
-        if ct not in {"text/html", "application/xhtml+xml"} and not looks_like_html(
-            body
-        ):
-            return False
-    elif not looks_like_html(body):
+    ct = _parse_ct(content_type)
+    if ct not in _CT_HTML and not looks_like_html(body):
         return False
 
-    try:
-        text = body[:200_000].decode("utf-8", errors="ignore")
-    except UnicodeDecodeError:
-        return False
+    # Markers are ASCII, so the bytes are scanned directly (no decode).
+    head = body[:_WAF_SCAN_BYTES]
+    scanner = _hyperscan_waf_scanner()
+    if scanner is not None:
+        return scanner.is_challenge(
+            head, allow_integration_heuristic=allow_integration_heuristic
+        )
+
+    # bytes.lower() only folds ASCII, which lets the literal markers be
+    # found with plain substring searches.
+    lowered = head.lower()
 
     # If there are explicit block messages, treat as a challenge.
-    if any(p.search(text) for p in _HARD_BLOCK_MARKERS):
+    if any(k in lowered for k in _HARD_BLOCK_KEYWORDS) and (
+        _HARD_BLOCK_RE.search(head)
+    ):
         return True
 
     # Optional: AWS WAF integration is present on many legitimate pages.
@@ -78,15 +207,20 @@ def is_waf_challenge(
 
     # Avoid false positives by only calling it a "challenge" when the HTML
     # looks like a thin interstitial (very little content/structure).
-    if not any(p.search(text) for p in _AWS_WAF_INTEGRATION_MARKERS):
+    if not any(m in lowered for m in _AWS_WAF_INTEGRATION_MARKERS):
         return False
 
     # Heuristic: interstitial responses are usually minimal shells with few
     # links.
     # Legit pages generally contain a navigation/header with many anchors.
-    anchor_count = len(re.findall(r"<\s*a\b", text, flags=re.IGNORECASE))
-    if anchor_count >= 5:
+    quick = lowered[:_WAF_QUICK_SCAN_BYTES]
+    if sum(map(quick.count, _ANCHOR_OPENINGS)) >= 5:
         return False
+    anchor_count = 0
+    for _ in _ANCHOR_RE.finditer(head):
+        anchor_count += 1
+        if anchor_count >= 5:
+            return False
 
     # If it looks like an AWS WAF page and has very few anchors, treat it as a
     # challenge response.
@@ -109,45 +243,44 @@ def sniff_kind(
 
     # Magic bytes.
     if body.startswith(b"%PDF-"):
-        return ContentKind.PDF
+        return "pdf"
     if body.startswith(b"PK\x03\x04"):
-        return ContentKind.ZIP
+        return "zip"
+
+    ct = _parse_ct(content_type)
+    # Parsed once for both the asset-intent check and the path fallback.
+    path = urlparse(url).path.lower()
 
     # Asset-intent URLs should never be treated as HTML pages.
-    if is_asset_intent_url(url):
+    if is_asset_intent_path(path):
         # Some sites serve JSON from .js endpoints; handle that lightly.
-        if content_type:
-            ct = content_type.split(";", 1)[0].strip().lower()
-            if ct in {"application/json", "text/json"}:
-                return ContentKind.JSON
-        return ContentKind.BYTES
+        if ct in _CT_JSON:
+            return "json"
+        return "bytes"
 
     # Header hint.
-    if content_type:
-        ct = content_type.split(";", 1)[0].strip().lower()
-        if ct in {"application/json", "text/json"}:
-            return ContentKind.JSON
-        if ct in {"application/xml", "text/xml"}:
-            return ContentKind.XML
-        if ct in {"text/plain"}:
-            return ContentKind.TEXT
-        if ct in {"text/html", "application/xhtml+xml"}:
-            return ContentKind.HTML
+    if ct in _CT_JSON:
+        return "json"
+    if ct in _CT_XML:
+        return "xml"
+    if ct in _CT_TEXT:
+        return "text"
+    if ct in _CT_HTML:
+        return "html"
 
     # Sniff HTML.
     if looks_like_html(body):
-        return ContentKind.HTML
+        return "html"
 
     # Fallback by path.
-    path = urlparse(url).path.lower()
     if path.endswith(".json"):
-        return ContentKind.JSON
+        return "json"
     if path.endswith(".xml"):
-        return ContentKind.XML
+        return "xml"
     if path.endswith(".txt"):
-        return ContentKind.TEXT
+        return "text"
 
-    return ContentKind.BYTES
+    return "bytes"
 
 
 @dataclass(frozen=True)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from typing import Any, Iterator
+
 from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+from bs4.element import CData, NavigableString, PageElement, Tag
+from markdownify import MarkdownConverter
+
+
+_MD_CONVERTER = MarkdownConverter(heading_style="ATX")
 
 
 def _clean_soup_inplace(soup: BeautifulSoup) -> None:
@@ -10,32 +16,129 @@ def _clean_soup_inplace(soup: BeautifulSoup) -> None:
             t.decompose()
 
 
-def _pick_main_content(soup: BeautifulSoup):
-    for selector in [
-        "main",
-        "article",
-        "#topic-content",
-        "#topic",
-        "#rh-topic",
-        "div[role='main']",
-        "div[role='document']",
-    ]:
-        node = soup.select_one(selector)
+# String types counted by get_text(); comments, doctypes, etc. are skipped.
+_TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+def _largest_text_div(soup: BeautifulSoup) -> Tag | None:
+    """Return the first <div> with the longest `get_text(" ", strip=True)`.
+
+    Measuring each div with get_text() re-walks its whole subtree, which is
+    quadratic in nesting depth on div-heavy pages. Instead, one post-order
+    walk sums stripped string lengths (plus the joining spaces) bottom-up.
+    """
+
+    best: Tag | None = None
+    best_len = 0
+    best_order = 0
+    order = 0
+    # Each frame: (tag, child iterator, pre-order index, [chars, strings]).
+    stack: list[tuple[Tag, Iterator[PageElement], int, list[int]]] = [
+        (soup, iter(soup.children), order, [0, 0])
+    ]
+    while stack:
+        tag, children, tag_order, acc = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            chars, strings = acc
+            if tag.name == "div":
+                text_len = chars + max(0, strings - 1)
+                # Post-order visits children first; prefer the div that
+                # comes first in document order on ties, like find_all().
+                if text_len > best_len or (
+                    text_len == best_len
+                    and best is not None
+                    and tag_order < best_order
+                ):
+                    best, best_len, best_order = tag, text_len, tag_order
+            if stack:
+                parent_acc = stack[-1][3]
+                parent_acc[0] += chars
+                parent_acc[1] += strings
+            continue
+        if isinstance(child, Tag):
+            order += 1
+            stack.append((child, iter(child.children), order, [0, 0]))
+        elif (
+            isinstance(child, NavigableString)
+            and type(child) in _TEXT_STRING_TYPES
+        ):
+            stripped = child.strip()
+            if stripped:
+                acc[0] += len(stripped)
+                acc[1] += 1
+    return best
+
+
+# (tag name, attrs) pairs for soup.find(); all candidates are plain tag, id,
+# or single-attribute matches, so the CSS selector engine is not needed.
+# A name of True matches any tag.
+_MAIN_CONTENT_CANDIDATES: tuple[tuple[str | bool, dict[str, Any]], ...] = (
+    ("main", {}),
+    ("article", {}),
+    (True, {"id": "topic-content"}),
+    (True, {"id": "topic"}),
+    (True, {"id": "rh-topic"}),
+    ("div", {"role": "main"}),
+    ("div", {"role": "document"}),
+)
+
+
+def pick_main_content(soup: BeautifulSoup):
+    """Return the element holding the page's main content.
+
+    Tries common main/article/topic containers in priority order, then the
+    <div> with the most text, then <body>.
+    """
+
+    for name, attrs in _MAIN_CONTENT_CANDIDATES:
+        node = soup.find(name, attrs=attrs)
         if node and node.get_text(strip=True):
             return node
 
-    best = None
-    best_len = 0
-    for div in soup.find_all("div"):
-        text_len = len(div.get_text(" ", strip=True))
-        if text_len > best_len:
-            best = div
-            best_len = text_len
+    best = _largest_text_div(soup)
     return best or soup.body or soup
 
 
-def extract_title(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+def _convert_to_markdown(node: Tag) -> str:
+    """Convert ``node`` without re-serializing and re-parsing it.
+
+    markdownify looks at a node's ancestors (list nesting for bullets,
+    table context), so ``node`` is detached for the conversion and then
+    put back. Adjacent strings left behind by ``_clean_soup_inplace`` are
+    merged first, as a re-parse would, so the result matches converting
+    ``str(node)``.
+    """
+
+    node.smooth()
+    parent = node.parent
+    if parent is None:
+        return _MD_CONVERTER.convert_soup(node)
+    index = parent.index(node)
+    node.extract()
+    try:
+        return _MD_CONVERTER.convert_soup(node)
+    finally:
+        parent.insert(index, node)
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse a page with lxml (libxml2) rather than pure-Python html.parser.
+
+    lxml repairs markup the way browsers do, so the Markdown differs from
+    what html.parser gave: a ``<li>`` directly inside another closes it
+    (``*`` rather than a nested ``* *``), and whitespace inside table cells
+    can change.
+
+    Callers that need several renderings of one page should parse once and
+    use the ``*_from_soup`` functions.
+    """
+
+    return BeautifulSoup(html, "lxml")
+
+
+def extract_title_from_soup(soup: BeautifulSoup) -> str:
     h1 = soup.find("h1")
     if h1 and h1.get_text(strip=True):
         return h1.get_text(" ", strip=True)
@@ -44,10 +147,24 @@ def extract_title(html: str) -> str:
     return "Untitled"
 
 
-def html_to_markdown(html: str, *, source_url: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+def extract_title(html: str) -> str:
+    return extract_title_from_soup(parse_html(html))
+
+
+def html_to_markdown_from_soup(soup: BeautifulSoup, *, source_url: str) -> str:
+    """Render ``soup`` as a Markdown page.
+
+    script/style/noscript are removed from ``soup`` in place and the
+    strings around them merged, so read the title (and any plain text)
+    from it first.
+    """
+
     _clean_soup_inplace(soup)
-    main = _pick_main_content(soup)
-    markdown = md(str(main), heading_style="ATX")
+    main = pick_main_content(soup)
+    markdown = _convert_to_markdown(main)
     markdown = markdown.strip() + "\n"
     return f"Source: {source_url}\n\n" + markdown
+
+
+def html_to_markdown(html: str, *, source_url: str) -> str:
+    return html_to_markdown_from_soup(parse_html(html), source_url=source_url)
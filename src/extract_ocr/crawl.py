@@ -3,44 +3,126 @@ from __future__ import annotations
 import hashlib
 import html as html_lib
 import io
+import itertools
 import json
 import re
-import time
-from collections import Counter, deque
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, Iterator
 from urllib.parse import urljoin, urlparse
-from xml.dom import minidom
-from xml.parsers.expat import ExpatError
 
 import requests
 from bs4 import BeautifulSoup
-
-from .cache import cache_paths, read_cached, write_cached
+from lxml import etree  # type: ignore[attr-defined]
+from lxml import html as lxml_html
+
+from .cache import (
+    cache_paths,
+    conditional_headers,
+    read_cached,
+    read_cached_meta,
+    write_cached,
+)
 from .citations import CitationItem
 from .content import ContentKind, is_waf_challenge, sniff_kind
-from .convert.html_to_md import extract_title, html_to_markdown
+from .convert.html_to_md import (
+    extract_title_from_soup,
+    html_to_markdown_from_soup,
+    parse_html,
+)
 from .http_client import HttpClient
-from .manifest import ManifestWriter, relpath_posix, utc_iso
-from .robots import RobotsCache, RobotsRules
+from .manifest import (
+    ManifestWriter,
+    dump_json_indented,
+    iter_jsonl_events,
+    relpath_posix,
+    utc_iso,
+)
+from .normalize_cache import NormalizeCache, normalize_fingerprint
+from .rate_limit import HostTokenBucket
+from .robots import RobotsCache, RobotsRules, parse_robots
 from .state import CrawlState
-from .urls import UrlScope, normalize_url
-
-_INVALID_FILENAME_CHARS = re.compile(r"[<>:\"/\\|?*\x00-\x1F]")
+from .urls import UrlScope, normalize_url, url_hash
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # optional "fast" extra
+    orjson = None
+
+
+# Characters not allowed in (Windows) filenames, mapped to "-". A
+# translate table does the replacement in one C-level pass.
+_FILENAME_TRANS = str.maketrans(
+    dict.fromkeys([*'<>:"/\\|?*', *map(chr, range(0x20))], "-")
+)
+_WHITESPACE_RUN_RE = re.compile(r"\s+")
+
+# Parsed robots.txt rules kept in memory (per host, least recently used
+# evicted first).
+_ROBOTS_MEMO_MAX_HOSTS = 1024
+
+# Queue entries Crawler._pop_ready() looks through for a host that is
+# ready to take a request.
+_DISPATCH_LOOKAHEAD = 32
+
+# Manifest event kinds the ensure_export_*_variants passes render from;
+# blocked responses get page and endpoint variants but no non-HTML ones.
+_FETCHED_KINDS = frozenset({"ingested_local", "fetched"})
+_RENDERED_KINDS = _FETCHED_KINDS | {"blocked"}
+
+# With an executor, the normalization passes keep up to this many events
+# rendering ahead of the in-order writer, bounding the bodies and results
+# held in memory. Passes with fewer renders than the minimum run them
+# in-process and never start a worker.
+_RENDER_WINDOW = 32
+_PARALLEL_RENDER_MIN_PAGES = 8
+
+# Digits enough for an integer outside orjson's 64-bit range.
+_LONG_DIGITS_RE = re.compile(rb"\d{19}")
+
+# XML bodies are re-indented by libxml2: blank text between elements is
+# dropped so pretty_print can lay the tree out. Only internal entities are
+# expanded (a body naming an external one is shown as-is) and nothing is
+# fetched.
+_XML_PRETTY_PARSER = etree.XMLParser(
+    remove_blank_text=True,
+    resolve_entities="internal",
+    no_network=True,
+    strip_cdata=False,
+)
+
+# Link extraction hands libxml2 UTF-8 bytes, so a page's own charset
+# declaration must not override the encoding.
+_LINK_PARSER = lxml_html.HTMLParser(encoding="utf-8")
 
 
 def _safe_filename_component(text: str) -> str:
-    cleaned = _INVALID_FILENAME_CHARS.sub("-", (text or "").strip())
+    cleaned = (text or "").strip().translate(_FILENAME_TRANS)
     cleaned = cleaned.strip(". ")
-    cleaned = re.sub(r"\s+", " ", cleaned)
+    # ASCII whitespace other than " " is already "-" and the ends are not
+    # spaces, so ASCII text only needs split/join when it has a run of
+    # spaces. Other text may start or end with Unicode whitespace, which
+    # the regex keeps (as one space).
+    if not cleaned.isascii():
+        cleaned = _WHITESPACE_RUN_RE.sub(" ", cleaned)
+    elif "  " in cleaned:
+        cleaned = " ".join(cleaned.split())
     if not cleaned:
         cleaned = "page"
     return cleaned[:150]
 
 
-def _html_to_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+def _soup_to_text(soup: BeautifulSoup) -> str:
     for tag in soup(["script", "style", "noscript"]):
         tag.decompose()
     text = soup.get_text("\n")
@@ -64,6 +146,35 @@ def _truncate_text(text: str, *, max_chars: int = 400_000) -> tuple[str, bool]:
     return text[:max_chars].rstrip("\n") + "\n\n[TRUNCATED]\n", True
 
 
+def _load_json_body(body: bytes) -> tuple[Any, bool]:
+    """Parse a UTF-8 JSON body, returning ``(obj, fast)``.
+
+    orjson parses straight from the bytes, but it rejects NaN/Infinity and
+    reads integers wider than 64 bits as floats; those bodies (and any with
+    a long digit run, even inside a string) go through json instead.
+    ``fast`` tells _dump_json_body() that orjson may write ``obj`` back.
+    Raises UnicodeDecodeError or ValueError when the body is not JSON.
+    """
+
+    if orjson is not None and _LONG_DIGITS_RE.search(body) is None:
+        try:
+            return orjson.loads(body), True
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(body.decode("utf-8", errors="strict")), False
+
+
+def _dump_json_body(obj: Any, *, fast: bool) -> bytes:
+    if fast and orjson is not None:
+        # orjson.loads() takes up to 1024 levels of nesting but dumps()
+        # stops at 255; deeper bodies are written by json instead.
+        try:
+            return dump_json_indented(obj)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def _format_non_html_for_markdown(
     *,
     kind: ContentKind,
@@ -74,28 +185,29 @@ def _format_non_html_for_markdown(
 
     _ = content_type
 
-    if kind == ContentKind.JSON:
+    if kind == "json":
         try:
-            decoded = body.decode("utf-8", errors="strict")
-            obj = json.loads(decoded)
-            pretty = json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
+            obj, fast = _load_json_body(body)
+            pretty = _dump_json_body(obj, fast=fast).decode("utf-8") + "\n"
             return pretty, "json"
         except (UnicodeDecodeError, json.JSONDecodeError, ValueError):
             text = body.decode("utf-8", errors="replace")
             return text, "text"
 
-    if kind == ContentKind.XML:
+    if kind == "xml":
         text = body.decode("utf-8", errors="replace")
         try:
-            doc = minidom.parseString(text.encode("utf-8"))
-            pretty = doc.toprettyxml(indent="  ")
-            # minidom can be noisy with blank lines; normalize lightly.
-            lines = [ln.rstrip() for ln in pretty.splitlines() if ln.strip()]
-            return "\n".join(lines).strip() + "\n", "xml"
-        except (ExpatError, UnicodeEncodeError, ValueError):
+            root = etree.fromstring(text.encode("utf-8"), _XML_PRETTY_PARSER)
+        except (etree.XMLSyntaxError, ValueError):
             return text.strip() + "\n", "xml"
+        # The whole tree, so a doctype and top-level comments are kept;
+        # the declaration line matches what minidom used to write.
+        pretty = etree.tostring(
+            root.getroottree(), pretty_print=True, encoding="unicode"
+        )
+        return '<?xml version="1.0" ?>\n' + pretty.strip() + "\n", "xml"
 
-    if kind == ContentKind.PDF:
+    if kind == "pdf":
         try:
             from pypdf import PdfReader  # type: ignore[import-not-found]
             from pypdf.errors import (  # type: ignore[import-not-found]
@@ -127,272 +239,450 @@ def _format_non_html_for_markdown(
     return text, "text"
 
 
-def ensure_export_html_variants(*, export_dir: Path) -> int:
+def _event_fingerprint(evt: dict, raw: bytes) -> str:
+    paths = evt.get("paths") or {}
+    return normalize_fingerprint(
+        raw,
+        evt.get("url"),
+        evt.get("title"),
+        evt.get("content_type"),
+        evt.get("status_code"),
+        evt.get("at"),
+        paths.get("raw"),
+        paths.get("page_md"),
+    )
+
+
+@dataclass
+class _RenderJob:
+    """A manifest event a normalization pass will render or skip."""
+
+    evt: dict
+    raw_path: Path
+    norm_key: str
+    fingerprint: str
+    # Arguments for the pass's render function; None when the cache had
+    # the event as fresh when it was scanned.
+    args: tuple | None
+
+
+def _iter_render_jobs(
+    export_dir: Path,
+    *,
+    prefix: str,
+    kinds: frozenset[str],
+    cache: NormalizeCache | None,
+    prepare: Callable[[dict, bytes], tuple | None],
+    wants: Callable[[dict, str], bool] | None = None,
+) -> Iterator[_RenderJob]:
+    """Yield the manifest events a pass handles, in manifest order.
+
+    ``wants(evt, raw_rel)`` filters events before their raw file is read;
+    ``prepare(evt, raw)`` returns the render arguments, or None to skip
+    the event.
+    """
+
+    manifest_jsonl = export_dir / "manifest.jsonl"
+    for evt in iter_jsonl_events(manifest_jsonl, kinds=kinds):
+        if evt.get("kind") not in kinds:
+            continue
+
+        url = str(evt.get("url") or "")
+        if not url:
+            continue
+
+        paths = evt.get("paths") or {}
+        raw_rel = paths.get("raw")
+        if not isinstance(raw_rel, str) or not raw_rel:
+            continue
+        if wants is not None and not wants(evt, raw_rel):
+            continue
+
+        raw_path = export_dir / raw_rel
+        if not raw_path.exists() or not raw_path.is_file():
+            continue
+
+        try:
+            raw = raw_path.read_bytes()
+        except OSError:
+            continue
+
+        norm_key = f"{prefix}:{url}"
+        fingerprint = ""
+        if cache is not None:
+            fingerprint = _event_fingerprint(evt, raw)
+            if cache.is_fresh(norm_key, fingerprint):
+                yield _RenderJob(evt, raw_path, norm_key, fingerprint, None)
+                continue
+
+        args = prepare(evt, raw)
+        if args is not None:
+            yield _RenderJob(evt, raw_path, norm_key, fingerprint, args)
+
+
+def _render_in_order(
+    jobs: Iterable[_RenderJob],
+    *,
+    render: Callable[..., Any],
+    prepare: Callable[[dict, bytes], tuple | None],
+    cache: NormalizeCache | None,
+    executor: Executor | None,
+) -> Iterator[tuple[_RenderJob, tuple, Any]]:
+    """Yield ``(job, args, render(*args))`` in job order, skipping fresh jobs.
+
+    With an executor (a process pool), renders run ahead of the caller,
+    which writes the results, so files, cache marks and manifest rows are
+    still written by one process in manifest order. A job that was fresh
+    when scanned is checked again at its turn: an earlier event rendered
+    since may have rewritten its files, and the later event must win.
+    """
+
+    jobs = iter(jobs)
+    head: list[_RenderJob] = []
+    if executor is not None:
+        renders = 0
+        for job in jobs:
+            head.append(job)
+            renders += job.args is not None
+            if renders >= _PARALLEL_RENDER_MIN_PAGES:
+                break
+        else:
+            # Too few renders to pay for starting worker processes.
+            executor = None
+    window = _RENDER_WINDOW if executor is not None else 0
+
+    queue: deque[tuple[_RenderJob, Future | None]] = deque()
+    for job in itertools.chain(head, jobs):
+        future = None
+        if executor is not None and job.args is not None:
+            future = executor.submit(render, *job.args)
+        queue.append((job, future))
+        while len(queue) > window:
+            yield from _finish_render(
+                *queue.popleft(), render=render, prepare=prepare, cache=cache
+            )
+    while queue:
+        yield from _finish_render(
+            *queue.popleft(), render=render, prepare=prepare, cache=cache
+        )
+
+
+def _finish_render(
+    job: _RenderJob,
+    future: Future | None,
+    *,
+    render: Callable[..., Any],
+    prepare: Callable[[dict, bytes], tuple | None],
+    cache: NormalizeCache | None,
+) -> Iterator[tuple[_RenderJob, tuple, Any]]:
+    args = job.args
+    if future is not None and args is not None:
+        yield job, args, future.result()
+        return
+    if args is None:
+        if cache is None or cache.is_fresh(job.norm_key, job.fingerprint):
+            return
+        try:
+            raw = job.raw_path.read_bytes()
+        except OSError:
+            return
+        args = prepare(job.evt, raw)
+        if args is None:
+            return
+    yield job, args, render(*args)
+
+
+def _wants_html(evt: dict, raw_rel: str) -> bool:
+    return str(evt.get("content_type") or "").lower().startswith(
+        "text/html"
+    ) or raw_rel.lower().endswith(".html")
+
+
+def _prepare_html_render(evt: dict, raw: bytes) -> tuple:
+    return raw, str(evt.get("url") or ""), not evt.get("title")
+
+
+def _render_html_page(
+    raw: bytes, url: str, need_title: bool
+) -> tuple[str, str, str]:
+    """Return (title, markdown, text) for one page, parsing it once.
+
+    The title is "" unless ``need_title``. Module-level so
+    ProcessPoolExecutor workers can unpickle it.
+    """
+
+    soup = parse_html(raw.decode("utf-8", errors="replace"))
+    title = extract_title_from_soup(soup) if need_title else ""
+    # Text first: the Markdown step merges the strings left beside removed
+    # scripts, which would run them together in the text.
+    txt_text = _soup_to_text(soup)
+    md_text = html_to_markdown_from_soup(soup, source_url=url)
+    return title, md_text, txt_text
+
+
+def _prepare_non_html_render(evt: dict, body: bytes) -> tuple | None:
+    content_type = evt.get("content_type")
+    kind = sniff_kind(
+        str(evt.get("url") or ""),
+        content_type=str(content_type or ""),
+        body=body,
+    )
+    if kind not in {
+        "json",
+        "xml",
+        "pdf",
+        "text",
+    }:
+        return None
+
+    status_code = evt.get("status_code")
+    if status_code is not None:
+        try:
+            sc = int(status_code)
+        except (TypeError, ValueError):
+            sc = 0
+        if sc and not (200 <= sc < 400):
+            return None
+
+    return kind, body, str(content_type or "")
+
+
+def _render_non_html(
+    kind: ContentKind, body: bytes, content_type: str
+) -> tuple[str, str, bool]:
+    """Return (rendered_text, fence_language, truncated).
+
+    Module-level so ProcessPoolExecutor workers can unpickle it.
+    """
+
+    rendered_text, fence = _format_non_html_for_markdown(
+        kind=kind,
+        body=body,
+        content_type=content_type,
+    )
+    rendered_text, truncated = _truncate_text(rendered_text)
+    return rendered_text, fence, truncated
+
+
+def ensure_export_html_variants(
+    *,
+    export_dir: Path,
+    cache: NormalizeCache | None = None,
+    executor: Executor | None = None,
+) -> int:
     """(Re)generate per-page MD/HTML/TXT/JSON variants for HTML documents.
 
     This is a filesystem-level normalization step used when an export already
     contains raw HTML (and possibly markdown) but needs consistent sidecar
     formats for each document.
+
+    With a cache, pages whose raw body and manifest event are unchanged since
+    their variants were last written are skipped. With an executor (a
+    process pool), pages are parsed and rendered in its workers; files are
+    still written here, in manifest order.
     """
 
     export_dir = export_dir.resolve()
-    manifest_jsonl = export_dir / "manifest.jsonl"
-    if not manifest_jsonl.exists():
+    if not (export_dir / "manifest.jsonl").exists():
         return 0
 
     pages_dir = export_dir / "pages"
     pages_dir.mkdir(parents=True, exist_ok=True)
     manifest = ManifestWriter(export_dir)
 
+    jobs = _iter_render_jobs(
+        export_dir,
+        prefix="html",
+        kinds=_RENDERED_KINDS,
+        cache=cache,
+        prepare=_prepare_html_render,
+        wants=_wants_html,
+    )
     rendered = 0
-    with manifest_jsonl.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                evt = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            if evt.get("kind") not in {"ingested_local", "fetched", "blocked"}:
-                continue
-
-            url = str(evt.get("url") or "")
-            if not url:
-                continue
-
-            paths = evt.get("paths") or {}
-            raw_rel = paths.get("raw")
-            if not isinstance(raw_rel, str) or not raw_rel:
-                continue
-
-            content_type = evt.get("content_type")
-            if not (
-                str(content_type or "").lower().startswith("text/html")
-                or raw_rel.lower().endswith(".html")
-            ):
-                continue
+    for job, args, result in _render_in_order(
+        jobs,
+        render=_render_html_page,
+        prepare=_prepare_html_render,
+        cache=cache,
+        executor=executor,
+    ):
+        evt = job.evt
+        url = str(evt["url"])
+        paths = evt.get("paths") or {}
+        raw_rel = str(paths["raw"])
+        content_type = evt.get("content_type")
+        html_text = args[0].decode("utf-8", errors="replace")
+        page_title, md_text, txt_text = result
+        title = str(evt.get("title") or "") or page_title
+
+        md_rel = paths.get("page_md")
+        stem = None
+        if isinstance(md_rel, str) and md_rel:
+            stem = Path(md_rel).stem
+
+        cache_key = url_hash(url)
+        safe_title = _safe_filename_component(title)
+        stem = stem or f"{safe_title}--{cache_key}".replace(" ", "-")
 
-            raw_path = export_dir / raw_rel
-            if not raw_path.exists() or not raw_path.is_file():
-                continue
+        md_path = pages_dir / f"{stem}.md"
+        html_path = pages_dir / f"{stem}.html"
+        txt_path = pages_dir / f"{stem}.txt"
+        meta_path = pages_dir / f"{stem}.json"
 
-            try:
-                raw = raw_path.read_bytes()
-            except OSError:
-                continue
+        md_path.write_bytes(md_text.encode("utf-8"))
+        html_path.write_bytes(html_text.encode("utf-8"))
+        txt_path.write_bytes(txt_text.encode("utf-8"))
 
-            html_text = raw.decode("utf-8", errors="replace")
-            title = str(evt.get("title") or "")
-            if not title:
-                title = extract_title(html_text)
-
-            md_rel = paths.get("page_md")
-            stem = None
-            if isinstance(md_rel, str) and md_rel:
-                stem = Path(md_rel).stem
-
-            cache_key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
-            safe_title = _safe_filename_component(title)
-            stem = stem or f"{safe_title}--{cache_key}".replace(" ", "-")
-
-            md_path = pages_dir / f"{stem}.md"
-            html_path = pages_dir / f"{stem}.html"
-            txt_path = pages_dir / f"{stem}.txt"
-            meta_path = pages_dir / f"{stem}.json"
-
-            md_text = html_to_markdown(html_text, source_url=url)
-            md_path.write_text(md_text, encoding="utf-8", newline="\n")
-            html_path.write_text(html_text, encoding="utf-8", newline="\n")
-            txt_path.write_text(
-                _html_to_text(html_text),
-                encoding="utf-8",
-                newline="\n",
+        started_at = str(evt.get("at") or "")
+        status_code = evt.get("status_code")
+        meta = {
+            "url": url,
+            "title": title,
+            "generated_at": utc_iso(),
+            "started_at": started_at,
+            "status_code": status_code,
+            "content_type": content_type,
+            "paths": {
+                "raw": raw_rel,
+                "page_md": relpath_posix(md_path, export_dir),
+                "page_html": relpath_posix(html_path, export_dir),
+                "page_txt": relpath_posix(txt_path, export_dir),
+                "page_json": relpath_posix(meta_path, export_dir),
+            },
+        }
+        meta_path.write_bytes(dump_json_indented(meta) + b"\n")
+        if cache is not None:
+            cache.mark(
+                job.norm_key,
+                job.fingerprint,
+                [md_path, html_path, txt_path, meta_path],
             )
 
-            started_at = str(evt.get("at") or "")
-            status_code = evt.get("status_code")
-            meta = {
+        manifest.append(
+            {
+                "kind": "rendered_variants",
                 "url": url,
                 "title": title,
-                "generated_at": utc_iso(),
-                "started_at": started_at,
-                "status_code": status_code,
-                "content_type": content_type,
-                "paths": {
-                    "raw": raw_rel,
-                    "page_md": relpath_posix(md_path, export_dir),
-                    "page_html": relpath_posix(html_path, export_dir),
-                    "page_txt": relpath_posix(txt_path, export_dir),
-                    "page_json": relpath_posix(meta_path, export_dir),
-                },
+                "paths": meta["paths"],
             }
-            meta_path.write_text(
-                json.dumps(meta, indent=2, ensure_ascii=False) + "\n",
-                encoding="utf-8",
-                newline="\n",
-            )
-
-            manifest.append(
-                {
-                    "kind": "rendered_variants",
-                    "url": url,
-                    "title": title,
-                    "paths": meta["paths"],
-                }
-            )
-            rendered += 1
+        )
+        rendered += 1
 
     return rendered
 
 
-def ensure_export_non_html_variants(*, export_dir: Path) -> int:
+def ensure_export_non_html_variants(
+    *,
+    export_dir: Path,
+    cache: NormalizeCache | None = None,
+    executor: Executor | None = None,
+) -> int:
     """(Re)generate per-page MD/TXT/JSON variants.
 
-    Targets JSON/XML/PDF/TEXT documents.
+    Targets JSON/XML/PDF/TEXT documents. With a cache, unchanged documents
+    are skipped, and with an executor they are rendered in worker
+    processes, as in ensure_export_html_variants.
     """
 
     export_dir = export_dir.resolve()
-    manifest_jsonl = export_dir / "manifest.jsonl"
-    if not manifest_jsonl.exists():
+    if not (export_dir / "manifest.jsonl").exists():
         return 0
 
     pages_dir = export_dir / "pages"
     pages_dir.mkdir(parents=True, exist_ok=True)
     manifest = ManifestWriter(export_dir)
 
+    jobs = _iter_render_jobs(
+        export_dir,
+        prefix="non_html",
+        kinds=_FETCHED_KINDS,
+        cache=cache,
+        prepare=_prepare_non_html_render,
+    )
     rendered = 0
-    with manifest_jsonl.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                evt = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            if evt.get("kind") not in {"ingested_local", "fetched"}:
-                continue
-
-            url = str(evt.get("url") or "")
-            if not url:
-                continue
-
-            paths = evt.get("paths") or {}
-            raw_rel = paths.get("raw")
-            if not isinstance(raw_rel, str) or not raw_rel:
-                continue
-
-            raw_path = export_dir / raw_rel
-            if not raw_path.exists() or not raw_path.is_file():
-                continue
+    for job, args, result in _render_in_order(
+        jobs,
+        render=_render_non_html,
+        prepare=_prepare_non_html_render,
+        cache=cache,
+        executor=executor,
+    ):
+        evt = job.evt
+        url = str(evt["url"])
+        paths = evt.get("paths") or {}
+        raw_rel = str(paths["raw"])
+        content_type = evt.get("content_type")
+        status_code = evt.get("status_code")
+        kind = args[0]
+        rendered_text, fence, truncated = result
+
+        title = str(evt.get("title") or "")
+        if not title:
+            title = _guess_title_from_url(url)
+
+        md_rel = paths.get("page_md")
+        stem = None
+        if isinstance(md_rel, str) and md_rel:
+            stem = Path(md_rel).stem
+
+        cache_key = url_hash(url)
+        safe_title = _safe_filename_component(title)
+        stem = stem or f"{safe_title}--{cache_key}".replace(" ", "-")
 
-            try:
-                body = raw_path.read_bytes()
-            except OSError:
-                continue
+        md_path = pages_dir / f"{stem}.md"
+        txt_path = pages_dir / f"{stem}.txt"
+        meta_path = pages_dir / f"{stem}.json"
 
-            content_type = evt.get("content_type")
-            kind = sniff_kind(
-                url,
-                content_type=str(content_type or ""),
-                body=body,
-            )
-            if kind not in {
-                ContentKind.JSON,
-                ContentKind.XML,
-                ContentKind.PDF,
-                ContentKind.TEXT,
-            }:
-                continue
+        txt_path.write_bytes(rendered_text.encode("utf-8"))
+        md_path.write_bytes(
+            "\n".join(
+                [
+                    f"# {title}",
+                    "",
+                    f"URL: {url}",
+                    f"Content-Type: {content_type}",
+                    f"Kind: {kind}",
+                    "",
+                    "```" + fence,
+                    rendered_text.rstrip("\n"),
+                    "```",
+                    "" if not truncated else "(Output truncated.)",
+                    "",
+                ]
+            ).encode("utf-8")
+        )
 
-            status_code = evt.get("status_code")
-            if status_code is not None:
-                try:
-                    sc = int(status_code)
-                except (TypeError, ValueError):
-                    sc = 0
-                if sc and not (200 <= sc < 400):
-                    continue
-
-            title = str(evt.get("title") or "")
-            if not title:
-                title = _guess_title_from_url(url)
-
-            md_rel = paths.get("page_md")
-            stem = None
-            if isinstance(md_rel, str) and md_rel:
-                stem = Path(md_rel).stem
-
-            cache_key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
-            safe_title = _safe_filename_component(title)
-            stem = stem or f"{safe_title}--{cache_key}".replace(" ", "-")
-
-            md_path = pages_dir / f"{stem}.md"
-            txt_path = pages_dir / f"{stem}.txt"
-            meta_path = pages_dir / f"{stem}.json"
-
-            rendered_text, fence = _format_non_html_for_markdown(
-                kind=kind,
-                body=body,
-                content_type=str(content_type or ""),
-            )
-            rendered_text, truncated = _truncate_text(rendered_text)
-
-            txt_path.write_text(rendered_text, encoding="utf-8", newline="\n")
-            md_path.write_text(
-                "\n".join(
-                    [
-                        f"# {title}",
-                        "",
-                        f"URL: {url}",
-                        f"Content-Type: {content_type}",
-                        f"Kind: {kind.value}",
-                        "",
-                        "```" + fence,
-                        rendered_text.rstrip("\n"),
-                        "```",
-                        "" if not truncated else "(Output truncated.)",
-                        "",
-                    ]
-                ),
-                encoding="utf-8",
-                newline="\n",
+        started_at = str(evt.get("at") or "")
+        meta = {
+            "url": url,
+            "title": title,
+            "generated_at": utc_iso(),
+            "started_at": started_at,
+            "status_code": status_code,
+            "content_type": content_type,
+            "kind": kind,
+            "paths": {
+                "raw": raw_rel,
+                "page_md": relpath_posix(md_path, export_dir),
+                "page_txt": relpath_posix(txt_path, export_dir),
+                "page_json": relpath_posix(meta_path, export_dir),
+            },
+        }
+        meta_path.write_bytes(dump_json_indented(meta) + b"\n")
+        if cache is not None:
+            cache.mark(
+                job.norm_key, job.fingerprint, [md_path, txt_path, meta_path]
             )
 
-            started_at = str(evt.get("at") or "")
-            meta = {
+        manifest.append(
+            {
+                "kind": "rendered_non_html_variants",
                 "url": url,
                 "title": title,
-                "generated_at": utc_iso(),
-                "started_at": started_at,
-                "status_code": status_code,
-                "content_type": content_type,
-                "kind": kind.value,
-                "paths": {
-                    "raw": raw_rel,
-                    "page_md": relpath_posix(md_path, export_dir),
-                    "page_txt": relpath_posix(txt_path, export_dir),
-                    "page_json": relpath_posix(meta_path, export_dir),
-                },
+                "paths": meta["paths"],
             }
-            meta_path.write_text(
-                json.dumps(meta, indent=2, ensure_ascii=False) + "\n",
-                encoding="utf-8",
-                newline="\n",
-            )
-
-            manifest.append(
-                {
-                    "kind": "rendered_non_html_variants",
-                    "url": url,
-                    "title": title,
-                    "paths": meta["paths"],
-                }
-            )
-            rendered += 1
+        )
+        rendered += 1
 
     return rendered
 
@@ -413,27 +703,33 @@ def _format_response_as_text(
     *,
     body: bytes,
     content_type: str | None,
-) -> tuple[str, dict]:
-    """Return (text_for_display, json_payload_for_resp_json)."""
+) -> tuple[str, dict, bool]:
+    """Return (text_for_display, json_payload_for_resp_json, fast).
+
+    ``fast`` is passed on to _dump_json_body() for the payload.
+    """
 
     ct = str(content_type or "")
     kind = ct.split(";")[0].strip().lower()
 
     if kind == "application/json" or kind.endswith("+json"):
         try:
-            decoded = body.decode("utf-8", errors="strict")
-            obj = json.loads(decoded)
-            pretty = json.dumps(obj, indent=2, ensure_ascii=False) + "\n"
-            return pretty, {"type": "json", "value": obj}
+            obj, fast = _load_json_body(body)
+            pretty = _dump_json_body(obj, fast=fast).decode("utf-8") + "\n"
+            return pretty, {"type": "json", "value": obj}, fast
         except (UnicodeDecodeError, json.JSONDecodeError, ValueError):
             text = body.decode("utf-8", errors="replace")
-            return text, {"type": "text", "value": text}
+            return text, {"type": "text", "value": text}, True
 
     text = body.decode("utf-8", errors="replace")
-    return text, {"type": "text", "value": text}
+    return text, {"type": "text", "value": text}, True
 
 
-def ensure_export_api_endpoint_variants(*, export_dir: Path) -> int:
+def ensure_export_api_endpoint_variants(
+    *,
+    export_dir: Path,
+    cache: NormalizeCache | None = None,
+) -> int:
     """Generate MD/HTML/TXT/JSON *response* variants for fetched endpoints.
 
     This is intentionally additive: it does not overwrite the existing
@@ -442,6 +738,9 @@ def ensure_export_api_endpoint_variants(*, export_dir: Path) -> int:
       - pages/<stem>.resp.html
       - pages/<stem>.resp.txt
       - pages/<stem>.resp.json
+
+    With a cache, unchanged endpoints are skipped as in
+    ensure_export_html_variants.
     """
 
     export_dir = export_dir.resolve()
@@ -454,159 +753,153 @@ def ensure_export_api_endpoint_variants(*, export_dir: Path) -> int:
     manifest = ManifestWriter(export_dir)
 
     rendered = 0
-    with manifest_jsonl.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                evt = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    for evt in iter_jsonl_events(manifest_jsonl, kinds=_RENDERED_KINDS):
+        if evt.get("kind") not in _RENDERED_KINDS:
+            continue
 
-            if evt.get("kind") not in {"ingested_local", "fetched", "blocked"}:
-                continue
+        url = str(evt.get("url") or "")
+        if not url:
+            continue
 
-            url = str(evt.get("url") or "")
-            if not url:
-                continue
+        # Only generate response variants for API endpoints.
+        try:
+            parsed = urlparse(url)
+        except ValueError:
+            continue
+        if (parsed.netloc or "").lower() != "data.uspto.gov":
+            continue
+        if not (parsed.path or "").startswith("/apis/"):
+            continue
 
-            # Only generate response variants for API endpoints.
-            try:
-                parsed = urlparse(url)
-            except ValueError:
-                continue
-            if (parsed.netloc or "").lower() != "data.uspto.gov":
-                continue
-            if not (parsed.path or "").startswith("/apis/"):
-                continue
+        paths = evt.get("paths") or {}
+        raw_rel = paths.get("raw")
+        if not isinstance(raw_rel, str) or not raw_rel:
+            continue
 
-            paths = evt.get("paths") or {}
-            raw_rel = paths.get("raw")
-            if not isinstance(raw_rel, str) or not raw_rel:
-                continue
+        raw_path = export_dir / raw_rel
+        if not raw_path.exists() or not raw_path.is_file():
+            continue
 
-            raw_path = export_dir / raw_rel
-            if not raw_path.exists() or not raw_path.is_file():
-                continue
+        try:
+            body = raw_path.read_bytes()
+        except OSError:
+            continue
 
-            try:
-                body = raw_path.read_bytes()
-            except OSError:
+        norm_key = f"endpoint:{url}"
+        fingerprint = ""
+        if cache is not None:
+            fingerprint = _event_fingerprint(evt, body)
+            if cache.is_fresh(norm_key, fingerprint):
                 continue
 
-            content_type = evt.get("content_type")
-            status_code = evt.get("status_code")
-            title = str(evt.get("title") or "")
-            if not title:
-                title = _guess_title_from_url(url)
+        content_type = evt.get("content_type")
+        status_code = evt.get("status_code")
+        title = str(evt.get("title") or "")
+        if not title:
+            title = _guess_title_from_url(url)
 
-            # Match the existing filename style for stability.
-            cache_key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
-            safe_title = _safe_filename_component(title)
-            stem = f"{safe_title}--{cache_key}".replace(" ", "-")
+        # Match the existing filename style for stability.
+        cache_key = url_hash(url)
+        safe_title = _safe_filename_component(title)
+        stem = f"{safe_title}--{cache_key}".replace(" ", "-")
 
-            resp_md = pages_dir / f"{stem}.resp.md"
-            resp_html = pages_dir / f"{stem}.resp.html"
-            resp_txt = pages_dir / f"{stem}.resp.txt"
-            resp_json = pages_dir / f"{stem}.resp.json"
+        resp_md = pages_dir / f"{stem}.resp.md"
+        resp_html = pages_dir / f"{stem}.resp.html"
+        resp_txt = pages_dir / f"{stem}.resp.txt"
+        resp_json = pages_dir / f"{stem}.resp.json"
 
-            text, payload = _format_response_as_text(
-                body=body,
-                content_type=str(content_type or ""),
-            )
+        text, payload, fast = _format_response_as_text(
+            body=body,
+            content_type=str(content_type or ""),
+        )
 
-            resp_txt.write_text(text, encoding="utf-8", newline="\n")
-            resp_md.write_text(
-                "\n".join(
-                    [
-                        f"# {title}",
-                        "",
-                        f"URL: {url}",
-                        f"Content-Type: {content_type}",
-                        f"Status: {status_code}",
-                        "",
-                        "```",
-                        text.rstrip("\n"),
-                        "```",
-                        "",
-                    ]
-                ),
-                encoding="utf-8",
-                newline="\n",
-            )
-            resp_html.write_text(
-                "\n".join(
-                    [
-                        "<!doctype html>",
-                        '<meta charset="utf-8">',
-                        f"<title>{html_lib.escape(title)}</title>",
-                        "<pre>",
-                        html_lib.escape(text),
-                        "</pre>",
-                        "",
-                    ]
-                ),
-                encoding="utf-8",
-                newline="\n",
+        resp_txt.write_bytes(text.encode("utf-8"))
+        resp_md.write_bytes(
+            "\n".join(
+                [
+                    f"# {title}",
+                    "",
+                    f"URL: {url}",
+                    f"Content-Type: {content_type}",
+                    f"Status: {status_code}",
+                    "",
+                    "```",
+                    text.rstrip("\n"),
+                    "```",
+                    "",
+                ]
+            ).encode("utf-8")
+        )
+        resp_html.write_bytes(
+            "\n".join(
+                [
+                    "<!doctype html>",
+                    '<meta charset="utf-8">',
+                    f"<title>{html_lib.escape(title)}</title>",
+                    "<pre>",
+                    html_lib.escape(text),
+                    "</pre>",
+                    "",
+                ]
+            ).encode("utf-8")
+        )
+
+        resp_obj = {
+            "url": url,
+            "title": title,
+            "generated_at": utc_iso(),
+            "status_code": status_code,
+            "content_type": content_type,
+            "raw_path": raw_rel,
+            "payload": payload,
+        }
+        resp_json.write_bytes(_dump_json_body(resp_obj, fast=fast) + b"\n")
+        if cache is not None:
+            cache.mark(
+                norm_key,
+                fingerprint,
+                [resp_md, resp_html, resp_txt, resp_json],
             )
 
-            resp_obj = {
+        manifest.append(
+            {
+                "kind": "rendered_endpoint_variants",
                 "url": url,
                 "title": title,
-                "generated_at": utc_iso(),
-                "status_code": status_code,
-                "content_type": content_type,
-                "raw_path": raw_rel,
-                "payload": payload,
+                "paths": {
+                    "raw": raw_rel,
+                    "resp_md": relpath_posix(resp_md, export_dir),
+                    "resp_html": relpath_posix(resp_html, export_dir),
+                    "resp_txt": relpath_posix(resp_txt, export_dir),
+                    "resp_json": relpath_posix(resp_json, export_dir),
+                },
             }
-            resp_json.write_text(
-                json.dumps(resp_obj, indent=2, ensure_ascii=False) + "\n",
-                encoding="utf-8",
-                newline="\n",
-            )
-
-            manifest.append(
-                {
-                    "kind": "rendered_endpoint_variants",
-                    "url": url,
-                    "title": title,
-                    "paths": {
-                        "raw": raw_rel,
-                        "resp_md": relpath_posix(resp_md, export_dir),
-                        "resp_html": relpath_posix(resp_html, export_dir),
-                        "resp_txt": relpath_posix(resp_txt, export_dir),
-                        "resp_json": relpath_posix(resp_json, export_dir),
-                    },
-                }
-            )
-            rendered += 1
+        )
+        rendered += 1
 
     return rendered
 
 
-def extract_links_from_html(html: str, *, page_url: str) -> list[str]:
-    soup = BeautifulSoup(html, "html.parser")
+def iter_links_from_html(html: str, *, page_url: str) -> Iterator[str]:
+    """Yield absolute, normalized link targets in document order."""
 
-    def _attr_text(val: object) -> str:
-        if isinstance(val, list):
-            if not val:
-                return ""
-            return str(val[0])
-        return str(val or "")
+    # Only hrefs are needed, so libxml2 builds the tree and XPath reads the
+    # attributes without a BeautifulSoup object per element.
+    root = etree.fromstring(html.encode("utf-8", "replace"), _LINK_PARSER)
+    if root is None:
+        return
 
     base_href = None
-    base = soup.find("base")
+    base = root.find(".//base")
     if base is not None:
-        base_href = _attr_text(base.get("href")).strip() or None
+        base_href = (base.get("href") or "").strip() or None
 
     effective_base = page_url
     if base_href is not None:
         effective_base = urljoin(page_url, base_href)
 
-    out: list[str] = []
-    for a in soup.select("a[href]"):
-        href = _attr_text(a.get("href")).strip()
+    for raw_href in root.xpath("//a/@href"):
+        href = str(raw_href).strip()
         if not href:
             continue
         if href.startswith("#"):
@@ -614,10 +907,11 @@ def extract_links_from_html(html: str, *, page_url: str) -> list[str]:
         if href.lower().startswith("mailto:"):
             continue
         abs_url = urljoin(effective_base, href)
-        abs_url = normalize_url(abs_url)
-        out.append(abs_url)
+        yield normalize_url(abs_url)
 
-    return out
+
+def extract_links_from_html(html: str, *, page_url: str) -> list[str]:
+    return list(iter_links_from_html(html, page_url=page_url))
 
 
 @dataclass
@@ -629,6 +923,9 @@ class CrawlConfig:
     per_host_delay_s: float = 0.5
     respect_robots: bool = True
     refresh_cache: bool = False
+    # Concurrent fetches overall and per host (1 = sequential crawl).
+    workers: int = 1
+    per_host_parallel: int = 1
 
 
 class Crawler:
@@ -655,19 +952,76 @@ class Crawler:
         self.raw_dir.mkdir(parents=True, exist_ok=True)
         self.pages_dir.mkdir(parents=True, exist_ok=True)
 
-        self._last_fetch_at_by_host: dict[str, float] = {}
+        delay_s = self.cfg.per_host_delay_s
+        self._rate_limiter = HostTokenBucket(
+            1.0 / delay_s if delay_s > 0 else 0.0
+        )
+        self._host_slots_lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._robots_by_host: OrderedDict[str, RobotsRules | None] = (
+            OrderedDict()
+        )
         self._stats: Counter[str] = Counter()
         self._citations: list[CitationItem] = []
 
-    def _pacing_sleep(self, host: str) -> None:
-        last = self._last_fetch_at_by_host.get(host)
-        if last is None:
-            return
-        elapsed = time.time() - last
-        if elapsed < self.cfg.per_host_delay_s:
-            time.sleep(self.cfg.per_host_delay_s - elapsed)
+    @contextmanager
+    def _host_slot(self, host: str) -> Iterator[None]:
+        """Hold one of the host's per_host_parallel request slots."""
+        with self._host_slots_lock:
+            sem = self._host_slots.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(
+                    max(1, self.cfg.per_host_parallel)
+                )
+                self._host_slots[host] = sem
+        with sem:
+            yield
+
+    def _pop_ready(
+        self,
+        queue: deque[tuple[str, int]],
+        host_busy: Counter[str],
+    ) -> tuple[str, int]:
+        """Pop the first queued URL whose host can start a request now.
+
+        A host is ready when its token bucket has a token and it has a free
+        per_host_parallel slot, so one host's back-off does not tie up the
+        workers while URLs for other hosts wait. At most
+        _DISPATCH_LOOKAHEAD entries are examined; those passed over keep
+        their order at the front of the queue. If none is ready the head
+        is taken and its worker waits in _fetch_body() as before.
+        """
+        skipped: list[tuple[str, int]] = []
+        picked = None
+        limit = max(1, self.cfg.per_host_parallel)
+        for _ in range(min(len(queue), _DISPATCH_LOOKAHEAD)):
+            item = queue.popleft()
+            host = (urlparse(item[0]).hostname or "").lower()
+            if (
+                host_busy[host] < limit
+                and self._rate_limiter.wait_time(host) <= 0
+            ):
+                picked = item
+                break
+            skipped.append(item)
+        queue.extendleft(reversed(skipped))
+        return picked if picked is not None else queue.popleft()
 
     def _fetch_robots(self, host: str) -> RobotsRules | None:
+        # _should_fetch() asks for every URL; only the first lookup per host
+        # reads (or fetches) and parses robots.txt. Misses are remembered
+        # too, so an absent robots.txt is not re-requested for each page.
+        if host in self._robots_by_host:
+            self._robots_by_host.move_to_end(host)
+            return self._robots_by_host[host]
+
+        rules = self._load_robots(host)
+        self._robots_by_host[host] = rules
+        if len(self._robots_by_host) > _ROBOTS_MEMO_MAX_HOSTS:
+            self._robots_by_host.popitem(last=False)
+        return rules
+
+    def _load_robots(self, host: str) -> RobotsRules | None:
         cached = self.robots_cache.load(host)
         if cached is not None:
             return cached
@@ -679,7 +1033,7 @@ class Crawler:
                 return None
             text = res.body.decode("utf-8", errors="replace")
             self.robots_cache.store(host, text)
-            return RobotsRules(text)
+            return parse_robots(text)
         except (
             OSError,
             UnicodeDecodeError,
@@ -709,7 +1063,7 @@ class Crawler:
         return True, None
 
     def _cache_key(self, url: str) -> str:
-        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+        return url_hash(url)
 
     def _write_page_variants(
         self,
@@ -717,12 +1071,16 @@ class Crawler:
         url: str,
         title: str,
         html_text: str,
+        soup: BeautifulSoup,
         raw_path: Path,
         started_at: str,
         status_code: int | None = None,
         content_type: str | None = None,
         md_stem: str | None = None,
     ) -> dict[str, str]:
+        # ``soup`` is html_text already parsed (the caller took the title
+        # from it); rendering Markdown strips its scripts/styles and merges
+        # the strings around them in place, so the text is taken first.
         cache_key = self._cache_key(url)
         safe_title = _safe_filename_component(title)
         stem = md_stem or f"{safe_title}--{cache_key}".replace(" ", "-")
@@ -732,14 +1090,11 @@ class Crawler:
         txt_path = self.pages_dir / f"{stem}.txt"
         meta_path = self.pages_dir / f"{stem}.json"
 
-        md_text = html_to_markdown(html_text, source_url=url)
-        md_path.write_text(md_text, encoding="utf-8", newline="\n")
-        html_path.write_text(html_text, encoding="utf-8", newline="\n")
-        txt_path.write_text(
-            _html_to_text(html_text),
-            encoding="utf-8",
-            newline="\n",
-        )
+        txt_text = _soup_to_text(soup)
+        md_text = html_to_markdown_from_soup(soup, source_url=url)
+        md_path.write_bytes(md_text.encode("utf-8"))
+        html_path.write_bytes(html_text.encode("utf-8"))
+        txt_path.write_bytes(txt_text.encode("utf-8"))
 
         meta = {
             "url": url,
@@ -756,11 +1111,7 @@ class Crawler:
                 "page_json": relpath_posix(meta_path, self.out_dir),
             },
         }
-        meta_path.write_text(
-            json.dumps(meta, indent=2, ensure_ascii=False) + "\n",
-            encoding="utf-8",
-            newline="\n",
-        )
+        meta_path.write_bytes(dump_json_indented(meta) + b"\n")
 
         return {
             "raw": relpath_posix(raw_path, self.out_dir),
@@ -797,8 +1148,8 @@ class Crawler:
         )
         rendered_text, truncated = _truncate_text(rendered_text)
 
-        txt_path.write_text(rendered_text, encoding="utf-8", newline="\n")
-        md_path.write_text(
+        txt_path.write_bytes(rendered_text.encode("utf-8"))
+        md_path.write_bytes(
             "\n".join(
                 [
                     f"# {title}",
@@ -806,7 +1157,7 @@ class Crawler:
                     f"URL: {url}",
                     f"Content-Type: {content_type}",
                     f"Status: {status_code}",
-                    f"Kind: {kind.value}",
+                    f"Kind: {kind}",
                     "",
                     "```" + fence,
                     rendered_text.rstrip("\n"),
@@ -814,9 +1165,7 @@ class Crawler:
                     "" if not truncated else "(Output truncated.)",
                     "",
                 ]
-            ),
-            encoding="utf-8",
-            newline="\n",
+            ).encode("utf-8")
         )
 
         meta = {
@@ -826,7 +1175,7 @@ class Crawler:
             "started_at": started_at,
             "status_code": status_code,
             "content_type": content_type,
-            "kind": kind.value,
+            "kind": kind,
             "paths": {
                 "raw": relpath_posix(raw_path, self.out_dir),
                 "page_md": relpath_posix(md_path, self.out_dir),
@@ -834,11 +1183,7 @@ class Crawler:
                 "page_json": relpath_posix(meta_path, self.out_dir),
             },
         }
-        meta_path.write_text(
-            json.dumps(meta, indent=2, ensure_ascii=False) + "\n",
-            encoding="utf-8",
-            newline="\n",
-        )
+        meta_path.write_bytes(dump_json_indented(meta) + b"\n")
 
         return {
             "raw": relpath_posix(raw_path, self.out_dir),
@@ -851,15 +1196,15 @@ class Crawler:
         # Keep a stable, content-addressed filename to enable dedupe.
         sha = hashlib.sha256(body).hexdigest()[:16]
         ext = {
-            ContentKind.HTML: ".html",
-            ContentKind.JSON: ".json",
-            ContentKind.XML: ".xml",
-            ContentKind.PDF: ".pdf",
-            ContentKind.TEXT: ".txt",
-            ContentKind.ZIP: ".zip",
+            "html": ".html",
+            "json": ".json",
+            "xml": ".xml",
+            "pdf": ".pdf",
+            "text": ".txt",
+            "zip": ".zip",
         }.get(kind, ".bin")
 
-        kind_dir = self.raw_dir / kind.value
+        kind_dir = self.raw_dir / kind
         kind_dir.mkdir(parents=True, exist_ok=True)
         path = kind_dir / f"{sha}{ext}"
         if not path.exists():
@@ -877,14 +1222,16 @@ class Crawler:
         """
 
         # Store raw HTML and render variants.
-        raw_path = self._store_raw(url, kind=ContentKind.HTML, body=body)
+        raw_path = self._store_raw(url, kind="html", body=body)
         html_text = body.decode("utf-8", errors="replace")
-        title = extract_title(html_text)
+        soup = parse_html(html_text)
+        title = extract_title_from_soup(soup)
         started_at = utc_iso()
         paths = self._write_page_variants(
             url=url,
             title=title,
             html_text=html_text,
+            soup=soup,
             raw_path=raw_path,
             started_at=started_at,
             status_code=None,
@@ -917,203 +1264,297 @@ class Crawler:
             }
         )
 
-    def crawl(self, seeds: Iterable[str], *, resume: bool = True) -> dict:
-        queue = deque((normalize_url(s), 0) for s in seeds)
+    def _process_page(
+        self,
+        *,
+        url: str,
+        depth: int,
+        body: bytes,
+        meta: dict,
+        started_at: str,
+        queue: deque[tuple[str, int]],
+        enqueued: set[str],
+        done: set[str],
+        failed: set[str],
+    ) -> bool:
+        """Store, render and record one fetched page; queue its links.
+
+        Returns False when the page was a WAF challenge (recorded as
+        blocked) rather than fetched.
+        """
 
-        done = self.state.load_set(self.state.done_path)
-        failed = self.state.load_set(self.state.failed_path)
+        status = int(meta.get("status_code") or 0)
+        headers = meta.get("headers") or {}
+        content_type = headers.get("Content-Type")
 
-        # Restore queue if present.
-        if resume:
-            restored = self.state.load_queue()
-            if restored:
-                queue = deque((normalize_url(u), 0) for u in restored)
+        kind = sniff_kind(url, content_type=content_type, body=body)
 
-        enqueued: set[str] = set(u for u, _ in queue)
+        # Detect WAF challenge pages and mark them as blocked
+        # (don’t parse links).
+        if is_waf_challenge(body, content_type=content_type):
+            self._stats["blocked_waf"] += 1
+            raw_path = self._store_raw(
+                url,
+                kind="html",
+                body=body,
+            )
+            self.manifest.append(
+                {
+                    "kind": "blocked",
+                    "blocked_by": "aws_waf",
+                    "url": url,
+                    "status_code": status,
+                    "content_type": content_type,
+                    "paths": {
+                        "raw": relpath_posix(raw_path, self.out_dir),
+                    },
+                }
+            )
+            done.add(url)
+            self.state.append_line(self.state.done_path, url)
+            return False
 
-        pages_fetched = 0
-        started_at = utc_iso()
+        raw_path = self._store_raw(url, kind=kind, body=body)
 
-        while queue and pages_fetched < self.cfg.max_pages:
-            url, depth = queue.popleft()
-            if url in done or url in failed:
-                continue
+        event: dict = {
+            "kind": "fetched",
+            "url": url,
+            "status_code": status,
+            "content_type": content_type,
+            "paths": {"raw": relpath_posix(raw_path, self.out_dir)},
+        }
 
-            ok, blocked_reason = self._should_fetch(url)
-            if not ok:
-                self._stats["blocked"] += 1
-                self.state.append_line(self.state.done_path, url)
-                done.add(url)
-                self.manifest.append(
-                    {"kind": "blocked", "url": url, "reason": blocked_reason}
-                )
-                continue
+        if kind == "html" and status and 200 <= status < 400:
+            html_text = body.decode("utf-8", errors="replace")
+            soup = parse_html(html_text)
+            title = extract_title_from_soup(soup)
+            paths = self._write_page_variants(
+                url=url,
+                title=title,
+                html_text=html_text,
+                soup=soup,
+                raw_path=raw_path,
+                started_at=started_at,
+                status_code=status,
+                content_type=content_type,
+            )
 
-            host = (urlparse(url).hostname or "").lower()
-            self._pacing_sleep(host)
+            event["paths"].update(paths)
+            event["title"] = title
 
-            # Cache behavior.
-            cache_entry = cache_paths(self.cache_dir, key=self._cache_key(url))
-            body, meta = (None, None)
-            if (
-                cache_entry.body_path.exists()
-                and cache_entry.meta_path.exists()
-                and not self.cfg.refresh_cache
-            ):
-                body, meta = read_cached(cache_entry)
+            md_path = self.out_dir / paths["page_md"]
 
-            if body is None:
-                try:
-                    res = self.http.get(url)
-                except (requests.RequestException, RuntimeError) as e:
-                    self._stats["error"] += 1
-                    failed.add(url)
-                    self.state.append_line(self.state.failed_path, url)
-                    self.manifest.append(
-                        {
-                            "kind": "error",
-                            "url": url,
-                            "error": str(e),
-                        }
-                    )
-                    continue
-                body = res.body
-                meta = {
-                    "status_code": res.status_code,
-                    "headers": res.headers,
-                    "final_url": res.final_url,
-                }
+            self._citations.append(
+                CitationItem(
+                    title=title,
+                    url=url,
+                    accessed=started_at[:10],
+                    local_path=relpath_posix(md_path, self.out_dir),
+                )
+            )
 
-                # Write cache even for non-200; it's useful evidence.
-                write_cached(cache_entry, res)
+            if depth < self.cfg.max_depth:
+                for link in self._extract_links(html_text, page_url=url):
+                    if link in enqueued or link in done or link in failed:
+                        continue
+                    if not self.cfg.scope.is_allowed(link):
+                        continue
+                    # Guard against URL explosion; skip long paths.
+                    if len(urlparse(link).path) > 500:
+                        continue
+                    enqueued.add(link)
+                    queue.append((link, depth + 1))
+
+        if (
+            kind
+            in {
+                "json",
+                "xml",
+                "pdf",
+                "text",
+            }
+            and status
+            and 200 <= status < 400
+        ):
+            title = _guess_title_from_url(url)
+            paths = self._write_non_html_variants(
+                url=url,
+                title=title,
+                kind=kind,
+                body=body,
+                raw_path=raw_path,
+                started_at=started_at,
+                status_code=status,
+                content_type=content_type,
+            )
+            event["paths"].update(paths)
+            event["title"] = title
 
-            self._last_fetch_at_by_host[host] = time.time()
+            md_path = self.out_dir / paths["page_md"]
+            self._citations.append(
+                CitationItem(
+                    title=title,
+                    url=url,
+                    accessed=started_at[:10],
+                    local_path=relpath_posix(md_path, self.out_dir),
+                )
+            )
 
-            status = int((meta or {}).get("status_code") or 0)
-            headers = (meta or {}).get("headers") or {}
-            content_type = headers.get("Content-Type")
+        self._stats["fetched"] += 1
 
-            kind = sniff_kind(url, content_type=content_type, body=body)
+        done.add(url)
+        self.state.append_line(self.state.done_path, url)
+        self.manifest.append(event)
+        return True
 
-            # Detect WAF challenge pages and mark them as blocked
-            # (don’t parse links).
-            if is_waf_challenge(body, content_type=content_type):
-                self._stats["blocked_waf"] += 1
-                raw_path = self._store_raw(
-                    url,
-                    kind=ContentKind.HTML,
-                    body=body,
-                )
-                self.manifest.append(
-                    {
-                        "kind": "blocked",
-                        "blocked_by": "aws_waf",
-                        "url": url,
-                        "status_code": status,
-                        "content_type": content_type,
-                        "paths": {
-                            "raw": relpath_posix(raw_path, self.out_dir),
-                        },
-                    }
-                )
-                done.add(url)
-                self.state.append_line(self.state.done_path, url)
-                continue
+    def _fetch_body(self, url: str, host: str) -> tuple[bytes, dict, bool]:
+        """Return ``(body, meta, not_modified)`` for ``url``.
 
-            raw_path = self._store_raw(url, kind=kind, body=body)
+        Serves the cache when it can and otherwise fetches (revalidating
+        with a conditional GET under refresh_cache). Runs on the fetch
+        workers; HttpClient errors propagate to the caller.
+        """
 
-            event: dict = {
-                "kind": "fetched",
-                "url": url,
-                "status_code": status,
-                "content_type": content_type,
-                "paths": {"raw": relpath_posix(raw_path, self.out_dir)},
-            }
+        with self._host_slot(host):
+            # A request starts per_host_delay_s after the previous one to
+            # the host finished (or, with parallel slots, started).
+            self._rate_limiter.acquire(host)
 
-            if kind == ContentKind.HTML and status and 200 <= status < 400:
-                html_text = body.decode("utf-8", errors="replace")
-                title = extract_title(html_text)
-                paths = self._write_page_variants(
-                    url=url,
-                    title=title,
-                    html_text=html_text,
-                    raw_path=raw_path,
-                    started_at=started_at,
-                    status_code=status,
-                    content_type=content_type,
+            # Cache behavior.
+            cache_entry = cache_paths(self.cache_dir, key=self._cache_key(url))
+            body, meta = (None, None)
+            not_modified = False
+            # With refresh_cache, an entry is revalidated with a conditional
+            # GET; its body is only read back if the server answers 304.
+            stale_meta = None
+            has_entry = cache_entry.body_path.exists()
+            if has_entry and cache_entry.meta_path.exists():
+                if self.cfg.refresh_cache:
+                    stale_meta = read_cached_meta(cache_entry)
+                else:
+                    body, meta = read_cached(cache_entry)
+
+            if body is None:
+                res = self.http.get(
+                    url, headers=conditional_headers(stale_meta) or None
                 )
 
-                event["paths"].update(paths)
-                event["title"] = title
+                if res.status_code == 304 and stale_meta is not None:
+                    body, meta = read_cached(cache_entry)
+                    not_modified = body is not None
 
-                md_path = self.out_dir / paths["page_md"]
+                if body is None:
+                    body = res.body
+                    meta = {
+                        "status_code": res.status_code,
+                        "headers": res.headers,
+                        "final_url": res.final_url,
+                    }
 
-                self._citations.append(
-                    CitationItem(
-                        title=title,
-                        url=url,
-                        accessed=started_at[:10],
-                        local_path=relpath_posix(md_path, self.out_dir),
-                    )
-                )
+                    # Write cache even for non-200; it's useful evidence.
+                    write_cached(cache_entry, res)
 
-                if depth < self.cfg.max_depth:
-                    for link in self._extract_links(html_text, page_url=url):
-                        if link in enqueued or link in done or link in failed:
-                            continue
-                        if not self.cfg.scope.is_allowed(link):
-                            continue
-                        # Guard against URL explosion; skip long paths.
-                        if len(urlparse(link).path) > 500:
-                            continue
-                        enqueued.add(link)
-                        queue.append((link, depth + 1))
+            self._rate_limiter.drain(host)
+        return body, meta or {}, not_modified
 
-            if (
-                kind
-                in {
-                    ContentKind.JSON,
-                    ContentKind.XML,
-                    ContentKind.PDF,
-                    ContentKind.TEXT,
-                }
-                and status
-                and 200 <= status < 400
-            ):
-                title = _guess_title_from_url(url)
-                paths = self._write_non_html_variants(
-                    url=url,
-                    title=title,
-                    kind=kind,
-                    body=body,
-                    raw_path=raw_path,
-                    started_at=started_at,
-                    status_code=status,
-                    content_type=content_type,
-                )
-                event["paths"].update(paths)
-                event["title"] = title
+    def crawl(self, seeds: Iterable[str], *, resume: bool = True) -> dict:
+        queue = deque((normalize_url(s), 0) for s in seeds)
 
-                md_path = self.out_dir / paths["page_md"]
-                self._citations.append(
-                    CitationItem(
-                        title=title,
-                        url=url,
-                        accessed=started_at[:10],
-                        local_path=relpath_posix(md_path, self.out_dir),
-                    )
-                )
+        done = self.state.load_set(self.state.done_path)
+        failed = self.state.load_set(self.state.failed_path)
+
+        # Restore queue if present.
+        if resume:
+            restored = self.state.load_queue()
+            if restored:
+                queue = deque((normalize_url(u), 0) for u in restored)
 
-            self._stats["fetched"] += 1
-            pages_fetched += 1
+        enqueued: set[str] = set(u for u, _ in queue)
 
-            done.add(url)
-            self.state.append_line(self.state.done_path, url)
-            self.manifest.append(event)
+        pages_fetched = 0
+        started_at = utc_iso()
 
-            # Persist queue periodically for resumability.
-            if pages_fetched % 25 == 0:
-                self.state.save_queue([u for u, _ in queue])
+        # Fetches run on a thread pool so network waits overlap; pages are
+        # still processed (links, variants, manifest, state) on this thread.
+        # _pop_ready() prefers URLs for hosts that are not backing off.
+        workers = max(1, self.cfg.workers)
+        in_flight: dict[Future[tuple[bytes, dict, bool]], tuple[str, int]]
+        in_flight = {}
+        host_busy: Counter[str] = Counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while queue or in_flight:
+                while (
+                    queue
+                    and len(in_flight) < workers
+                    and pages_fetched + len(in_flight) < self.cfg.max_pages
+                ):
+                    url, depth = self._pop_ready(queue, host_busy)
+                    if url in done or url in failed:
+                        continue
+
+                    ok, blocked_reason = self._should_fetch(url)
+                    if not ok:
+                        self._stats["blocked"] += 1
+                        self.state.append_line(self.state.done_path, url)
+                        done.add(url)
+                        self.manifest.append(
+                            {
+                                "kind": "blocked",
+                                "url": url,
+                                "reason": blocked_reason,
+                            }
+                        )
+                        continue
+
+                    host = (urlparse(url).hostname or "").lower()
+                    future = pool.submit(self._fetch_body, url, host)
+                    in_flight[future] = (url, depth)
+                    host_busy[host] += 1
+
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    url, depth = in_flight.pop(future)
+                    host_busy[(urlparse(url).hostname or "").lower()] -= 1
+                    try:
+                        body, meta, not_modified = future.result()
+                    except (requests.RequestException, RuntimeError) as e:
+                        self._stats["error"] += 1
+                        failed.add(url)
+                        self.state.append_line(self.state.failed_path, url)
+                        self.manifest.append(
+                            {
+                                "kind": "error",
+                                "url": url,
+                                "error": str(e),
+                            }
+                        )
+                        continue
+                    if not_modified:
+                        self._stats["not_modified"] += 1
+
+                    if not self._process_page(
+                        url=url,
+                        depth=depth,
+                        body=body,
+                        meta=meta,
+                        started_at=started_at,
+                        queue=queue,
+                        enqueued=enqueued,
+                        done=done,
+                        failed=failed,
+                    ):
+                        continue
+
+                    pages_fetched += 1
+
+                    # Persist queue periodically for resumability.
+                    if pages_fetched % 25 == 0:
+                        self.state.save_queue(
+                            [u for u, _ in [*in_flight.values(), *queue]]
+                        )
 
         # Final queue save.
         self.state.save_queue([u for u, _ in queue])
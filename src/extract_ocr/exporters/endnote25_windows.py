@@ -13,16 +13,22 @@ from tqdm import tqdm
 
 from ..cache import cache_paths, read_cached, write_cached
 from ..citations import CitationItem, write_bibtex, write_csl_json, write_ris
-from ..convert.html_to_md import extract_title, html_to_markdown
+from ..convert.html_to_md import (
+    extract_title_from_soup,
+    html_to_markdown_from_soup,
+    parse_html,
+)
 from ..http_client import HttpClient
 from ..manifest import ManifestWriter, relpath_posix, utc_iso
-from ..urls import normalize_url, safe_filename_piece
+from ..urls import normalize_url, safe_filename_piece, url_hash
 
 DEFAULT_SEED_URL = (
     "https://docs.endnote.com/docs/endnote/2025/v1/windows/en/"
     "content/00endnote_libraries/00endnote_libraries_and_references.htm"
 )
 
+_HTML_HREF_RE = re.compile(r"\.(?:htm|html)(?:\?|$)", re.IGNORECASE)
+
 
 def extract_hrefs_from_leftpanel_html(leftpanel_html: str) -> list[str]:
     soup = BeautifulSoup(leftpanel_html, "html.parser")
@@ -36,7 +42,7 @@ def extract_hrefs_from_leftpanel_html(leftpanel_html: str) -> list[str]:
         href = href.strip()
         if not href:
             continue
-        if not re.search(r"\.(?:htm|html)(?:\?|$)", href, flags=re.IGNORECASE):
+        if not _HTML_HREF_RE.search(href):
             continue
         hrefs.append(href)
     return hrefs
@@ -86,9 +92,7 @@ class EndNoteExporter:
 
     def _cache_key(self, url: str) -> str:
         # Keep consistent with other components.
-        import hashlib
-
-        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+        return url_hash(url)
 
     def _fetch_html(self, url: str) -> str:
         url = normalize_url(url)
@@ -128,8 +132,9 @@ class EndNoteExporter:
         for url in tqdm(urls, desc="EndNote export", unit="page"):
             try:
                 html = self._fetch_html(url)
-                title = extract_title(html)
-                md_text = html_to_markdown(html, source_url=url)
+                soup = parse_html(html)
+                title = extract_title_from_soup(soup)
+                md_text = html_to_markdown_from_soup(soup, source_url=url)
 
                 key = self._cache_key(url)
                 md_name = f"{safe_filename_piece(title)}--{key}.md"
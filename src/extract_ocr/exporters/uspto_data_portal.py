@@ -6,7 +6,7 @@ from pathlib import Path
 import requests
 
 from ..crawl import CrawlConfig, Crawler
-from ..http_client import HttpClient
+from ..http_client import HttpClient, new_session
 from ..urls import UrlScope
 
 
@@ -18,11 +18,16 @@ class USPTODataPortalConfig:
     per_host_delay_s: float = 0.5
     respect_robots: bool = True
     refresh_cache: bool = False
+    workers: int = 1
+    per_host_parallel: int = 1
 
 
-def run(config: USPTODataPortalConfig) -> dict:
-    session = requests.Session()
-    http = HttpClient(session)
+def run(
+    config: USPTODataPortalConfig,
+    *,
+    session: requests.Session | None = None,
+) -> dict:
+    http = HttpClient(session if session is not None else new_session())
 
     scope = UrlScope(allow_host_suffixes=("uspto.gov",), follow_offsite=False)
     crawl_cfg = CrawlConfig(
@@ -33,6 +38,8 @@ def run(config: USPTODataPortalConfig) -> dict:
         per_host_delay_s=config.per_host_delay_s,
         respect_robots=config.respect_robots,
         refresh_cache=config.refresh_cache,
+        workers=config.workers,
+        per_host_parallel=config.per_host_parallel,
     )
 
     crawler = Crawler(http=http, config=crawl_cfg)
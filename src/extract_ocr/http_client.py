@@ -7,11 +7,19 @@ from pathlib import Path
 
 import requests
 from requests import exceptions as req_exc
+from requests.adapters import HTTPAdapter
 
+from . import __version__
 from .urls import normalize_url
 
 TRANSIENT_HTTP_STATUSES = {429, 500, 502, 503, 504}
 
+USER_AGENT = f"extract-ocr/{__version__}"
+
+# Keep-alive pool sizes for new_session(); requests defaults to 10.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
 
 def _retry_after_seconds(headers: dict[str, str]) -> float | None:
     retry_after = headers.get("Retry-After")
@@ -95,6 +103,25 @@ class HttpClient:
         raise RuntimeError(f"Failed to fetch {normalized}: {last_error}")
 
 
+def new_session() -> requests.Session:
+    """Return a Session with a pooled keep-alive adapter and our User-Agent.
+
+    urllib3-level retries stay off: HttpClient.get() already retries
+    transient statuses and honours Retry-After.
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
 def load_json(path: Path) -> dict | None:
     try:
         return json.loads(path.read_text(encoding="utf-8"))
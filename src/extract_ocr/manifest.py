@@ -1,10 +1,20 @@
 from __future__ import annotations
 
 import json
+import mmap
+import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # optional "fast" extra
+    orjson = None
+
+# Manifests are read sequentially; a large buffer keeps syscalls down.
+JSONL_READ_BUFFER_SIZE = 1 << 20
 
 
 def utc_iso() -> str:
@@ -16,6 +26,90 @@ def relpath_posix(path: Path, base_dir: Path) -> str:
     return rel.as_posix()
 
 
+def iter_jsonl_events(
+    jsonl_path: Path, *, kinds: Iterable[str] | None = None
+) -> Iterator[Any]:
+    """Yield each JSON value in a JSONL file, skipping blank/corrupt lines.
+
+    The file is memory-mapped and split on ``\\n`` with ``find()``; each
+    line is parsed from bytes (with orjson when installed), so there is no
+    text-mode decode and the OS pages the file in as it is read. Lines
+    appended after the call starts are not seen.
+
+    With ``kinds``, lines that do not contain any of them as a quoted
+    string are skipped unparsed. This is only a prefilter: callers still
+    check ``evt["kind"]``, since the string may appear in another field.
+    """
+
+    loads = orjson.loads if orjson is not None else json.loads
+    needles = (
+        tuple(f'"{k}"'.encode("utf-8") for k in kinds)
+        if kinds is not None
+        else None
+    )
+    with jsonl_path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            # mmap cannot map an empty file.
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                line = mm[start:end]
+                start = end + 1
+                if not line or line.isspace():
+                    continue
+                if needles is not None and not any(
+                    n in line for n in needles
+                ):
+                    continue
+                try:
+                    yield loads(line)
+                except ValueError:
+                    # JSONDecodeError (both libraries) and invalid UTF-8.
+                    continue
+
+
+def iter_jsonl_tail(
+    jsonl_path: Path, start: int = 0
+) -> Iterator[tuple[Any, int]]:
+    """Yield ``(value, end_offset)`` for complete JSONL lines from ``start``.
+
+    ``end_offset`` is the byte offset just past the line, so a caller can
+    resume there later. A final line without its newline (a writer still
+    appending) is left for the next read; blank/corrupt lines are skipped.
+    """
+
+    loads = orjson.loads if orjson is not None else json.loads
+    with jsonl_path.open("rb", buffering=JSONL_READ_BUFFER_SIZE) as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.isspace():
+                continue
+            try:
+                yield loads(line), offset
+            except ValueError:
+                continue
+
+
+def dump_json_indented(obj: Any) -> bytes:
+    """Serialize ``obj`` as two-space indented UTF-8 JSON.
+
+    Uses orjson when installed; both paths produce the same layout.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 @dataclass
 class ManifestWriter:
     out_dir: Path
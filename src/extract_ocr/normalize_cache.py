@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .http_client import load_json
+from .manifest import dump_json_indented, relpath_posix
+
+NORMALIZE_CACHE_NAME = ".normalize_cache.json"
+
+# Bump when any ensure_export_*_variants output format (or the layout of
+# this cache file) changes, so stale renders from an older version are
+# regenerated.
+NORMALIZE_VERSION = 3
+
+
+def normalize_fingerprint(raw: bytes, *inputs: object) -> str:
+    """Hash the raw body and the event fields that shape the rendered files."""
+
+    h = hashlib.sha256(raw)
+    h.update(json.dumps(inputs, ensure_ascii=False, default=str).encode())
+    return h.hexdigest()
+
+
+def _stat_key(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+@dataclass
+class NormalizeCache:
+    """Remembers which manifest events already have up-to-date variants.
+
+    ``entries`` maps a pass key (pass name and URL) to the fingerprints
+    rendered for it; each render records its output files, the run it
+    happened in and its order within that run. ``files`` holds each output
+    file's stat and the render (``[key, fingerprint]``) that last wrote
+    it.
+
+    An event is fresh when none of its files changed since (outside
+    normalization, e.g. by the crawler, or earlier in this run) and each
+    was last written by the event's own render, or by a later render in
+    the same run. The latter lets several events sharing a file stay
+    fresh, the last one's content winning as a full re-run would; a body
+    that reverts to an older fingerprint is not fresh, since its files
+    were since rewritten in another run. Renders that can never be fresh
+    again are dropped on save().
+    """
+
+    export_dir: Path
+    entries: dict[str, dict[str, dict]] = field(default_factory=dict)
+    files: dict[str, list] = field(default_factory=dict)
+    run: int = 1
+    dirty: bool = False
+    _seq: int = field(default=0, repr=False)
+    _written: set[str] = field(default_factory=set, repr=False)
+
+    @property
+    def path(self) -> Path:
+        return self.export_dir / NORMALIZE_CACHE_NAME
+
+    @classmethod
+    def load(cls, export_dir: Path) -> NormalizeCache:
+        export_dir = export_dir.resolve()
+        state = load_json(export_dir / NORMALIZE_CACHE_NAME)
+        if not state or state.get("version") != NORMALIZE_VERSION:
+            return cls(export_dir=export_dir)
+        entries = state.get("entries")
+        files = state.get("files")
+        last_run = state.get("run")
+        if (
+            not isinstance(entries, dict)
+            or not isinstance(files, dict)
+            or not isinstance(last_run, int)
+        ):
+            return cls(export_dir=export_dir)
+        return cls(
+            export_dir=export_dir,
+            entries=entries,
+            files=files,
+            run=last_run + 1,
+        )
+
+    def _owned(self, rel: str, key: str, fingerprint: str) -> bool:
+        """Whether ``rel`` still holds what this render (or one after it
+        in the same run) wrote."""
+
+        info = self.files.get(rel)
+        if info is None or len(info) != 4:
+            return False
+        owner_key, owner_fp = info[2], info[3]
+        if owner_key == key and owner_fp == fingerprint:
+            return True
+        entry = self.entries.get(key, {}).get(fingerprint)
+        owner = self.entries.get(owner_key, {}).get(owner_fp)
+        return (
+            entry is not None
+            and owner is not None
+            and owner["run"] == entry["run"]
+            and owner["seq"] > entry["seq"]
+        )
+
+    def is_fresh(self, key: str, fingerprint: str) -> bool:
+        entry = self.entries.get(key, {}).get(fingerprint)
+        if not entry or not entry["outputs"]:
+            return False
+        for rel in entry["outputs"]:
+            if rel in self._written:
+                return False
+            info = self.files.get(rel)
+            if info is None or _stat_key(self.export_dir / rel) != info[:2]:
+                return False
+            if not self._owned(rel, key, fingerprint):
+                return False
+        return True
+
+    def mark(self, key: str, fingerprint: str, outputs: list[Path]) -> None:
+        rels = [relpath_posix(p, self.export_dir) for p in outputs]
+        for rel, p in zip(rels, outputs, strict=True):
+            stat = _stat_key(p)
+            if stat is not None:
+                self.files[rel] = [*stat, key, fingerprint]
+            self._written.add(rel)
+        self._seq += 1
+        self.entries.setdefault(key, {})[fingerprint] = {
+            "outputs": rels,
+            "run": self.run,
+            "seq": self._seq,
+        }
+        self.dirty = True
+
+    def _prune(self) -> None:
+        # Dropping a render can strand the earlier ones that relied on it
+        # owning a shared file, so repeat until nothing changes.
+        changed = True
+        while changed:
+            changed = False
+            for key in list(self.entries):
+                by_fp = self.entries[key]
+                for fp in list(by_fp):
+                    outputs = by_fp[fp]["outputs"]
+                    if not all(self._owned(r, key, fp) for r in outputs):
+                        del by_fp[fp]
+                        changed = True
+                if not by_fp:
+                    del self.entries[key]
+        for rel in list(self.files):
+            info = self.files[rel]
+            if info[3] not in self.entries.get(info[2], {}):
+                del self.files[rel]
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self._prune()
+        state = {
+            "version": NORMALIZE_VERSION,
+            "run": self.run,
+            "entries": self.entries,
+            "files": self.files,
+        }
+        self.path.write_bytes(dump_json_indented(state))
+        self.dirty = False
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class HostTokenBucket:
+    """Per-host token buckets shared by the crawl's fetch workers.
+
+    Each host gets a bucket of ``capacity`` tokens refilled at
+    ``rate_per_s``; a request takes one token. acquire() may overdraw the
+    bucket, which reserves the next refill for that caller, so concurrent
+    workers queue up behind each other instead of racing. Hosts never seen
+    start full. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate_per_s: float, *, capacity: float = 1.0) -> None:
+        self.rate_per_s = rate_per_s
+        self.capacity = capacity
+        # host -> (tokens, monotonic time they were counted at)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _tokens(self, host: str, now: float) -> float:
+        entry = self._buckets.get(host)
+        if entry is None:
+            return self.capacity
+        tokens, at = entry
+        return min(self.capacity, tokens + (now - at) * self.rate_per_s)
+
+    def wait_time(self, host: str) -> float:
+        """Seconds until ``host`` has a whole token (0 when it has one)."""
+        if self.rate_per_s <= 0:
+            return 0.0
+        with self._lock:
+            tokens = self._tokens(host, time.monotonic())
+        return max(0.0, (1.0 - tokens) / self.rate_per_s)
+
+    def acquire(self, host: str) -> None:
+        """Take a token for ``host``, sleeping until it is available."""
+        if self.rate_per_s <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            tokens = self._tokens(host, now) - 1.0
+            self._buckets[host] = (tokens, now)
+        if tokens < 0:
+            time.sleep(-tokens / self.rate_per_s)
+
+    def drain(self, host: str) -> None:
+        """Empty the host's bucket as of now.
+
+        Called when a request finishes, so the next one to the host waits a
+        full refill after it rather than after it started. Reservations
+        already made by acquire() are kept.
+        """
+        if self.rate_per_s <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._buckets[host] = (min(0.0, self._tokens(host, now)), now)
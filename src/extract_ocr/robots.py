@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse
 
+ROBOTS_PATH_CACHE_SIZE = 50_000
+# Distinct robots.txt bodies kept parsed; see parse_robots().
+ROBOTS_PARSE_CACHE_SIZE = 256
+
 
 class RobotsRules:
     """Very small robots.txt parser.
@@ -42,18 +47,37 @@ class RobotsRules:
             elif key == "allow" and value:
                 self._allow.append(value)
 
-        self._allow.sort(key=len, reverse=True)
-        self._disallow.sort(key=len, reverse=True)
+        # str.startswith() accepts a tuple and checks every prefix in C.
+        # Any matching Allow wins, so rule order is irrelevant and repeated
+        # rules (common across merged User-agent groups) are dropped.
+        self._allow_prefixes = tuple(dict.fromkeys(self._allow))
+        self._disallow_prefixes = tuple(dict.fromkeys(self._disallow))
+
+        # Crawls ask about the same paths over and over; memoize per path.
+        self._path_allowed = lru_cache(maxsize=ROBOTS_PATH_CACHE_SIZE)(
+            self._match_path
+        )
 
     def can_fetch(self, url: str) -> bool:
-        path = urlparse(url).path or "/"
-        for allow_prefix in self._allow:
-            if path.startswith(allow_prefix):
-                return True
-        for disallow_prefix in self._disallow:
-            if path.startswith(disallow_prefix):
-                return False
-        return True
+        return self._path_allowed(urlparse(url).path or "/")
+
+    def _match_path(self, path: str) -> bool:
+        if path.startswith(self._allow_prefixes):
+            return True
+        return not path.startswith(self._disallow_prefixes)
+
+
+@lru_cache(maxsize=ROBOTS_PARSE_CACHE_SIZE)
+def parse_robots(text: str) -> RobotsRules:
+    """Parse robots.txt text, sharing one RobotsRules per distinct body.
+
+    Keyed by content, so hosts serving the same file (sibling subdomains,
+    a host re-read after the crawler's per-host memo evicted it) reuse the
+    parsed rules and their per-path verdict cache. RobotsRules is not
+    mutated after construction, so sharing is safe.
+    """
+
+    return RobotsRules(text)
 
 
 @dataclass
@@ -71,7 +95,7 @@ class RobotsCache:
         path = self._path_for_host(host)
         if not path.exists():
             return None
-        return RobotsRules(path.read_text(encoding="utf-8", errors="replace"))
+        return parse_robots(path.read_text(encoding="utf-8", errors="replace"))
 
     def store(self, host: str, text: str) -> None:
         self._path_for_host(host).write_text(
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import ParseResult, urlparse, urlunparse
 
 _TRACKING_QUERY_EXACT = {"agt=index"}
@@ -56,16 +58,35 @@ _ASSET_EXTS = {
 }
 
 
+_ASSET_EXTS_TUPLE = tuple(_ASSET_EXTS)
+
+
+def is_asset_intent_path(path_lower: str) -> bool:
+    """Like is_asset_intent_url, for a URL path that is already lowercased."""
+    return path_lower.endswith(_ASSET_EXTS_TUPLE)
+
+
 def is_asset_intent_url(url: str) -> bool:
-    path = urlparse(url).path.lower()
-    return any(path.endswith(ext) for ext in _ASSET_EXTS)
+    return is_asset_intent_path(urlparse(url).path.lower())
+
+
+@lru_cache(maxsize=8192)
+def url_hash(url: str) -> str:
+    """Short SHA-256 of a URL, used in page stems and cache entry names.
+
+    It must stay stable across runs (re-runs and resumed crawls find files
+    by it); memoized, since each URL is hashed by several passes.
+    """
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+
+
+# Runs of anything but [A-Za-z0-9._], hyphens and whitespace included,
+# become a single "-" in one pass.
+_FILENAME_PIECE_SEP_RE = re.compile(r"[^A-Za-z0-9._]+")
 
 
 def safe_filename_piece(text: str, *, max_len: int = 80) -> str:
-    text = text.strip()
-    text = re.sub(r"\s+", "-", text)
-    text = re.sub(r"[^A-Za-z0-9._-]+", "-", text)
-    text = re.sub(r"-+", "-", text).strip("-")
+    text = _FILENAME_PIECE_SEP_RE.sub("-", text.strip()).strip("-")
     if not text:
         return "untitled"
     return text[:max_len]